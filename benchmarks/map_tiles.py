@@ -0,0 +1,327 @@
+'''
+GlowMap tile pipeline benchmark.
+
+Starts a local HTTP tile server with configurable latency, tile size and
+error rate, scripts pans, flings and zoom sequences on a :class:`GlowMap`
+against it and reports, per scenario:
+    - time to full viewport (all visible tiles loaded after the last step)
+    - tiles downloaded versus tiles needed (waste)
+    - frame time percentiles
+    - disk and memory cache hit rates
+
+Usage:
+    python benchmarks/map_tiles.py --latency 0.05 --tile-bytes 20000 --error-rate 0.02
+    python benchmarks/map_tiles.py --warm --json
+
+Kivy needs a window: on machines without a display run it under a virtual
+one, e.g. `xvfb-run python benchmarks/map_tiles.py`.
+'''
+
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from http.server import (
+    BaseHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('KIVY_NO_CONSOLELOG', '1')
+
+from kivy.clock import Clock  # noqa: E402
+from kivy.config import Config  # noqa: E402
+
+Config.set('graphics', 'width', '1024')
+Config.set('graphics', 'height', '768')
+
+from kivy_glow.app import GlowApp  # noqa: E402
+from kivy_glow.uix.map import (  # noqa: E402
+    GlowMap,
+    MapDownloader,
+    MapMetrics,
+    MapSource,
+)
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff)
+
+
+def make_tile(size: int, tile_bytes: int, color: tuple[int, int, int]) -> bytes:
+    '''Solid color PNG tile padded with a private ancillary chunk to about `tile_bytes`.'''
+    raw = b''.join(b'\x00' + bytes(color) * size for _ in range(size))
+    png = b'\x89PNG\r\n\x1a\n'
+    png += _png_chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 2, 0, 0, 0))
+    png += _png_chunk(b'IDAT', zlib.compress(raw))
+    padding = tile_bytes - len(png) - 24
+    if padding > 0:
+        png += _png_chunk(b'bnCh', os.urandom(padding))
+    png += _png_chunk(b'IEND', b'')
+    return png
+
+
+class TileServer:
+    '''Local tile server. Every request sleeps `latency` seconds and fails
+    with a 503 with probability `error_rate`.
+    '''
+
+    def __init__(self, latency: float = 0.0, tile_bytes: int = 20000, error_rate: float = 0.0, tile_size: int = 256) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.tiles = [make_tile(tile_size, tile_bytes, color) for color in ((200, 220, 200), (220, 200, 200), (200, 200, 220))]
+        self.requests = 0
+        self.errors = 0
+        self.served = set()
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                time.sleep(server.latency)
+
+                if random.random() < server.error_rate:
+                    with server._lock:
+                        server.errors += 1
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                try:
+                    z, x, y = (int(part) for part in self.path.strip('/').split('.')[0].split('/'))
+                except ValueError:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                with server._lock:
+                    server.served.add((z, x, y))
+                data = server.tiles[(x + y) % len(server.tiles)]
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.errors = 0
+            self.served = set()
+
+
+def pan(mapview: GlowMap, frames: int = 120, dx: float = 12, dy: float = 4):
+    for _ in range(frames):
+        mapview._scatter.x -= dx
+        mapview._scatter.y -= dy
+        yield
+
+
+def fling(mapview: GlowMap, velocity: float = 80, decay: float = 0.95):
+    while velocity > 0.5:
+        mapview._scatter.x -= velocity
+        velocity *= decay
+        yield
+
+
+def pinch(mapview: GlowMap, cycles: int = 4, frames: int = 20):
+    '''Scale back and forth across the zoom-in threshold.'''
+    scatter = mapview._scatter
+    for _ in range(cycles):
+        start = scatter.scale
+        for i in range(frames):
+            mapview.scale_at(start * (1.8 ** ((i + 1) / frames)), *mapview.center)
+            yield
+        start = scatter.scale
+        for i in range(frames):
+            mapview.scale_at(start / (1.8 ** ((i + 1) / frames)), *mapview.center)
+            yield
+
+
+def zoom_steps(mapview: GlowMap, zooms: tuple[int, ...] = (6, 7, 8, 9, 8, 7)):
+    for zoom in zooms:
+        mapview.zoom = zoom
+        for _ in range(10):
+            yield
+
+
+SCENARIOS = {
+    'pan': pan,
+    'fling': fling,
+    'pinch': pinch,
+    'zoom': zoom_steps,
+}
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))]
+
+
+class BenchmarkApp(GlowApp):
+    def __init__(self, server: TileServer, options: argparse.Namespace, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.server = server
+        self.options = options
+        self.results = []
+        self.frame_times = []
+
+    def build(self) -> GlowMap:
+        MapSource.providers['benchmark'] = {
+            'min_zoom': 0,
+            'max_zoom': 18,
+            'url_template': f'http://127.0.0.1:{self.server.port}/{{z}}/{{x}}/{{y}}.png',
+            'attribution': 'benchmark',
+            'max_concurrency': self.options.max_concurrency,
+        }
+        self.cache_dir = tempfile.mkdtemp(prefix='glowmap-bench-')
+        self.metrics = MapMetrics()
+        self.downloader = MapDownloader(cache_dir=self.cache_dir)
+        self.mapview = GlowMap(
+            map_source=MapSource('benchmark', cache_dir=self.cache_dir),
+            downloader=self.downloader,
+            cache_dir=self.cache_dir,
+            pause_on_action=False,
+            lat=48.85,
+            lon=2.35,
+            zoom=6,
+        )
+        self.mapview.enable_metrics(self.metrics)
+        self.scenarios = [name for name in self.options.scenarios for _ in range(2 if self.options.warm else 1)]
+        Clock.schedule_interval(self._record_frame, 0)
+        Clock.schedule_once(self._next_scenario, 1)
+        return self.mapview
+
+    def _record_frame(self, dt: float) -> None:
+        self.frame_times.append(dt)
+
+    def _viewport_loaded(self) -> bool:
+        return all(tile.state != 'loading' for tile in self.mapview._tiles)
+
+    def _next_scenario(self, *args) -> None:
+        if not self.scenarios:
+            self.stop()
+            return
+
+        name = self.scenarios.pop(0)
+        self.mapview.zoom = 6
+        self.mapview.center_on(48.85, 2.35)
+        self.server.reset()
+        self.metrics.reset()
+        self.frame_times = []
+        self._displayed = set()
+        self._name = name
+        self._steps = SCENARIOS[name](self.mapview)
+        Clock.schedule_interval(self._step, 0)
+
+    def _collect_displayed(self) -> None:
+        for tile in self.mapview._tiles:
+            if tile.state != 'loading':
+                self._displayed.add((tile.zoom, tile.tile_x, tile.tile_y))
+
+    def _step(self, *args) -> bool:
+        self._collect_displayed()
+        try:
+            next(self._steps)
+        except StopIteration:
+            self._settled_at = time.perf_counter()
+            Clock.schedule_interval(self._wait_viewport, 0)
+            return False
+        return True
+
+    def _wait_viewport(self, *args) -> bool:
+        self._collect_displayed()
+        elapsed = time.perf_counter() - self._settled_at
+        if not self._viewport_loaded() and elapsed < self.options.timeout:
+            return True
+
+        downloaded = len(self.server.served)
+        needed = len(self._displayed)
+        self.results.append({
+            'scenario': self._name,
+            'time_to_full_viewport': elapsed if self._viewport_loaded() else None,
+            'requests': self.server.requests,
+            'errors': self.server.errors,
+            'tiles_downloaded': downloaded,
+            'tiles_needed': needed,
+            'waste': max(0, downloaded - needed) / downloaded if downloaded else 0.0,
+            'frame_time_p50': percentile(self.frame_times, 50),
+            'frame_time_p95': percentile(self.frame_times, 95),
+            'frame_time_p99': percentile(self.frame_times, 99),
+            'disk_hit_rate': self.metrics.hit_rate('disk'),
+            'memory_hit_rate': self.metrics.hit_rate('memory'),
+            'metrics': self.metrics.snapshot(),
+        })
+        Clock.schedule_once(self._next_scenario, 0.5)
+        return False
+
+    def on_stop(self) -> None:
+        self.downloader.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.05, help='server latency per tile, seconds')
+    parser.add_argument('--tile-bytes', type=int, default=20000, help='approximate size of a tile, bytes')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='probability of a 503 response')
+    parser.add_argument('--max-concurrency', type=int, default=16, help='provider max_concurrency')
+    parser.add_argument('--timeout', type=float, default=30.0, help='max wait for a full viewport, seconds')
+    parser.add_argument('--warm', action='store_true', help='run every scenario twice, the second time with a warm cache')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS), help=f'any of {", ".join(SCENARIOS)}')
+    options = parser.parse_args()
+    for name in options.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f'unknown scenario {name!r}')
+
+    server = TileServer(latency=options.latency, tile_bytes=options.tile_bytes, error_rate=options.error_rate)
+    server.start()
+    app = BenchmarkApp(server, options)
+    try:
+        app.run()
+    finally:
+        server.stop()
+
+    if options.json:
+        print(json.dumps(app.results, indent=2, default=str))
+        return
+
+    print(f'{"scenario":<8} {"full(s)":>8} {"req":>6} {"err":>5} {"dl":>6} {"need":>6} {"waste":>6} '
+          f'{"p50ms":>7} {"p95ms":>7} {"p99ms":>7} {"disk":>6} {"mem":>6}')
+    for result in app.results:
+        full = result['time_to_full_viewport']
+        print(
+            f'{result["scenario"]:<8} {full if full is not None else float("nan"):>8.2f} '
+            f'{result["requests"]:>6} {result["errors"]:>5} {result["tiles_downloaded"]:>6} {result["tiles_needed"]:>6} '
+            f'{result["waste"]:>6.0%} {result["frame_time_p50"] * 1000:>7.1f} {result["frame_time_p95"] * 1000:>7.1f} '
+            f'{result["frame_time_p99"] * 1000:>7.1f} {result["disk_hit_rate"]:>6.0%} {result["memory_hit_rate"]:>6.0%}',
+        )
+
+
+if __name__ == '__main__':
+    main()
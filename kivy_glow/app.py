@@ -56,8 +56,12 @@ class GlowApp(App, ThemeBehavior):
                     path_to_kv_file = os.path.join(path_to_dir, name_file)
                     Builder.load_file(path_to_kv_file)
 
-    def fps_monitor_start(self, anchor: str = 'top') -> None:
-        '''Add a monitor to the main application window.'''
+    def fps_monitor_start(self, anchor: str = 'top', metrics: object | None = None) -> None:
+        '''Add a monitor to the main application window.
+        If `metrics` is given (for example a
+        :class:`~kivy_glow.uix.map.MapMetrics`), its summary is shown
+        under the FPS.
+        '''
 
         from kivy.core.window import Window
         from kivy_glow.uix.label import GlowLabel
@@ -67,6 +71,8 @@ class GlowApp(App, ThemeBehavior):
 
         def update_fps(fps_monitor: GlowLabel) -> None:
             fps_monitor.text = f'FPS: {Clock.get_fps():.2f}'
+            if metrics is not None:
+                fps_monitor.text += f'\n{metrics.summary()}'
 
         fps_monitor = GlowLabel(pos_hint={anchor: 1}, bg_color=self.theme_cls.primary_dark_color, halign='center', adaptive_height=True, font_style='LabelS')
         Window.add_widget(fps_monitor)
@@ -8,6 +8,7 @@ register('GlowCircleLayout', module='kivy_glow.uix.circlelayout')
 register('GlowFloatLayout', module='kivy_glow.uix.floatlayout')
 register('GlowGridLayout', module='kivy_glow.uix.gridlayout')
 register('GlowRecycleBoxLayout', module='kivy_glow.uix.recycleboxlayout')
+register('SelectableRecycleBoxLayout', module='kivy_glow.uix.recycleboxlayout')
 register('GlowRecycleGridLayout', module='kivy_glow.uix.recyclegridlayout')
 register('GlowRecycleView', module='kivy_glow.uix.recycleview')
 register('GlowRelativeLayout', module='kivy_glow.uix.relativelayout')
@@ -5,6 +5,7 @@ from typing import Self
 
 from kivy.animation import Animation
 from kivy.clock import Clock
+from kivy.core.window import Window
 from kivy.effects.scroll import ScrollEffect
 from kivy.input.motionevent import MotionEvent
 from kivy.lang import Builder
@@ -18,15 +19,14 @@ from kivy.properties import (
     StringProperty,
 )
 from kivy.uix.behaviors import ButtonBehavior
-from kivy.uix.recycleview.layout import LayoutSelectionBehavior
 from kivy.uix.recycleview.views import RecycleDataViewBehavior
 
 from kivy_glow import kivy_glow_uix_dir
 from kivy_glow.theme import ThemeManager
 from kivy_glow.uix.behaviors import HoverBehavior
 from kivy_glow.uix.boxlayout import GlowBoxLayout
-from kivy_glow.uix.recycleboxlayout import GlowRecycleBoxLayout
 from kivy_glow.uix.recycleview import GlowRecycleView
+from kivy_glow.utils.selection import SelectionModel
 
 with open(
     os.path.join(kivy_glow_uix_dir, 'list', 'list.kv'), encoding='utf-8',
@@ -34,10 +34,6 @@ with open(
     Builder.load_string(kv_file.read())
 
 
-class SelectableRecycleBoxLayout(LayoutSelectionBehavior, GlowRecycleBoxLayout):
-    pass
-
-
 class GlowSelectableListItem(GlowBoxLayout,
                              HoverBehavior,
                              RecycleDataViewBehavior):
@@ -98,7 +94,7 @@ class GlowSelectableListItem(GlowBoxLayout,
     '''
 
     _index = NumericProperty(defaultvalue=None, allownone=True)
-    _clicked = False
+    _set_visible_event = None
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
@@ -109,15 +105,26 @@ class GlowSelectableListItem(GlowBoxLayout,
         '''Catch and handle the view changes.'''
 
         self.idx = data['idx']
-        self.opacity = 0
+        fixed_height = instance.layout_manager.fixed_height
+        if fixed_height is None:
+            self.opacity = 0
 
         super().refresh_view_attrs(instance, index, data)
 
         self.bg_color = self.item_bg_color
         self._index = index
+
+        if fixed_height is not None:
+            # the layout gives the height, the item is not measured
+            if self._set_visible_event is not None:
+                self._set_visible_event.cancel()
+            self.height = fixed_height
+            self.opacity = 1
+            return
+
         self.do_layout()
 
-        Clock.schedule_once(self._set_visible)
+        self._set_visible_event = Clock.schedule_once(self._set_visible)
 
     def on_enter(self) -> None:
         '''Fired at the SelectableListItem hover enter event.'''
@@ -133,9 +140,8 @@ class GlowSelectableListItem(GlowBoxLayout,
             return False
 
         if self.ids.item_checkbox.collide_point(*touch.pos) and not self.ids.item_checkbox.disabled:
-            self._clicked = True
             self.ids.item_checkbox.on_touch_down(touch)
-            self.parent.select_with_touch(self._index, touch)
+            self.list._on_item_checkbox(self)
             self.list.dispatch('on_item_selected', self)
             return True
 
@@ -150,12 +156,8 @@ class GlowSelectableListItem(GlowBoxLayout,
     def apply_selection(self, instance: GlowRecycleView, index: int, is_selected: bool) -> None:
         '''Internal item selection processing function.'''
         self.selected = is_selected
-        if not self._clicked and 'item_checkbox' in self.ids:
-            self.ids.item_checkbox.active = self.selected
-        else:
-            self.list._selected_items[self.idx] = is_selected
-
-        self._clicked = False
+        if 'item_checkbox' in self.ids:
+            self.ids.item_checkbox.active = is_selected
 
     def _set_visible(self, *args) -> None:
         '''Restore item visibility after updating data.'''
@@ -207,6 +209,9 @@ class GlowListItem(GlowBoxLayout,
     :class:`~kivy.uix.recycleview.views.RecycleDataViewBehavior`
     classes documentation.
     '''
+
+    _set_visible_event = None
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.size_hint_y = None
@@ -215,13 +220,24 @@ class GlowListItem(GlowBoxLayout,
         ''' Catch and handle the view changes.'''
 
         self.idx = data['idx']
-        self.opacity = 0
+        fixed_height = instance.layout_manager.fixed_height
+        if fixed_height is None:
+            self.opacity = 0
 
         super().refresh_view_attrs(instance, index, data)
         self.bg_color = self.item_bg_color
+
+        if fixed_height is not None:
+            # the layout gives the height, the item is not measured
+            if self._set_visible_event is not None:
+                self._set_visible_event.cancel()
+            self.height = fixed_height
+            self.opacity = 1
+            return
+
         self.do_layout()
 
-        Clock.schedule_once(self._set_visible)
+        self._set_visible_event = Clock.schedule_once(self._set_visible)
 
     def on_enter(self) -> None:
         '''Fired at the SelectableListItem hover enter event.'''
@@ -292,6 +308,16 @@ class GlowList(GlowBoxLayout):
     and defaults to `GlowSelectableListItem`.
     '''
 
+    item_height = NumericProperty(defaultvalue=None, allownone=True)
+    '''Height of every item.
+
+    When set, items are not measured when they are displayed and scrolling
+    only rebinds their data. The content of the items must fit in it.
+
+    :attr:`item_height` is an :class:`~kivy.properties.NumericProperty`
+    and defaults to `None`.
+    '''
+
     effect_cls = ObjectProperty(defaultvalue=ScrollEffect)
     '''Effect applied to sroll
 
@@ -325,9 +351,11 @@ class GlowList(GlowBoxLayout):
     _hover_item_color = ColorProperty(defaultvalue=(0, 0, 0, 0))
 
     _formatted_list_data = ListProperty()
-    _selected_items = {}
 
     def __init__(self, *args, **kwargs) -> None:
+        self._selection = SelectionModel()
+        self._last_checked_item = None
+
         self.bind(odd_item_color=self.setter('_odd_item_color'))
         self.bind(even_item_color=self.setter('_even_item_color'))
         self.bind(hover_item_color=self.setter('_hover_item_color'))
@@ -348,7 +376,7 @@ class GlowList(GlowBoxLayout):
     @property
     def selected_items(self) -> list[int]:
         '''Returns the indexes of the selected items. Numbering of items as in :attr:`list_data`'''
-        return [idx for idx, selected in self._selected_items.items() if selected]
+        return list(self._selection)
 
     @property
     def selected_items_data(self) -> list[str | tuple | list | dict]:
@@ -396,36 +424,52 @@ class GlowList(GlowBoxLayout):
 
     def select_all(self, is_selected: bool) -> None:
         '''Unselect or select checkboxes on the entire list.'''
-        items = len(self._formatted_list_data)
-
-        for idx in range(items):
-            if is_selected:
-                self.ids.glow_list_layout.select_node(idx)
-            else:
-                self.ids.glow_list_layout.deselect_node(idx)
+        self._selection.select_all(is_selected)
+        self.ids.glow_list_layout.refresh_selection()
 
-            if idx in self._selected_items.keys():
-                self._selected_items[idx] = is_selected
+    def invert_selection(self) -> None:
+        '''Invert the selection of the entire list.'''
+        self._selection.invert()
+        self.ids.glow_list_layout.refresh_selection()
 
     def select_one(self, item_idx: int, is_selected: bool) -> None:
         '''Unselect or select checkbox on the list item.'''
-        if is_selected:
-            self.ids.glow_list_layout.select_node(item_idx)
-        else:
-            self.ids.glow_list_layout.deselect_node(item_idx)
-
-        self._selected_items[item_idx] = is_selected
+        self._selection.select(item_idx, is_selected)
+        self.ids.glow_list_layout.refresh_selection()
 
     def select_items(self, list_items_ids: list[int], is_selected: bool) -> None:
         '''Unselect or select checkbox on the list items.'''
-        for item_idx in list_items_ids:
-            self.select_one(item_idx, is_selected)
+        self._selection.select_many(list_items_ids, is_selected)
+        self.ids.glow_list_layout.refresh_selection()
+
+    def select_range(self, from_item_idx: int, to_item_idx: int, is_selected: bool = True) -> None:
+        '''Unselect or select the items from `from_item_idx` to `to_item_idx`,
+        both included, like a shift click on a checkbox.
+        '''
+        start, stop = sorted((from_item_idx, to_item_idx))
+        self._selection.select_range(start, stop + 1, is_selected)
+        self.ids.glow_list_layout.refresh_selection()
+
+    def _on_item_checkbox(self, item: GlowSelectableListItem) -> None:
+        '''Inner function for selecting an item by its checkbox.'''
+        is_selected = not item.selected
+        if 'shift' in Window.modifiers and self._last_checked_item is not None:
+            self.select_range(self._last_checked_item, item.idx, is_selected)
+        else:
+            self.select_one(item.idx, is_selected)
+        self._last_checked_item = item.idx
+
+    def _is_node_selected(self, index: int) -> bool:
+        '''Inner function telling the layout if an item is selected.'''
+        return self._selection.is_selected(index)
 
     def __update_list_data(self, update_selected_items: bool = True) -> None:
         '''Inner funciton for updating display data.'''
         if update_selected_items:
-            self.select_all(is_selected=False)
-            self._selected_items = dict.fromkeys(range(len(self.list_data)), False)
+            self._selection.reset(len(self.list_data))
+            self._last_checked_item = None
+        else:
+            self._selection.resize(len(self.list_data))
         formatted_list_data = []
 
         for item_idx, item_data in enumerate(self.list_data):
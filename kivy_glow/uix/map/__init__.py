@@ -1,5 +1,11 @@
+from .metrics import MapMetrics  # noqa F401
 from .mapdownloader import MapDownloader  # noqa F401
 from .mapsource import MapSource  # noqa F401
+from .snapshot import (  # noqa F401
+    MapSnapshot,
+    snapshot_to_texture,
+)
+from .vectortile import VectorTileSource  # noqa F401
 from .clustered_marker_layer import (  # noqa F401
     GlowClusteredMarkerLayer,
     GlowClusterMapMarker,
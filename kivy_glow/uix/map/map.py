@@ -9,9 +9,26 @@ __all__ = ('GlowMap', 'GlowMapLayer', 'GlowMapMarker', 'GlowMapMarkerPopup', 'Gl
 
 import os
 import webbrowser
-from collections import namedtuple
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+from collections import (
+    OrderedDict,
+    namedtuple,
+)
 from itertools import takewhile
-from math import ceil
+from math import (
+    asin,
+    ceil,
+    cos,
+    degrees,
+    floor,
+    radians,
+    sin,
+    sqrt,
+)
+from time import perf_counter
 from typing import (
     Any,
     Self,
@@ -20,11 +37,17 @@ from typing import (
 from kivy.base import EventLoop
 from kivy.clock import Clock
 from kivy.compat import string_types
+from kivy.core.image import Image as CoreImage
+from kivy.factory import Factory
 from kivy.graphics import (
     Canvas,
+    ClearBuffers,
+    ClearColor,
     Color,
+    Fbo,
     Rectangle,
 )
+from kivy.graphics.texture import Texture
 from kivy.graphics.transformation import Matrix
 from kivy.input.motionevent import MotionEvent
 from kivy.lang import Builder
@@ -45,7 +68,9 @@ from kivy_glow import kivy_glow_uix_dir
 from kivy_glow.uix.label import GlowLabel
 from kivy_glow.uix.widget import GlowWidget
 
+from .mapdownloader import MapDownloader
 from .mapsource import MapSource
+from .metrics import MapMetrics
 
 with open(
     os.path.join(kivy_glow_uix_dir, 'map', 'map.kv'), encoding='utf-8',
@@ -57,6 +82,17 @@ def clamp(x: float | int, minimum: float | int, maximum: float | int) -> float |
     return max(minimum, min(x, maximum))
 
 
+EARTH_RADIUS = 6371.0088
+
+
+def haversine(lat1: float | int, lon1: float | int, lat2: float | int, lon2: float | int) -> float:
+    '''Great circle distance between two points, in kilometers.'''
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(a)))
+
+
 Coordinate = namedtuple('Coordinate', ['lat', 'lon'])
 
 
@@ -87,11 +123,85 @@ class AttributionLabel(GlowLabel):
         webbrowser.open(str(args[0]), new=2)
 
 
+class TileLayer:
+    '''One source of a composited :class:`Tile`.
+    It is queued in the downloader in place of the tile itself.
+    '''
+
+    def __init__(self, tile: 'Tile', index: int, map_source: MapSource, opacity: float) -> None:
+        self.tile = tile
+        self.index = index
+        self.map_source = map_source
+        self.opacity = opacity
+        self.zoom = tile.zoom
+        self.tile_x = tile.tile_x
+        self.tile_y = tile.tile_y
+        # decoded once, the tile is composed again when another layer loads
+        self.texture = None
+
+    @property
+    def state(self) -> str:
+        return self.tile.state
+
+    @property
+    def cache_fn(self) -> str:
+        map_source = self.map_source
+        fn = map_source.cache_fmt.format(
+            cache_key=map_source.cache_key,
+            zoom=self.zoom,
+            tile_x=self.tile_x,
+            tile_y=self.tile_y,
+        )
+        return os.path.join(self.tile.cache_dir, fn)
+
+    def set_source(self, cache_fn: str | Texture) -> None:
+        # sources rendered on the gpu (vector tiles) give a texture
+        self.texture = cache_fn if isinstance(cache_fn, Texture) else CoreImage(cache_fn).texture
+        self.tile.compose()
+
+
 class Tile(Rectangle):
+    layers = None
+    fbo = None
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.cache_dir = kwargs.get('cache_dir', 'map_cache')
 
+    def set_layers(self, layers: list[tuple[MapSource, float]]) -> None:
+        '''Draw several sources into this tile, first one is the base.'''
+        self.layers = [
+            TileLayer(self, index, map_source, opacity)
+            for index, (map_source, opacity) in enumerate(layers)
+        ]
+
+    def compose(self) -> None:
+        '''Render all loaded layers into the tile texture in a single pass.
+        Nothing is drawn until the base layer is loaded.
+        '''
+        if self.state == 'done' or self.layers[0].texture is None:
+            return
+
+        if self.fbo is None:
+            tile_size = self.map_source.tile_size
+            self.fbo = Fbo(size=(tile_size, tile_size))
+
+        fbo = self.fbo
+        fbo.clear()
+        with fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            for layer in self.layers:
+                if layer.texture is None:
+                    continue
+                Color(1, 1, 1, layer.opacity)
+                Rectangle(texture=layer.texture, size=fbo.size)
+        fbo.draw()
+
+        self.texture = fbo.texture
+        if self.state == 'loading':
+            self.state = 'need-animation'
+
     @property
     def cache_fn(self) -> str:
         map_source = self.map_source
@@ -145,7 +255,21 @@ class GlowMapMarker(ButtonBehavior, GlowWidget, Image):
 
 class GlowMapMarkerPopup(GlowMapMarker):
     is_open = BooleanProperty(defaultvalue=False)
-    placeholder = ObjectProperty(defaultvalue=None)
+    placeholder = ObjectProperty(defaultvalue=None, allownone=True)
+
+    popup_factory = ObjectProperty(defaultvalue=None, allownone=True)
+    '''Callable returning the popup widget, or name of a kv / factory class.
+    The popup is built on the first opening instead of with the marker, so
+    thousands of popup markers do not hold thousands of popup trees.
+    '''
+
+    popup_cache_size = 32
+    '''How many built popups stay in memory after they are closed, shared by
+    all the markers using a :attr:`popup_factory`. The least recently closed
+    ones are released first. None to keep them all.
+    '''
+
+    _closed_popups = OrderedDict()
 
     def add_widget(self, widget: Widget) -> None:
         if not self.placeholder:
@@ -163,15 +287,51 @@ class GlowMapMarkerPopup(GlowMapMarker):
 
     def on_is_open(self, *args) -> None:
         self.refresh_open_status()
+        if self._layer is not None:
+            self._layer.set_popup_open(self, self.is_open)
 
     def on_release(self, *args) -> None:
         self.is_open = not self.is_open
 
-    def refresh_open_status(self) -> None:
-        if not self.is_open and self.placeholder.parent:
+    def build_popup(self) -> Widget:
+        '''Build the popup from :attr:`popup_factory`.'''
+        factory = self.popup_factory
+        if isinstance(factory, string_types):
+            factory = Factory.get(factory)
+        return factory()
+
+    def release_popup(self) -> None:
+        '''Release the built popup, it will be built again on the next
+        opening.
+        '''
+        self._closed_popups.pop(self, None)
+        if self.placeholder is not None and self.placeholder.parent is self:
             super().remove_widget(self.placeholder)
-        elif self.is_open and not self.placeholder.parent:
-            super().add_widget(self.placeholder)
+        self.placeholder = None
+
+    def refresh_open_status(self) -> None:
+        if self.is_open:
+            if self.placeholder is None and self.popup_factory is not None:
+                self.placeholder = self.build_popup()
+            self._closed_popups.pop(self, None)
+            if self.placeholder is not None and not self.placeholder.parent:
+                super().add_widget(self.placeholder)
+
+        elif self.placeholder is not None:
+            if self.placeholder.parent:
+                super().remove_widget(self.placeholder)
+            if self.popup_factory is not None:
+                self._cache_closed_popup()
+
+    def _cache_closed_popup(self) -> None:
+        closed_popups = self._closed_popups
+        closed_popups[self] = True
+        closed_popups.move_to_end(self)
+        if self.popup_cache_size is None:
+            return
+        while len(closed_popups) > self.popup_cache_size:
+            marker, _ = closed_popups.popitem(last=False)
+            marker.placeholder = None
 
 
 class GlowMapLayer(GlowWidget):
@@ -194,12 +354,25 @@ class GlowMapLayer(GlowWidget):
 
 
 class GlowMarkerMapLayer(GlowMapLayer):
-    '''A map layer for :class:`GlowMapMarker`'''
+    '''A map layer for :class:`GlowMapMarker`
+
+    Touches are not dispatched to every marker: the screen bounds of the
+    displayed markers are indexed in a grid of `hit_cell_size` cells, updated
+    in :meth:`reposition`, and only the markers under the touch (plus the
+    open popups) receive it, topmost first.
+    '''
 
     order_marker_by_latitude = BooleanProperty(defaultvalue=True)
 
+    hit_cell_size = 64
+    '''Size of the cells of the touch grid, in pixels.'''
+
     def __init__(self, *args, **kwargs) -> None:
         self.markers = []
+        self._hit_grid = None
+        self._hit_rank = {}
+        self._open_popups = set()
+        self._geo_index = None
         super().__init__(*args, **kwargs)
 
     def insert_marker(self, marker: GlowMapMarker | GlowMapMarkerPopup, **kwargs) -> None:
@@ -211,17 +384,30 @@ class GlowMarkerMapLayer(GlowMapLayer):
                 kwargs['index'] = before[-1][0] + 1
 
         super().add_widget(marker, **kwargs)
+        self._hit_grid = None
 
     def add_widget(self, marker: GlowMapMarker | GlowMapMarkerPopup) -> None:
         marker._layer = self
         self.markers.append(marker)
+        marker.fbind('lat', self._invalidate_geo_index)
+        marker.fbind('lon', self._invalidate_geo_index)
+        self._geo_index = None
+        if getattr(marker, 'is_open', False):
+            self._open_popups.add(marker)
         self.insert_marker(marker)
 
     def remove_widget(self, marker: GlowMapMarker | GlowMapMarkerPopup) -> None:
         marker._layer = None
         if marker in self.markers:
             self.markers.remove(marker)
+            marker.funbind('lat', self._invalidate_geo_index)
+            marker.funbind('lon', self._invalidate_geo_index)
+            self._geo_index = None
+        self._open_popups.discard(marker)
+        if getattr(marker, 'popup_factory', None) is not None:
+            marker.release_popup()
         super().remove_widget(marker)
+        self._hit_grid = None
 
     def reposition(self) -> None:
         if not self.markers:
@@ -241,14 +427,117 @@ class GlowMarkerMapLayer(GlowMapLayer):
             else:
                 super().remove_widget(marker)
 
+        self._build_hit_grid()
+
     def set_marker_position(self, mapview: Widget, marker: GlowMapMarker | GlowMapMarkerPopup) -> None:
         x, y = mapview.get_window_xy_from(marker.lat, marker.lon, mapview.zoom)
         marker.x = int(x - marker.width * marker.anchor_x)
         marker.y = int(y - marker.height * marker.anchor_y)
+        self._hit_grid = None
+
+    def set_popup_open(self, marker: GlowMapMarkerPopup, is_open: bool) -> None:
+        '''Called by the popups: open popups may receive touches outside of
+        the marker bounds.
+        '''
+        if is_open:
+            self._open_popups.add(marker)
+        else:
+            self._open_popups.discard(marker)
 
     def unload(self) -> None:
         self.clear_widgets()
+        for marker in self.markers:
+            marker.funbind('lat', self._invalidate_geo_index)
+            marker.funbind('lon', self._invalidate_geo_index)
+            if getattr(marker, 'popup_factory', None) is not None:
+                marker.release_popup()
         del self.markers[:]
+        self._open_popups.clear()
+        self._geo_index = None
+        self._hit_grid = None
+
+    def markers_at(self, lat: float | int, lon: float | int, radius: float | int) -> list[GlowMapMarker | GlowMapMarkerPopup]:
+        '''Markers of the layer within `radius` kilometers of lat/lon,
+        displayed or not, nearest first.
+        '''
+        if self._geo_index is None:
+            markers = sorted(self.markers, key=lambda marker: marker.lat)
+            self._geo_index = ([marker.lat for marker in markers], markers)
+        lats, markers = self._geo_index
+
+        dlat = degrees(radius / EARTH_RADIUS)
+        found = []
+        for index in range(bisect_left(lats, lat - dlat), bisect_right(lats, lat + dlat)):
+            marker = markers[index]
+            distance = haversine(lat, lon, marker.lat, marker.lon)
+            if distance <= radius:
+                found.append((distance, index, marker))
+        found.sort()
+        return [marker for _, _, marker in found]
+
+    def marker_at(self, x: float | int, y: float | int) -> GlowMapMarker | GlowMapMarkerPopup | None:
+        '''Topmost displayed marker colliding the x/y position.'''
+        for marker in self._get_hit_candidates(x, y):
+            if marker.collide_point(x, y):
+                return marker
+        return None
+
+    def on_touch_down(self, touch: MotionEvent) -> bool:
+        return self._dispatch_touch('on_touch_down', touch)
+
+    def on_touch_move(self, touch: MotionEvent) -> bool:
+        return self._dispatch_touch('on_touch_move', touch)
+
+    def on_touch_up(self, touch: MotionEvent) -> bool:
+        return self._dispatch_touch('on_touch_up', touch)
+
+    def _dispatch_touch(self, event: str, touch: MotionEvent) -> bool:
+        if self.disabled:
+            return False
+        for marker in self._get_hit_candidates(*touch.pos):
+            if marker.dispatch(event, touch):
+                return True
+        return False
+
+    def _invalidate_geo_index(self, *args) -> None:
+        self._geo_index = None
+
+    def _build_hit_grid(self) -> None:
+        cell_size = self.hit_cell_size
+        grid = {}
+        for marker in self.children:
+            x, y = marker.pos
+            width, height = marker.size
+            for cell_x in range(floor(x / cell_size), floor((x + width) / cell_size) + 1):
+                for cell_y in range(floor(y / cell_size), floor((y + height) / cell_size) + 1):
+                    cell = grid.get((cell_x, cell_y))
+                    if cell is None:
+                        grid[(cell_x, cell_y)] = [marker]
+                    else:
+                        cell.append(marker)
+
+        # children[0] is drawn last, so it is the topmost
+        self._hit_rank = {marker: rank for rank, marker in enumerate(self.children)}
+        self._hit_grid = grid
+
+    def _get_hit_candidates(self, x: float | int, y: float | int) -> list[GlowMapMarker | GlowMapMarkerPopup]:
+        if self._hit_grid is None:
+            self._build_hit_grid()
+
+        cell_size = self.hit_cell_size
+        candidates = [
+            marker
+            for marker in self._hit_grid.get((floor(x / cell_size), floor(y / cell_size)), ())
+            if marker.collide_point(x, y)
+        ]
+        candidates.extend(
+            marker
+            for marker in self._open_popups
+            if marker.parent is self and marker not in candidates
+        )
+        rank = self._hit_rank
+        candidates.sort(key=lambda marker: rank.get(marker, len(rank)))
+        return candidates
 
 
 class GlowMapViewScatter(GlowWidget, Scatter):
@@ -282,6 +571,31 @@ class GlowMap(GlowWidget):
     '''Provider of the map, default to a empty :class:`MapSource`.
     '''
 
+    overlays = ListProperty()
+    '''Sources drawn over :attr:`map_source`, bottom to top.
+    Each item is a :class:`MapSource`, a provider name or a (source, opacity)
+    pair. Overlay tiles share the downloader and the cache of the map and are
+    composited with the base tile into a single texture.
+    '''
+
+    downloader = ObjectProperty(defaultvalue=None, allownone=True)
+    ''':class:`MapDownloader` used to load the tiles of this map and its
+    overlays. Tiles are stored in the downloader cache directory.
+    Default to None, the downloader shared by all maps using the same
+    :attr:`cache_dir`.
+    '''
+
+    download_priority = NumericProperty(defaultvalue=0)
+    '''Priority of this map tiles in the downloader queue. Tiles of a map with
+    a higher priority are always dispatched first, so a background map that
+    shares the downloader cannot starve the foreground one. Default to 0.
+    '''
+
+    metrics = ObjectProperty(defaultvalue=None, allownone=True)
+    ''':class:`MapMetrics` receiving the map update and tile metrics.
+    Default to None, no metrics are collected. See :meth:`enable_metrics`.
+    '''
+
     double_tap_zoom = BooleanProperty(defaultvalue=False)
     '''If True, this will activate the double-tap to zoom.
     '''
@@ -298,6 +612,19 @@ class GlowMap(GlowWidget):
     Default to True, even if it doesn't fully working yet.
     '''
 
+    zoom_hysteresis = NumericProperty(defaultvalue=0.2)
+    '''How far past a zoom threshold, in zoom levels, the scale must go
+    before the map switches to the next or previous zoom. Avoids reloading
+    all the tiles when a pinch goes back and forth around a threshold.
+    Default to 0.2. Use 0 to switch exactly at the thresholds.
+    '''
+
+    fractional_zoom = BooleanProperty(defaultvalue=False)
+    '''If True, the current tiles are only scaled during a pinch, scroll or
+    double tap zoom, and the zoom level is switched once the gesture ends.
+    Default to False.
+    '''
+
     animation_duration = NumericProperty(defaultvalue=100)
     '''Duration to animate Tiles alpha from 0 to 1 when it's ready to show.
     Default to 100 as 100ms. Use 0 to deactivate.
@@ -356,6 +683,22 @@ class GlowMap(GlowWidget):
         ny = (ms.get_y(zoom, lat) - vy) * scale + self.pos[1]
         return nx, ny
 
+    def get_downloader(self) -> MapDownloader:
+        '''Return the :class:`MapDownloader` used by this map.'''
+        if self.downloader is not None:
+            return self.downloader
+        return MapDownloader.instance(cache_dir=self.cache_dir)
+
+    def enable_metrics(self, metrics: MapMetrics | None = None) -> MapMetrics:
+        '''Collect the metrics of this map and of its downloader into the same
+        :class:`MapMetrics`, a new instance if none is given.
+        '''
+        if metrics is None:
+            metrics = MapMetrics()
+        self.metrics = metrics
+        self.get_downloader().enable_metrics(metrics)
+        return metrics
+
     def center_on(self, *args) -> None:
         '''Center the map on the coordinate :class:`Coordinate`, or a (lat, lon)
         '''
@@ -521,6 +864,7 @@ class GlowMap(GlowWidget):
         self._tiles_bg = []
         self._tilemap = {}
         self._layers = []
+        self._overlay_sources = []
         self._default_marker_layer = None
         self._need_redraw_full = True
         self._transform_lock = False
@@ -612,6 +956,8 @@ class GlowMap(GlowWidget):
         self.diff_scale_at(diff, *self._scale_target_pos)
         ret = self._scale_target != 0
         if not ret:
+            self._scale_target_anim = False
+            self._settle_zoom()
             self._pause = False
         return ret
 
@@ -668,6 +1014,8 @@ class GlowMap(GlowWidget):
                 elif cur_zoom > zoom or round(cur_scale, 3) > round(scale, 3):
                     self.animated_diff_scale_at(2.0 - cur_scale, *touch.pos)
 
+                if not self._scale_target_anim:
+                    self._settle_zoom()
                 self._pause = False
 
             return True
@@ -685,14 +1033,9 @@ class GlowMap(GlowWidget):
         scatter = self._scatter
         scale = scatter.scale
 
-        if (scale - 2.0) > 0.01:
-            zoom += 1
-            scale /= 2.0
-        elif (scale - 1.0) < -0.01:
-            zoom -= 1
-            scale *= 2.0
+        if not (self.fractional_zoom and self._in_gesture()):
+            zoom, scale = self._snap_zoom(zoom, scale)
 
-        zoom = clamp(zoom, map_source.min_zoom, map_source.max_zoom)
         if zoom != self._zoom:
             self.set_zoom_at(zoom, scatter.x, scatter.y, scale=scale)
             self.trigger_update(full=True)
@@ -709,6 +1052,30 @@ class GlowMap(GlowWidget):
         self._transform_lock = False
         self._scale = self._scatter.scale
 
+    def _snap_zoom(self, zoom: int, scale: float) -> tuple[int, float]:
+        # integer zoom and remaining scatter scale, with hysteresis around
+        # the 1.0 and 2.0 thresholds
+        map_source = self.map_source
+        zoom_in_scale = 2.0 * 2 ** self.zoom_hysteresis
+        zoom_out_scale = 2 ** -self.zoom_hysteresis
+
+        while scale > zoom_in_scale and zoom < map_source.max_zoom:
+            zoom += 1
+            scale /= 2.0
+        while scale < zoom_out_scale and zoom > map_source.min_zoom:
+            zoom -= 1
+            scale *= 2.0
+
+        return zoom, scale
+
+    def _in_gesture(self) -> bool:
+        return self._touch_count > 0 or self._scale_target_anim
+
+    def _settle_zoom(self) -> None:
+        # switch to the zoom level reached by a fractional zoom gesture
+        if self.fractional_zoom:
+            self.on_transform(self._scatter.transform)
+
     def _apply_bounds(self) -> None:
         # if the map_source have any constraints, apply them here.
         map_source = self.map_source
@@ -747,6 +1114,10 @@ class GlowMap(GlowWidget):
         Clock.schedule_once(self.do_update, -1)
 
     def do_update(self, *args) -> None:
+        metrics = self.metrics
+        if metrics is not None:
+            start = perf_counter()
+
         zoom = self._zoom
         scale = self._scale
         self.lon = self.map_source.get_lon(
@@ -768,6 +1139,9 @@ class GlowMap(GlowWidget):
         else:
             self.load_visible_tiles()
 
+        if metrics is not None:
+            metrics.observe('do_update_time', perf_counter() - start)
+
     def bbox_for_zoom(self, vx: float | int, vy: float | int, w: float | int, h: float | int, zoom: int) -> tuple[int, int, int, int, int, int]:
         # return a tile-bbox for the zoom
         map_source = self.map_source
@@ -867,6 +1241,7 @@ class GlowMap(GlowWidget):
         arm_max = max(x_count, y_count) + 2
         arm_size = 1
         turn = 0
+        loaded = len(self._tiles)
         while arm_size < arm_max:
             for _ in range(arm_size):
                 if (
@@ -886,15 +1261,20 @@ class GlowMap(GlowWidget):
 
             turn += 1
 
+        if self.metrics is not None:
+            new_tiles = len(self._tiles) - loaded
+            self.metrics.observe('tiles_per_load', new_tiles)
+            self.metrics.increment('memory_misses', new_tiles)
+
     def load_tile(self, x: float | int, y: float | int, size: int, zoom: int) -> None:
         if self.tile_in_tile_map(x, y) or zoom != self._zoom:
             return
         self.load_tile_for_source(self.map_source, 1.0, size, x, y, zoom)
-        # XXX do overlay support
         self.tile_map_set(x, y, value=True)
 
     def load_tile_for_source(self, map_source: MapSource, opacity: float, size: int, x: float | int, y: float | int, zoom: int) -> None:
-        tile = Tile(size=(size, size), cache_dir=self.cache_dir)
+        downloader = self.get_downloader()
+        tile = Tile(size=(size, size), cache_dir=downloader.cache_dir)
         tile.g_color = Color(1, 1, 1, 0)
         tile.tile_x = x
         tile.tile_y = y
@@ -902,8 +1282,22 @@ class GlowMap(GlowWidget):
         tile.pos = (x * size + self.delta_x, y * size + self.delta_y)
         tile.map_source = map_source
         tile.state = 'loading'
+
+        overlays = [
+            (overlay_source, overlay_opacity)
+            for overlay_source, overlay_opacity in self._overlay_sources
+            if overlay_source.min_zoom <= zoom <= overlay_source.max_zoom
+        ]
+        if overlays or opacity != 1.0:
+            tile.set_layers([(map_source, opacity), *overlays])
+
         if not self._pause:
-            map_source.fill_tile(tile)
+            priority = self.download_priority
+            if tile.layers is None:
+                map_source.fill_tile(tile, downloader, priority)
+            else:
+                for layer in tile.layers:
+                    layer.map_source.fill_tile(layer, downloader, priority)
         self.canvas_map.add(tile.g_color)
         self.canvas_map.add(tile)
         self._tiles.append(tile)
@@ -938,6 +1332,8 @@ class GlowMap(GlowWidget):
         # except for the tiles that are owned by the current zoom level
         for tile in btiles[:]:
             if tile.zoom == zoom:
+                if self.metrics is not None:
+                    self.metrics.increment('memory_hits')
                 btiles.remove(tile)
                 tiles.append(tile)
                 tile.size = tile_size, tile_size
@@ -990,3 +1386,26 @@ class GlowMap(GlowWidget):
         self.zoom = clamp(self.zoom, self.map_source.min_zoom, self.map_source.max_zoom)
         self.remove_all_tiles()
         self.trigger_update(full=True)
+
+    def on_downloader(self, instance: Self, downloader: MapDownloader | None) -> None:
+        self.remove_all_tiles()
+        self.trigger_update(full=True)
+
+    def on_overlays(self, instance: Self, overlays: list) -> None:
+        overlay_sources = []
+        for overlay in overlays:
+            opacity = 1.0
+            if isinstance(overlay, (tuple, list)):
+                overlay, opacity = overlay
+
+            if isinstance(overlay, string_types):
+                overlay = MapSource(overlay, cache_dir=self.cache_dir)
+            elif not isinstance(overlay, MapSource):
+                raise Exception('Invalid overlay map source provider')
+
+            overlay.cache_dir = self.cache_dir
+            overlay_sources.append((overlay, opacity))
+
+        self._overlay_sources = overlay_sources
+        self.remove_all_tiles()
+        self.trigger_update(full=True)
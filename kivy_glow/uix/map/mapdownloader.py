@@ -1,14 +1,25 @@
-__all__ = ('MapDownloader', )
+__all__ = ('AdaptiveConcurrency', 'MapDownloader', 'ProviderLimiter', 'TokenBucket')
 
 import traceback
+from collections import deque
 from concurrent.futures import (
     ThreadPoolExecutor,
     as_completed,
 )
-from os import makedirs
+from os import (
+    makedirs,
+    replace,
+)
 from os.path import exists
-from random import choice
-from time import time
+from random import (
+    choice,
+    uniform,
+)
+from threading import get_ident
+from time import (
+    perf_counter,
+    time,
+)
 from typing import (
     Any,
     Callable,
@@ -19,19 +30,149 @@ import requests
 from kivy.clock import Clock
 from kivy.logger import Logger
 
+from .metrics import MapMetrics
+
 USER_AGENT = 'kivy-glow.map'
 
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class TileDownloadError(Exception):
+    def __init__(self, status: int | None = None, retry_after: float | None = None, retry: bool = True) -> None:
+        super().__init__(f'tile download failed (status={status})')
+        self.status = status
+        self.retry_after = retry_after
+        self.retry = retry
+
+
+class TokenBucket:
+    '''Token bucket that limits the request rate of a provider.
+
+    `rate` tokens are added per second, up to `burst` tokens.
+    '''
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(burst) if burst is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.timestamp = time()
+
+    def _refill(self) -> None:
+        now = time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+        self.timestamp = now
+
+    def consume(self, tokens: float = 1) -> bool:
+        '''Take tokens from the bucket. Returns False if not enough tokens.'''
+        self._refill()
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+
+class AdaptiveConcurrency:
+    '''AIMD concurrency limit.
+
+    The limit grows by about one request per round trip while the latency
+    stays under `target_latency`, shrinks slowly when it goes above, and is
+    halved on 429 and server errors (5xx), connection errors and timeouts.
+    '''
+
+    LATENCY_DECREASE = 0.9
+
+    def __init__(self, initial: float, minimum: float, maximum: float, target_latency: float, decrease: float = 0.5) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.target_latency = target_latency
+        self.decrease = decrease
+        self.in_flight = 0
+
+    def acquire(self) -> bool:
+        '''Reserve a request slot. Returns False if the limit is reached.'''
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency: float | None = None, throttled: bool = False) -> None:
+        '''Free a request slot and adapt the limit to the observed result.'''
+        self.in_flight = max(0, self.in_flight - 1)
+        if throttled:
+            self.limit = max(self.minimum, self.limit * self.decrease)
+        elif latency is not None:
+            if latency <= self.target_latency:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            else:
+                self.limit = max(self.minimum, self.limit * self.LATENCY_DECREASE)
+
+
+class ProviderLimiter:
+    '''Rate limit, adaptive concurrency and backoff state of one provider.'''
+
+    def __init__(self, map_source: Any) -> None:
+        self.bucket = TokenBucket(map_source.rate_limit, map_source.rate_burst) if map_source.rate_limit else None
+        self.concurrency = AdaptiveConcurrency(
+            initial=map_source.min_concurrency,
+            minimum=map_source.min_concurrency,
+            maximum=map_source.max_concurrency,
+            target_latency=map_source.target_latency,
+        )
+        self.max_retries = map_source.max_retries
+        self.backoff_base = map_source.backoff_base
+        self.backoff_max = map_source.backoff_max
+        self.blocked_until = 0
+
+    def acquire(self, now: float) -> bool:
+        if now < self.blocked_until:
+            return False
+        if not self.concurrency.acquire():
+            return False
+        if self.bucket is not None and not self.bucket.consume():
+            self.concurrency.release()
+            return False
+        return True
+
+    def backoff(self, attempt: int) -> float:
+        '''Exponential backoff with full jitter.'''
+        return uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class _TileJob:
+    __slots__ = ('attempt', 'latency', 'limiter', 'priority', 'retry_at', 'size', 'tile')
+
+    def __init__(self, tile: Any, priority: int = 0) -> None:
+        self.tile = tile
+        self.priority = priority
+        self.attempt = 0
+        self.retry_at = 0
+        self.latency = None
+        self.limiter = None
+        self.size = 0
+
 
 class MapDownloader:
-    _instance = None
-    MAX_WORKERS = 5
+    '''Downloads tiles in a worker pool and hands them back on the main thread.
+
+    Maps sharing a cache directory share one downloader by default (see
+    :meth:`instance`). Pass your own instance to :attr:`GlowMap.downloader`
+    to give a map its own worker pool, limits and pause state, or the same
+    instance to several maps to share it explicitly. Within a downloader,
+    tiles queued with a higher priority are always dispatched first.
+    '''
+
+    _instances = {}
+    MAX_WORKERS = 32
     CAP_TIME = 0.064  # 15 FPS
 
     @staticmethod
     def instance(cache_dir: str = 'map_cache') -> Self:
-        if MapDownloader._instance is None:
-            MapDownloader._instance = MapDownloader(cache_dir=cache_dir)
-        return MapDownloader._instance
+        '''Return the downloader shared by every map using `cache_dir`.'''
+        downloader = MapDownloader._instances.get(cache_dir)
+        if downloader is None:
+            downloader = MapDownloader._instances[cache_dir] = MapDownloader(cache_dir=cache_dir)
+        return downloader
 
     def __init__(self, max_workers: int | None = None, cap_time: float | None = None, cache_dir: str = 'map_cache') -> None:
         if max_workers is None:
@@ -43,7 +184,11 @@ class MapDownloader:
         self.cache_dir = cache_dir
         self.cap_time = cap_time
         self.is_paused = False
+        self.metrics = None
         self._futures = []
+        self._jobs = {}
+        self._pending = {}
+        self._limiters = {}
 
         Clock.schedule_interval(self._check_executor, 1 / 60.0)
         if not exists(self.cache_dir):
@@ -53,33 +198,65 @@ class MapDownloader:
         future = self.executor.submit(f, *args, **kwargs)
         self._futures.append(future)
 
-    def download_tile(self, tile: Any) -> None:
+    def download_tile(self, tile: Any, priority: int = 0) -> None:
         Logger.debug(
             f'Downloader: queue(tile) zoom={tile.zoom} x={tile.tile_x} y={tile.tile_y}',
         )
-        future = self.executor.submit(self._load_tile, tile)
-        self._futures.append(future)
+        self._queue(_TileJob(tile, priority))
 
     def download(self, url: str, callback: Callable, **kwargs) -> None:
         Logger.debug(f'Downloader: queue(url) {url}')
         future = self.executor.submit(self._download_url, url, callback, kwargs)
         self._futures.append(future)
 
+    def enable_metrics(self, metrics: MapMetrics | None = None) -> MapMetrics:
+        '''Start collecting :class:`MapMetrics`, a new instance if none is given.'''
+        if metrics is None:
+            metrics = MapMetrics()
+        self.metrics = metrics
+        return metrics
+
+    def disable_metrics(self) -> None:
+        self.metrics = None
+
+    def pause(self) -> None:
+        '''Stop dispatching queued tiles. Running downloads still complete.'''
+        self.is_paused = True
+
+    def resume(self) -> None:
+        self.is_paused = False
+
+    def close(self) -> None:
+        '''Stop the downloader and drop every queued tile.'''
+        Clock.unschedule(self._check_executor)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+        self._futures.clear()
+        self._jobs.clear()
+        for cache_dir, downloader in list(MapDownloader._instances.items()):
+            if downloader is self:
+                del MapDownloader._instances[cache_dir]
+
+    def _queue(self, job: _TileJob) -> None:
+        queue = self._pending.get(job.priority)
+        if queue is None:
+            queue = self._pending[job.priority] = deque()
+        queue.append(job)
+
+    def get_limiter(self, map_source: Any) -> ProviderLimiter:
+        '''Return the limiter shared by all tiles of the map source provider.'''
+        limiter = self._limiters.get(map_source.cache_key)
+        if limiter is None:
+            limiter = self._limiters[map_source.cache_key] = ProviderLimiter(map_source)
+        return limiter
+
     def _download_url(self, url: str, callback: Callable, **kwargs) -> None:
         Logger.debug(f'Downloader: download(url) {url}')
         response = requests.get(url, **kwargs, timeout=100)
         response.raise_for_status()
         return callback, (url, response)
 
-    def _load_tile(self, tile: Any) -> None:
-        if tile.state == 'done':
-            return None
-
-        cache_fn = tile.cache_fn
-        if exists(cache_fn):
-            Logger.debug(f'Downloader: use cache {cache_fn}')
-            return tile.set_source, (cache_fn, )
-
+    def _get_tile_url(self, tile: Any) -> str:
         tile_y = tile.map_source.get_row_count(tile.zoom) - tile.tile_y - 1
 
         url = tile.map_source.url.format(
@@ -94,41 +271,192 @@ class MapDownloader:
         if tile.map_source.api_key is not None:
             url = url.format(api_key=tile.map_source.api_key)
 
-        Logger.debug(f'Downloader: download(tile) {url}')
+        return url
+
+    def _use_cache(self, tile: Any) -> None:
+        cache_fn = tile.cache_fn
+        Logger.debug(f'Downloader: use cache {cache_fn}')
+        return tile.set_source, (cache_fn, )
+
+    def fetch_tile(self, tile: Any) -> str | None:
+        '''Return the cache file of the tile, downloading it in the calling
+        thread if needed. Returns None if the tile could not be downloaded.
+        '''
+        cache_fn = tile.cache_fn
+        if exists(cache_fn):
+            return cache_fn
+
         try:
+            self._fetch_tile(tile)
+        except TileDownloadError as e:
+            Logger.error(f'MapDownloader error: {e!r}')
+            return None
+
+        return cache_fn
 
+    def _fetch_tile(self, tile: Any) -> bytes:
+        cache_fn = tile.cache_fn
+        url = self._get_tile_url(tile)
+
+        Logger.debug(f'Downloader: download(tile) {url}')
+        try:
             response = requests.get(url, headers={'User-agent': USER_AGENT}, timeout=5)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TileDownloadError() from e
+
+        if response.status_code in RETRY_STATUS:
+            retry_after = response.headers.get('Retry-After')
+            try:
+                retry_after = float(retry_after) if retry_after is not None else None
+            except ValueError:
+                retry_after = None
+            raise TileDownloadError(response.status_code, retry_after)
+
+        try:
             response.raise_for_status()
-            data = response.content
+        except requests.HTTPError as e:
+            raise TileDownloadError(response.status_code, retry=False) from e
 
-            with open(cache_fn, 'wb') as fd:
-                fd.write(data)
+        data = response.content
 
-            Logger.debug(f'MapDownloaded {len(data)} bytes: {url}')
+        # write next to the cache file first, so a reader never sees a partial tile
+        part_fn = f'{cache_fn}.{get_ident()}.part'
+        with open(part_fn, 'wb') as fd:
+            fd.write(data)
+        replace(part_fn, cache_fn)
 
-            return tile.set_source, (cache_fn, )
+        Logger.debug(f'MapDownloaded {len(data)} bytes: {url}')
 
-        except Exception as e:
-            Logger.error(f'MapDownloader error: {e!r}')
+        return data
+
+    def _load_tile(self, job: _TileJob) -> None:
+        tile = job.tile
+        if tile.state == 'done':
+            return None
+
+        start = time()
+        try:
+            data = self._fetch_tile(tile)
+        finally:
+            job.latency = time() - start
+        job.size = len(data)
+
+        return tile.set_source, (tile.cache_fn, )
+
+    def _dispatch(self) -> None:
+        '''Submit the pending tiles allowed by their provider limits,
+        highest priority first.
+        '''
+        if self.is_paused:
+            return
+
+        now = time()
+        metrics = self.metrics
+        for priority in sorted(self._pending, reverse=True):
+            pending = self._pending[priority]
+            waiting = deque()
+
+            while pending:
+                job = pending.popleft()
+                tile = job.tile
+                if tile.state == 'done':
+                    continue
+
+                if job.attempt == 0:
+                    cached = exists(tile.cache_fn)
+                    if metrics is not None:
+                        metrics.increment('disk_hits' if cached else 'disk_misses')
+                    if cached:
+                        future = self.executor.submit(self._use_cache, tile)
+                        self._futures.append(future)
+                        continue
+
+                limiter = self.get_limiter(tile.map_source)
+                if now < job.retry_at or not limiter.acquire(now):
+                    waiting.append(job)
+                    continue
+
+                job.limiter = limiter
+                future = self.executor.submit(self._load_tile, job)
+                self._futures.append(future)
+                self._jobs[future] = job
+
+            if waiting:
+                self._pending[priority] = waiting
+            else:
+                del self._pending[priority]
+
+        if metrics is not None:
+            metrics.set_gauge('queue_depth', sum(len(pending) for pending in self._pending.values()))
+            metrics.set_gauge('in_flight', len(self._jobs))
+
+    def _on_tile_failed(self, job: _TileJob, error: Exception) -> None:
+        limiter = job.limiter
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.increment('download_errors')
+        if not isinstance(error, TileDownloadError):
+            limiter.concurrency.release()
+            Logger.error(f'MapDownloader error: {error!r}')
+            return
+
+        # a server failing fast is overloaded too, its latency is not a signal
+        throttled = error.status is None or error.status == 429 or error.status >= 500
+        limiter.concurrency.release(job.latency, throttled=throttled)
+
+        if error.retry_after is not None:
+            limiter.blocked_until = max(limiter.blocked_until, time() + error.retry_after)
+
+        if not error.retry or job.attempt >= limiter.max_retries:
+            Logger.error(f'MapDownloader error: {error!r}')
+            return
+
+        if metrics is not None:
+            metrics.increment('download_retries')
+        job.retry_at = time() + limiter.backoff(job.attempt)
+        job.attempt += 1
+        self._queue(job)
 
     def _check_executor(self, *args) -> None:
         start = time()
+        metrics = self.metrics
         try:
             for future in as_completed(self._futures[:], 0):
                 self._futures.remove(future)
+                job = self._jobs.pop(future, None)
                 try:
                     result = future.result()
-                except Exception:
-                    traceback.print_exc()
+                except Exception as e:
+                    if job is not None:
+                        self._on_tile_failed(job, e)
+                    else:
+                        traceback.print_exc()
                     continue
 
+                if job is not None:
+                    job.limiter.concurrency.release(job.latency)
+                    if metrics is not None and job.latency is not None:
+                        metrics.increment('downloads')
+                        metrics.increment('bytes', job.size)
+                        metrics.observe('download_latency', job.latency)
+
                 if result is None:
                     continue
 
                 callback, args = result
-                callback(*args)
+                if metrics is not None:
+                    decode_start = perf_counter()
+                    callback(*args)
+                    metrics.observe('decode_time', perf_counter() - decode_start)
+                else:
+                    callback(*args)
 
                 if time() - start > self.cap_time:
                     break
         except TimeoutError:
             pass
+
+        self._dispatch()
+
+        if metrics is not None:
+            metrics.observe('check_executor_time', time() - start)
@@ -1,4 +1,6 @@
-__all__ = ('MapSource', )
+__all__ = ('MapSource', 'TileRef')
+
+import os
 
 from math import (
     atan,
@@ -20,11 +22,28 @@ def clamp(x: float | int, minimum: float | int, maximum: float | int) -> float |
 
 
 class MapSource:
+    '''Tiles of a provider of :attr:`providers`, by name.
+
+    Besides the url and zoom limits, a provider entry may define how hard
+    the :class:`MapDownloader` is allowed to hit it:
+        'rate_limit': None,  # requests per second, None for no limit
+        'rate_burst': None,  # token bucket size, defaults to rate_limit
+        'min_concurrency': 1,  # parallel requests the AIMD limit starts from
+        'max_concurrency': 6,  # upper bound of the AIMD limit
+        'target_latency': 1.0,  # seconds, above it the limit decreases
+        'max_retries': 3,
+        'backoff_base': 0.5,  # seconds, doubled on every retry
+        'backoff_max': 30.0,
+
+    `provider` can also be such an entry directly, with a 'cache_key'.
+    '''
+
     providers: ClassVar[dict] = {
         'osm': {
             'min_zoom': 0,
             'max_zoom': 19,
             'sub_domains': ('a', 'b', 'c'),
+            'max_concurrency': 2,
             'url_template': 'http://{sub_domain}.tile.openstreetmap.org/{z}/{x}/{y}.png',
             'attribution': 'Maps & Data © [i][ref=http://www.osm.org/copyright]OpenStreetMap[/ref][/i] contributors.',
         },
@@ -161,14 +180,28 @@ class MapSource:
         },
     }
 
-    def __init__(self, provider: str = 'osm', tile_size: int = 256, api_key: str | None = None, cache_dir: str = 'map_cache') -> None:
-        self.sub_domains = self.providers[provider]['sub_domains'] if 'sub_domains' in self.providers[provider] else None
-        self.attribution = self.providers[provider]['attribution']
-        self.min_zoom = self.providers[provider]['min_zoom']
-        self.max_zoom = self.providers[provider]['max_zoom']
-        self.url = self.providers[provider]['url_template']
+    def __init__(self, provider: str | dict = 'osm', tile_size: int = 256, api_key: str | None = None, cache_dir: str = 'map_cache') -> None:
+        if isinstance(provider, dict):
+            provider_info = provider
+            provider = provider_info.get('cache_key', 'custom')
+        else:
+            provider_info = self.providers[provider]
+        self.sub_domains = provider_info.get('sub_domains', None)
+        self.attribution = provider_info.get('attribution', '')
+        self.min_zoom = provider_info['min_zoom']
+        self.max_zoom = provider_info['max_zoom']
+        self.url = provider_info.get('url_template', None)
         self.api_key = api_key
 
+        self.rate_limit = provider_info.get('rate_limit', None)
+        self.rate_burst = provider_info.get('rate_burst', None)
+        self.min_concurrency = provider_info.get('min_concurrency', 1)
+        self.max_concurrency = provider_info.get('max_concurrency', 6)
+        self.target_latency = provider_info.get('target_latency', 1.0)
+        self.max_retries = provider_info.get('max_retries', 3)
+        self.backoff_base = provider_info.get('backoff_base', 0.5)
+        self.backoff_max = provider_info.get('backoff_max', 30.0)
+
         self.dp_tile_size = min(dp(tile_size), tile_size * 2)
         self.cache_fmt = '{cache_key}_{zoom}_{tile_x}_{tile_y}.png'
         self.tile_size = tile_size
@@ -224,10 +257,40 @@ class MapSource:
         '''Return the maximum zoom of this source.'''
         return self.max_zoom
 
-    def fill_tile(self, tile: Any) -> None:
-        '''Add this tile to load within the downloader.'''
+    def fill_tile(self, tile: Any, downloader: MapDownloader | None = None, priority: int = 0) -> None:
+        '''Add this tile to load within the downloader.
+        If no downloader is given, the one shared by the :attr:`cache_dir` is used.
+        '''
 
         if tile.state == 'done':
             return
 
-        MapDownloader.instance(cache_dir=self.cache_dir).download_tile(tile)
+        if downloader is None:
+            downloader = MapDownloader.instance(cache_dir=self.cache_dir)
+        downloader.download_tile(tile, priority=priority)
+
+
+class TileRef:
+    '''A tile of a map source that is not drawn, only downloaded or read
+    from the cache (see :meth:`MapDownloader.fetch_tile`).
+    '''
+
+    state = 'loading'
+
+    def __init__(self, map_source: MapSource, zoom: int, tile_x: int, tile_y: int, cache_dir: str) -> None:
+        self.map_source = map_source
+        self.zoom = zoom
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.cache_dir = cache_dir
+
+    @property
+    def cache_fn(self) -> str:
+        map_source = self.map_source
+        fn = map_source.cache_fmt.format(
+            cache_key=map_source.cache_key,
+            zoom=self.zoom,
+            tile_x=self.tile_x,
+            tile_y=self.tile_y,
+        )
+        return os.path.join(self.cache_dir, fn)
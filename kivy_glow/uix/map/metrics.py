@@ -0,0 +1,116 @@
+__all__ = ('Histogram', 'MapMetrics')
+
+from collections import deque
+
+
+class Histogram:
+    '''Count, sum, min and max of all observed values, plus the last
+    `reservoir_size` values for percentiles.
+    '''
+
+    def __init__(self, reservoir_size: int = 1024) -> None:
+        self.values = deque(maxlen=reservoir_size)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def observe(self, value: float | int) -> None:
+        self.values.append(value)
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float | int) -> float:
+        '''Percentile of the recent values, `percent` between 0 and 100.'''
+        if not self.values:
+            return 0.0
+        values = sorted(self.values)
+        index = min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))
+        return values[index]
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.minimum,
+            'max': self.maximum,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class MapMetrics:
+    '''Counters, gauges and histograms of the map tile pipeline.
+
+    Metrics are opt-in: assign an instance to :attr:`GlowMap.metrics` and/or
+    :attr:`MapDownloader.metrics` (or use :meth:`GlowMap.enable_metrics`).
+
+    Collected names:
+        counters: `disk_hits`, `disk_misses`, `memory_hits`, `memory_misses`,
+            `downloads`, `download_errors`, `download_retries`, `bytes`
+        gauges: `queue_depth`, `in_flight`
+        histograms (seconds): `download_latency`, `decode_time`,
+            `check_executor_time`, `do_update_time`
+        histograms (count): `tiles_per_load`
+    '''
+
+    def __init__(self, reservoir_size: int = 1024) -> None:
+        self.reservoir_size = reservoir_size
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def increment(self, name: str, value: float | int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float | int) -> None:
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float | int) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram(self.reservoir_size)
+        histogram.observe(value)
+
+    def hit_rate(self, name: str) -> float:
+        '''Hit rate of the `{name}_hits` and `{name}_misses` counters.'''
+        hits = self.counters.get(f'{name}_hits', 0)
+        total = hits + self.counters.get(f'{name}_misses', 0)
+        return hits / total if total else 0.0
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    def snapshot(self) -> dict:
+        '''Return a copy of all the metrics.'''
+        return {
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'histograms': {name: histogram.as_dict() for name, histogram in self.histograms.items()},
+        }
+
+    def summary(self) -> str:
+        '''Short text summary, used by :meth:`GlowApp.fps_monitor_start`.'''
+        lines = [
+            f'queue: {self.gauges.get("queue_depth", 0)}  in flight: {self.gauges.get("in_flight", 0)}'
+            f'  disk hit: {self.hit_rate("disk"):.0%}  memory hit: {self.hit_rate("memory"):.0%}',
+        ]
+        timings = []
+        for name in ('download_latency', 'decode_time', 'check_executor_time', 'do_update_time'):
+            histogram = self.histograms.get(name)
+            if histogram is not None:
+                timings.append(f'{name}: {histogram.percentile(50) * 1000:.1f}/{histogram.percentile(95) * 1000:.1f}ms')
+        if timings:
+            lines.append('  '.join(timings))
+        return '\n'.join(lines)
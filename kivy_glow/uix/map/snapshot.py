@@ -0,0 +1,243 @@
+__all__ = ('MapSnapshot', 'snapshot_to_texture')
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from math import (
+    ceil,
+    floor,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+)
+
+from kivy.compat import string_types
+from kivy.graphics.texture import Texture
+from kivy.resources import resource_find
+
+from kivy_glow import kivy_glow_images_dir
+
+from .mapdownloader import MapDownloader
+from .mapsource import (
+    MapSource,
+    TileRef,
+)
+from .vectortile import VectorTileSource
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+DEFAULT_MARKER = os.path.join(kivy_glow_images_dir, 'map', 'marker.png')
+
+
+def clamp(x: float | int, minimum: float | int, maximum: float | int) -> float | int:
+    return max(minimum, min(x, maximum))
+
+
+class MapSnapshot:
+    '''Renders the map of a bbox at a zoom into a single image, without a
+    window or a :class:`GlowMap`.
+
+    Tiles are read from the disk cache of the downloader, missing ones are
+    downloaded in a worker pool and cached. The image is composed with
+    Pillow, so it also works headless. Requires `pillow`. Keep one instance to render many
+    thumbnails: the pool, the decoded markers and the cache are shared.
+    Sources of vector tiles are rendered by the GPU, so they can not be
+    used in a snapshot.
+
+    Example:
+        snapshot = MapSnapshot('osm')
+        image = snapshot.render((48.80, 2.25, 48.92, 2.42), zoom=12, size=(320, 240), markers=layer)
+        image.save('paris.png')
+    '''
+
+    def __init__(self, map_source: MapSource | str = 'osm', overlays: Iterable = (), downloader: MapDownloader | None = None, cache_dir: str = 'map_cache', max_workers: int = 8) -> None:
+        try:
+            import PIL  # noqa: F401, PLC0415
+        except ImportError as e:
+            raise ImportError('MapSnapshot requires pillow, pip install pillow') from e
+
+        if isinstance(map_source, string_types):
+            map_source = MapSource(map_source, cache_dir=cache_dir)
+
+        self.map_source = map_source
+        self.overlays = []
+        for overlay in overlays:
+            opacity = 1.0
+            if isinstance(overlay, (tuple, list)):
+                overlay, opacity = overlay
+            if isinstance(overlay, string_types):
+                overlay = MapSource(overlay, cache_dir=cache_dir)
+            self.overlays.append((overlay, opacity))
+
+        for source in (map_source, *(overlay for overlay, _ in self.overlays)):
+            if isinstance(source, VectorTileSource):
+                raise ValueError('MapSnapshot can not render a VectorTileSource')
+
+        if downloader is None:
+            downloader = MapDownloader.instance(cache_dir=cache_dir)
+        self.downloader = downloader
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._marker_images = {}
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def render(self, bbox: tuple[float, float, float, float], zoom: int, size: tuple[int, int] | None = None, markers: Iterable = ()) -> 'Image.Image':
+        '''Render the (lat1, lon1, lat2, lon2) bbox at `zoom` into an RGBA image.
+
+        `markers` may contain :class:`GlowMapMarker`, marker layers or any
+        object with `lat` and `lon` (and optionally `source`, `anchor_x`,
+        `anchor_y`). If `size` is given the image is resized to it.
+        '''
+        return self.render_many([{'bbox': bbox, 'zoom': zoom, 'size': size, 'markers': markers}])[0]
+
+    def render_many(self, snapshots: Iterable[dict]) -> list['Image.Image']:
+        '''Render several snapshots, each a dict of :meth:`render` arguments.
+        The tiles of all the snapshots are fetched together.
+        '''
+        views = [self._get_view(**snapshot) for snapshot in snapshots]
+
+        tiles = {}
+        for view in views:
+            for tile in view['tiles']:
+                tiles.setdefault(tile.cache_fn, tile)
+        cache_fns = dict(zip(tiles, self.executor.map(self.downloader.fetch_tile, tiles.values())))
+
+        return [self._compose(view, cache_fns) for view in views]
+
+    def _get_view(self, bbox: tuple[float, float, float, float], zoom: int, size: tuple[int, int] | None = None, markers: Iterable = ()) -> dict:
+        map_source = self.map_source
+        zoom = int(clamp(zoom, map_source.get_min_zoom(), map_source.get_max_zoom()))
+        lat1, lon1, lat2, lon2 = bbox
+        min_lat, max_lat = min(lat1, lat2), max(lat1, lat2)
+        min_lon, max_lon = min(lon1, lon2), max(lon1, lon2)
+
+        # work in pixels of the tile images, y going up like the map source
+        k = map_source.tile_size / map_source.dp_tile_size
+        x1 = map_source.get_x(zoom, min_lon) * k
+        x2 = map_source.get_x(zoom, max_lon) * k
+        y1 = map_source.get_y(zoom, min_lat) * k
+        y2 = map_source.get_y(zoom, max_lat) * k
+
+        tile_size = map_source.tile_size
+        max_x = map_source.get_col_count(zoom) - 1
+        max_y = map_source.get_row_count(zoom) - 1
+        tile_x_first = int(clamp(floor(x1 / tile_size), 0, max_x))
+        tile_x_last = int(clamp(ceil(x2 / tile_size) - 1, tile_x_first, max_x))
+        tile_y_first = int(clamp(floor(y1 / tile_size), 0, max_y))
+        tile_y_last = int(clamp(ceil(y2 / tile_size) - 1, tile_y_first, max_y))
+
+        layers = [(map_source, 1.0)] + [
+            (overlay, opacity)
+            for overlay, opacity in self.overlays
+            if overlay.get_min_zoom() <= zoom <= overlay.get_max_zoom()
+        ]
+        cache_dir = self.downloader.cache_dir
+        placements = []
+        tiles = []
+        for tile_x in range(tile_x_first, tile_x_last + 1):
+            for tile_y in range(tile_y_first, tile_y_last + 1):
+                left = (tile_x - tile_x_first) * tile_size
+                top = (tile_y_last - tile_y) * tile_size
+                layer_tiles = [
+                    (TileRef(source, zoom, tile_x, tile_y, cache_dir), opacity)
+                    for source, opacity in layers
+                ]
+                placements.append(((left, top), layer_tiles))
+                tiles.extend(tile for tile, _ in layer_tiles)
+
+        # the tiles are composed on a grid image, then cropped to the bbox
+        grid_left = tile_x_first * tile_size
+        grid_top = (tile_y_last + 1) * tile_size
+        return {
+            'zoom': zoom,
+            'origin': (x1, y2),
+            'scale': k,
+            'grid_size': ((tile_x_last - tile_x_first + 1) * tile_size, (tile_y_last - tile_y_first + 1) * tile_size),
+            'crop': (
+                int(round(x1 - grid_left)),
+                int(round(grid_top - y2)),
+                int(round(x1 - grid_left)) + max(1, int(ceil(x2 - x1))),
+                int(round(grid_top - y2)) + max(1, int(ceil(y2 - y1))),
+            ),
+            'size': size,
+            'placements': placements,
+            'tiles': tiles,
+            'markers': markers,
+        }
+
+    def _compose(self, view: dict, cache_fns: dict) -> 'Image.Image':
+        from PIL import Image  # noqa: PLC0415
+
+        image = Image.new('RGBA', view['grid_size'])
+        tile_size = self.map_source.tile_size
+
+        for position, layer_tiles in view['placements']:
+            for tile, opacity in layer_tiles:
+                cache_fn = cache_fns.get(tile.cache_fn)
+                if cache_fn is None:
+                    continue
+                try:
+                    tile_image = Image.open(cache_fn).convert('RGBA')
+                except OSError:
+                    continue
+                if tile_image.size != (tile_size, tile_size):
+                    tile_image = tile_image.resize((tile_size, tile_size), Image.LANCZOS)
+                if opacity < 1.0:
+                    tile_image.putalpha(tile_image.getchannel('A').point(lambda a, opacity=opacity: int(a * opacity)))
+                image.alpha_composite(tile_image, dest=position)
+
+        image = image.crop(view['crop'])
+        self._draw_markers(image, view)
+
+        if view['size'] is not None:
+            image = image.resize(tuple(view['size']), Image.LANCZOS)
+        return image
+
+    def _iter_markers(self, markers: Iterable) -> Iterable[Any]:
+        for marker in markers:
+            if hasattr(marker, 'markers'):
+                yield from marker.markers
+            else:
+                yield marker
+
+    def _get_marker_image(self, source: str | None) -> 'Image.Image | None':
+        from PIL import Image  # noqa: PLC0415
+
+        source = source or DEFAULT_MARKER
+        marker_image = self._marker_images.get(source)
+        if marker_image is None:
+            try:
+                marker_image = Image.open(resource_find(source) or source).convert('RGBA')
+            except OSError:
+                return None
+            self._marker_images[source] = marker_image
+        return marker_image
+
+    def _draw_markers(self, image: 'Image.Image', view: dict) -> None:
+        map_source = self.map_source
+        zoom = view['zoom']
+        x1, y2 = view['origin']
+        k = view['scale']
+
+        for marker in self._iter_markers(view['markers']):
+            marker_image = self._get_marker_image(getattr(marker, 'source', None))
+            if marker_image is None:
+                continue
+            x = map_source.get_x(zoom, marker.lon) * k - x1
+            y = y2 - map_source.get_y(zoom, marker.lat) * k
+            left = int(x - marker_image.width * getattr(marker, 'anchor_x', 0.5))
+            top = int(y - marker_image.height * (1 - getattr(marker, 'anchor_y', 0)))
+            image.paste(marker_image, (left, top), marker_image)
+
+
+def snapshot_to_texture(image: 'Image.Image') -> Texture:
+    '''Convert a snapshot image to a kivy texture (needs a GL context).'''
+    from PIL import Image  # noqa: PLC0415
+
+    image = image.convert('RGBA')
+    texture = Texture.create(size=image.size, colorfmt='rgba')
+    texture.blit_buffer(image.transpose(Image.FLIP_TOP_BOTTOM).tobytes(), colorfmt='rgba', bufferfmt='ubyte')
+    return texture
@@ -0,0 +1,504 @@
+__all__ = ('VectorTileSource', 'decode_mvt')
+
+import gzip
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from os.path import exists
+from typing import Any
+
+from kivy.graphics import (
+    ClearBuffers,
+    ClearColor,
+    Color,
+    Fbo,
+    Mesh,
+    PopMatrix,
+    PushMatrix,
+    Scale,
+    Translate,
+)
+from kivy.graphics.tesselator import (
+    TYPE_POLYGONS,
+    WINDING_ODD,
+    Tesselator,
+)
+from kivy.logger import Logger
+from kivy.utils import get_color_from_hex
+
+from .map import TileLayer
+from .mapdownloader import MapDownloader
+from .mapsource import (
+    MapSource,
+    TileRef,
+)
+
+# Mesh indices are unsigned shorts
+MAX_MESH_VERTICES = 65535
+
+DEFAULT_STYLE = [
+    {'layer': 'water', 'type': 'fill', 'color': '#aad3df'},
+    {'layer': 'landcover', 'type': 'fill', 'color': '#d8e8c8'},
+    {'layer': 'landuse', 'type': 'fill', 'color': '#e0dfdf'},
+    {'layer': 'park', 'type': 'fill', 'color': '#c8facc'},
+    {'layer': 'building', 'type': 'fill', 'color': '#d9d0c9', 'min_zoom': 13},
+    {'layer': 'waterway', 'type': 'line', 'color': '#aad3df', 'width': 1},
+    {'layer': 'boundary', 'type': 'line', 'color': '#9e9cab', 'width': 1},
+    {'layer': 'transportation', 'type': 'line', 'color': '#ffffff', 'width': 1.5},
+]
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_fields(data: bytes) -> Any:
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == 5:
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise ValueError(f'unsupported protobuf wire type {wire_type}')
+        yield field, wire_type, value
+
+
+def _read_packed(data: bytes) -> list[int]:
+    values = []
+    pos = 0
+    end = len(data)
+    while pos < end:
+        value, pos = _read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def _zigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _decode_value(data: bytes) -> Any:
+    for field, _, value in _iter_fields(data):
+        if field == 1:
+            return value.decode('utf-8')
+        if field == 2:
+            return struct.unpack('<f', value)[0]
+        if field == 3:
+            return struct.unpack('<d', value)[0]
+        if field == 4:
+            return value - (1 << 64) if value >= (1 << 63) else value
+        if field == 5:
+            return value
+        if field == 6:
+            return _zigzag(value)
+        if field == 7:
+            return bool(value)
+    return None
+
+
+def _decode_geometry(commands: list[int]) -> list[list[tuple[int, int]]]:
+    parts = []
+    part = None
+    x = y = 0
+    i = 0
+    while i < len(commands):
+        command = commands[i] & 0x7
+        count = commands[i] >> 3
+        i += 1
+        if command == 1:  # MoveTo
+            for _ in range(count):
+                x += _zigzag(commands[i])
+                y += _zigzag(commands[i + 1])
+                i += 2
+                part = [(x, y)]
+                parts.append(part)
+        elif command == 2:  # LineTo
+            for _ in range(count):
+                x += _zigzag(commands[i])
+                y += _zigzag(commands[i + 1])
+                i += 2
+                part.append((x, y))
+        elif command == 7:  # ClosePath
+            if part:
+                part.append(part[0])
+        else:
+            raise ValueError(f'unknown geometry command {command}')
+    return parts
+
+
+def _decode_layer(data: bytes) -> dict:
+    name = ''
+    extent = 4096
+    keys = []
+    values = []
+    raw_features = []
+    for field, _, value in _iter_fields(data):
+        if field == 1:
+            name = value.decode('utf-8')
+        elif field == 2:
+            raw_features.append(value)
+        elif field == 3:
+            keys.append(value.decode('utf-8'))
+        elif field == 4:
+            values.append(_decode_value(value))
+        elif field == 5:
+            extent = value
+
+    features = []
+    for raw_feature in raw_features:
+        feature = {'id': None, 'type': 0, 'properties': {}, 'geometry': []}
+        for field, _, value in _iter_fields(raw_feature):
+            if field == 1:
+                feature['id'] = value
+            elif field == 2:
+                tags = _read_packed(value)
+                feature['properties'] = {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags) - 1, 2)}
+            elif field == 3:
+                feature['type'] = value
+            elif field == 4:
+                feature['geometry'] = _decode_geometry(_read_packed(value))
+        features.append(feature)
+
+    return {'name': name, 'extent': extent, 'features': features}
+
+
+def decode_mvt(data: bytes) -> dict[str, dict]:
+    '''Decode a Mapbox vector tile (gzipped or not).
+
+    Returns {layer name: {'name', 'extent', 'features'}}, each feature being
+    a dict with 'id', 'type' (1 point, 2 line, 3 polygon), 'properties' and
+    'geometry' (a list of parts, each a list of (x, y) in tile extent units,
+    y going down).
+    '''
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+
+    layers = {}
+    for field, _, value in _iter_fields(data):
+        if field == 3:
+            layer = _decode_layer(value)
+            layers[layer['name']] = layer
+    return layers
+
+
+class _MeshBuilder:
+    def __init__(self) -> None:
+        self.meshes = []
+        self._vertices = []
+        self._indices = []
+
+    def _reserve(self, count: int) -> int:
+        # start a new mesh when the indices would overflow
+        offset = len(self._vertices) // 4
+        if offset + count > MAX_MESH_VERTICES:
+            self.flush()
+            offset = 0
+        return offset
+
+    def flush(self) -> None:
+        if self._indices:
+            self.meshes.append((self._vertices, self._indices))
+        self._vertices = []
+        self._indices = []
+
+    def add_polygon(self, rings: list[list[tuple[float, float]]]) -> None:
+        tesselator = Tesselator()
+        for ring in rings:
+            if len(ring) >= 3:
+                tesselator.add_contour([coordinate for point in ring for coordinate in point])
+        if not tesselator.tesselate(WINDING_ODD, TYPE_POLYGONS, 3):
+            return
+        for vertices, indices in tesselator.meshes:
+            offset = self._reserve(len(vertices) // 4)
+            self._vertices.extend(vertices)
+            self._indices.extend(offset + index for index in indices)
+
+    def add_line(self, points: list[tuple[float, float]], width: float) -> None:
+        half_width = width / 2.0
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            dx = x1 - x0
+            dy = y1 - y0
+            length = (dx * dx + dy * dy) ** 0.5
+            if not length:
+                continue
+            nx = -dy / length * half_width
+            ny = dx / length * half_width
+            offset = self._reserve(4)
+            self._vertices.extend((
+                x0 + nx, y0 + ny, 0, 0,
+                x0 - nx, y0 - ny, 0, 0,
+                x1 + nx, y1 + ny, 0, 0,
+                x1 - nx, y1 - ny, 0, 0,
+            ))
+            self._indices.extend((offset, offset + 1, offset + 2, offset + 2, offset + 1, offset + 3))
+
+
+class VectorTileSource(MapSource):
+    '''Map source of Mapbox vector tiles (MVT / PBF), read from a local
+    `.mbtiles` file or downloaded from `url_template`.
+
+    Tiles are decoded and triangulated in the downloader worker threads and
+    drawn with :class:`~kivy.graphics.Mesh` into the tile texture at
+    `render_scale` times the tile size, so they stay sharp while scaled.
+    Above `max_data_zoom`, tiles are cut from their parent data tile
+    (overzoom): one downloaded tile serves all the zoom levels above it.
+
+    `style` is a list of rules drawn bottom to top:
+        {
+            'layer': 'transportation',  # vector tile layer name
+            'type': 'line',  # 'fill' (polygons) or 'line' (lines and polygon outlines)
+            'color': '#ffffff',  # hex or rgba
+            'width': 1.5,  # line width in tile pixels
+            'filter': {'class': ['primary', 'secondary']},  # property value or values
+            'min_zoom': 0,
+            'max_zoom': 22,
+        }
+    '''
+
+    def __init__(self, url_template: str | None = None, mbtiles: str | None = None, style: list[dict] | None = None,
+                 background_color: str | tuple = '#f2efe9', min_zoom: int = 0, max_zoom: int = 22, max_data_zoom: int = 14,
+                 render_scale: float = 2, cache_size: int = 64, cache_key: str = 'vector', attribution: str = '',
+                 tile_size: int = 256, api_key: str | None = None, cache_dir: str = 'map_cache') -> None:
+        if url_template is None and mbtiles is None:
+            raise ValueError('VectorTileSource needs an url_template or an mbtiles file')
+
+        super().__init__(
+            {
+                'cache_key': cache_key,
+                'min_zoom': min_zoom,
+                'max_zoom': max_zoom,
+                'url_template': url_template,
+                'attribution': attribution,
+            },
+            tile_size=tile_size,
+            api_key=api_key,
+            cache_dir=cache_dir,
+        )
+        self.cache_fmt = '{cache_key}_{zoom}_{tile_x}_{tile_y}.pbf'
+        self.style = style if style is not None else DEFAULT_STYLE
+        self.background_color = get_color_from_hex(background_color) if isinstance(background_color, str) else background_color
+        self.max_data_zoom = max_data_zoom
+        self.render_scale = render_scale
+        self.mbtiles = mbtiles
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+        if mbtiles is not None:
+            self._read_mbtiles_metadata()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # sqlite connections can not be shared between worker threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(f'file:{self.mbtiles}?mode=ro', uri=True)
+        return connection
+
+    def _read_mbtiles_metadata(self) -> None:
+        connection = sqlite3.connect(f'file:{self.mbtiles}?mode=ro', uri=True)
+        try:
+            metadata = dict(connection.execute('SELECT name, value FROM metadata').fetchall())
+        except sqlite3.Error:
+            metadata = {}
+        finally:
+            connection.close()
+
+        if 'maxzoom' in metadata:
+            self.max_data_zoom = int(metadata['maxzoom'])
+        if 'minzoom' in metadata:
+            self.min_zoom = max(self.min_zoom, int(metadata['minzoom']))
+        if 'attribution' in metadata and not self.attribution:
+            self.attribution = metadata['attribution']
+
+    def get_tile_data(self, zoom: int, tile_x: int, tile_y: int, downloader: MapDownloader) -> bytes | None:
+        '''Raw data of a data tile, `tile_y` counted from the bottom like in
+        :class:`GlowMap` and in mbtiles.
+        '''
+        if self.mbtiles is not None:
+            row = self._get_connection().execute(
+                'SELECT tile_data FROM tiles WHERE zoom_level=? AND tile_column=? AND tile_row=?',
+                (zoom, tile_x, tile_y),
+            ).fetchone()
+            return row[0] if row is not None else None
+
+        cache_fn = downloader.fetch_tile(TileRef(self, zoom, tile_x, tile_y, downloader.cache_dir))
+        if cache_fn is None:
+            return None
+        with open(cache_fn, 'rb') as fd:
+            return fd.read()
+
+    def get_meshes(self, zoom: int, tile_x: int, tile_y: int, downloader: MapDownloader) -> list | None:
+        '''Triangulated meshes of a data tile, one list of (vertices, indices)
+        per style rule, cached in memory.
+        '''
+        key = (zoom, tile_x, tile_y)
+        with self._lock:
+            meshes = self._cache.get(key)
+            if meshes is not None:
+                self._cache.move_to_end(key)
+                return meshes
+
+        data = self.get_tile_data(zoom, tile_x, tile_y, downloader)
+        if data is None:
+            return None
+
+        try:
+            meshes = self._build_meshes(decode_mvt(data))
+        except (ValueError, IndexError, OSError) as e:
+            Logger.error(f'VectorTileSource: can not decode tile {key}: {e!r}')
+            return None
+
+        with self._lock:
+            self._cache[key] = meshes
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return meshes
+
+    def _build_meshes(self, layers: dict) -> list:
+        size = self.tile_size * self.render_scale
+        meshes = []
+        for rule in self.style:
+            layer = layers.get(rule['layer'])
+            if layer is None:
+                meshes.append([])
+                continue
+
+            k = size / layer['extent']
+            rule_type = rule.get('type', 'fill')
+            rule_filter = rule.get('filter', None)
+            width = rule.get('width', 1) * self.render_scale
+            builder = _MeshBuilder()
+
+            for feature in layer['features']:
+                if rule_filter is not None and not self._match(rule_filter, feature['properties']):
+                    continue
+                # mvt y goes down, the tile texture y goes up
+                parts = [[(x * k, size - y * k) for x, y in part] for part in feature['geometry']]
+                if rule_type == 'fill' and feature['type'] == 3:
+                    builder.add_polygon(parts)
+                elif rule_type == 'line' and feature['type'] in {2, 3}:
+                    for part in parts:
+                        builder.add_line(part, width)
+
+            builder.flush()
+            meshes.append(builder.meshes)
+        return meshes
+
+    def _match(self, rule_filter: dict, properties: dict) -> bool:
+        for key, expected in rule_filter.items():
+            value = properties.get(key)
+            if isinstance(expected, (list, tuple, set)):
+                if value not in expected:
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    def fill_tile(self, tile: Any, downloader: MapDownloader | None = None, priority: int = 0) -> None:
+        '''Decode and triangulate the tile in the downloader workers.
+        A data tile that is not cached is first queued in the downloader,
+        like the tiles of other sources.
+        '''
+
+        if tile.state == 'done':
+            return
+
+        if downloader is None:
+            downloader = MapDownloader.instance(cache_dir=self.cache_dir)
+
+        if self.mbtiles is None:
+            overzoom = max(0, tile.zoom - self.max_data_zoom)
+            data_tile = _DataTileRef(self, tile, downloader, overzoom)
+            with self._lock:
+                cached = (data_tile.zoom, data_tile.tile_x, data_tile.tile_y) in self._cache
+            if not cached and not exists(data_tile.cache_fn):
+                downloader.download_tile(data_tile, priority=priority)
+                return
+
+        downloader.submit(self._load_tile, tile, downloader)
+
+    def _load_tile(self, tile: Any, downloader: MapDownloader) -> tuple | None:
+        if tile.state == 'done':
+            return None
+
+        overzoom = max(0, tile.zoom - self.max_data_zoom)
+        data_x = tile.tile_x >> overzoom
+        data_y = tile.tile_y >> overzoom
+        meshes = self.get_meshes(tile.zoom - overzoom, data_x, data_y, downloader)
+        if meshes is None:
+            return None
+
+        return self._render_tile, (tile, meshes, tile.tile_x - (data_x << overzoom), tile.tile_y - (data_y << overzoom), 2 ** overzoom)
+
+    def _render_tile(self, tile: Any, meshes: list, sub_x: int, sub_y: int, factor: int) -> None:
+        if tile.state == 'done':
+            return
+
+        size = int(self.tile_size * self.render_scale)
+        fbo = Fbo(size=(size, size))
+        with fbo:
+            ClearColor(*self.background_color)
+            ClearBuffers()
+            PushMatrix()
+            # cut the (sub_x, sub_y) part of the data tile when overzoomed
+            Translate(-sub_x * size, -sub_y * size)
+            Scale(factor, factor, 1)
+            for rule, rule_meshes in zip(self.style, meshes):
+                if not rule_meshes or not rule.get('min_zoom', 0) <= tile.zoom <= rule.get('max_zoom', 99):
+                    continue
+                color = rule.get('color', '#000000')
+                Color(*(get_color_from_hex(color) if isinstance(color, str) else color))
+                for vertices, indices in rule_meshes:
+                    Mesh(vertices=vertices, indices=indices, mode='triangles')
+            PopMatrix()
+        fbo.draw()
+
+        if isinstance(tile, TileLayer):
+            # the layers of the tile are composed from the rendered texture
+            tile.set_source(fbo.texture)
+            return
+
+        tile.fbo = fbo
+        tile.texture = fbo.texture
+        tile.state = 'need-animation'
+
+
+class _DataTileRef(TileRef):
+    '''Data tile downloaded for a drawn tile, which is decoded once the data
+    tile is in the cache.
+    '''
+
+    def __init__(self, map_source: VectorTileSource, tile: Any, downloader: MapDownloader, overzoom: int) -> None:
+        super().__init__(map_source, tile.zoom - overzoom, tile.tile_x >> overzoom, tile.tile_y >> overzoom, downloader.cache_dir)
+        self.tile = tile
+        self.downloader = downloader
+
+    @property
+    def state(self) -> str:
+        return self.tile.state
+
+    def set_source(self, cache_fn: str) -> None:
+        self.downloader.submit(self.map_source._load_tile, self.tile, self.downloader)
@@ -47,6 +47,16 @@ class GlowPaginator(GlowBoxLayout):
     and default to `empty`.
     '''
 
+    total_items = NumericProperty(defaultvalue=None, allownone=True)
+    '''Number of items, when they are not given in :attr:`items`.
+
+    Lets a widget paginate a large or lazily loaded data set without copying
+    it into :attr:`items`: use :meth:`get_from_to` to get the page range.
+
+    :attr:`total_items` is an :class:`~kivy.properties.NumericProperty`
+    and default to `None`.
+    '''
+
     reset_page = BooleanProperty(defaultvalue=True)
     '''Reset page if :attr:`items` value changed.
 
@@ -68,7 +78,22 @@ class GlowPaginator(GlowBoxLayout):
 
     def on_items(self, instance: Self, items: list) -> None:
         '''Fired when the :attr:`items` value changes.'''
-        self._pages = 1 + (len(items) - 1) // self.items_per_page
+        self._update_pages()
+
+    def on_total_items(self, instance: Self, total_items: int | None) -> None:
+        '''Fired when the :attr:`total_items` value changes.'''
+        self._update_pages()
+
+    @property
+    def items_count(self) -> int:
+        '''Get the number of items.'''
+        if self.total_items is not None:
+            return int(self.total_items)
+        return len(self.items)
+
+    def _update_pages(self) -> None:
+        '''Update the pages after the items changed.'''
+        self._pages = 1 + (self.items_count - 1) // self.items_per_page
 
         if self._page >= self._pages or self.reset_page:
             self._page = 0
@@ -111,7 +136,7 @@ class GlowPaginator(GlowBoxLayout):
 
     def get_from_to(self) -> tuple[int, int]:
         '''Returns the current page indexes in the items.'''
-        return self._page * self.items_per_page, min(len(self.items), (self._page + 1) * self.items_per_page)
+        return self._page * self.items_per_page, min(self.items_count, (self._page + 1) * self.items_per_page)
 
     def _next_page(self) -> None:
         '''Set next page.'''
@@ -129,7 +154,8 @@ class GlowPaginator(GlowBoxLayout):
 
     def _update_view(self, *args) -> None:
         '''Update buttons and paginator info'''
-        self.ids.glow_paginator_info.text = f'{self._page * self.items_per_page + 1 if len(self.items) else 0}-{min(len(self.items), (self._page + 1) * self.items_per_page)} : {len(self.items)}'
+        items_count = self.items_count
+        self.ids.glow_paginator_info.text = f'{self._page * self.items_per_page + 1 if items_count else 0}-{min(items_count, (self._page + 1) * self.items_per_page)} : {items_count}'
 
         self.ids.glow_paginator_button_next.disabled = False if self.has_next_page else True
         self.ids.glow_paginator_button_previous.disabled = False if self.has_previous_page else True
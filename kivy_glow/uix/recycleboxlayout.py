@@ -1,6 +1,12 @@
-__all__ = ('GlowRecycleBoxLayout', )
+__all__ = ('GlowRecycleBoxLayout', 'SelectableRecycleBoxLayout')
 
+from kivy.properties import (
+    NumericProperty,
+    ObjectProperty,
+)
 from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview.layout import LayoutSelectionBehavior
+from kivy.uix.widget import Widget
 
 from kivy_glow.uix.behaviors import (
     AdaptiveBehavior,
@@ -10,10 +16,144 @@ from kivy_glow.uix.behaviors import (
 )
 
 
+class FixedViewOpts:
+    '''Layout options of views of the same height, computed on access instead
+    of being stored for every data item.
+    '''
+
+    def __init__(self, layout: RecycleBoxLayout, data: list) -> None:
+        self.layout = layout
+        self.data = data
+        self.length = len(data)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> dict:
+        layout = self.layout
+        padding_left, padding_top, padding_right, _ = layout.padding
+        height = layout.fixed_height
+        size_hint_x = layout.default_size_hint[0]
+        width = max(0, layout.width - padding_left - padding_right) * size_hint_x if size_hint_x is not None else layout.default_size[0]
+
+        viewclass = layout.viewclass
+        if layout.key_viewclass is not None:
+            viewclass = self.data[index].get(layout.key_viewclass) or viewclass
+
+        return {
+            'size': [width, height],
+            'size_hint': [size_hint_x, None],
+            'size_hint_min': list(layout.default_size_hint_min),
+            'size_hint_max': list(layout.default_size_hint_max),
+            'pos': [layout.x + padding_left, layout.y + layout.height - padding_top - (index + 1) * height - index * layout.spacing],
+            'pos_hint': layout.default_pos_hint,
+            'viewclass': viewclass,
+            'width_none': width is None,
+            'height_none': False,
+        }
+
+
 class GlowRecycleBoxLayout(DeclarativeBehavior,
                            AdaptiveBehavior,
                            ThemeBehavior,
                            StyleBehavior,
                            RecycleBoxLayout,
                            ):
-    pass
+
+    fixed_height = NumericProperty(defaultvalue=None, allownone=True)
+    '''Height of every view, vertical orientation only.
+
+    When set, positions are computed from the index instead of measuring the
+    views and storing layout options for every data item, so the layout cost
+    does not depend on the size of the data, and views are not resized.
+
+    :attr:`fixed_height` is an :class:`~kivy.properties.NumericProperty`
+    and defaults to `None`.
+    '''
+
+    _fixed_geometry = None
+
+    def on_fixed_height(self, instance: RecycleBoxLayout, fixed_height: float | None) -> None:
+        if self.recycleview is not None:
+            self.recycleview.refresh_from_data()
+
+    def compute_sizes_from_data(self, data: list, flags: list[dict]) -> None:
+        if self.fixed_height is None:
+            return super().compute_sizes_from_data(data, flags)
+
+        modified = [flag['modified'] for flag in flags if list(flag) == ['modified']]
+        if flags and len(modified) == len(flags) and isinstance(self.view_opts, FixedViewOpts) and len(self.view_opts) == len(data):
+            # only the views of the modified items need new data
+            self._refresh_modified_views(data, modified)
+        else:
+            self.clear_layout()
+            self._fixed_geometry = None
+
+        self.view_opts = FixedViewOpts(self, data)
+
+    def _refresh_modified_views(self, data: list, modified: list[slice]) -> None:
+        adapter = self.recycleview.view_adapter
+        for index, view in list(adapter.views.items()):
+            if any(index in range(*indices.indices(len(data))) for indices in modified):
+                adapter.refresh_view_attrs(index, data[index], view)
+
+    def compute_layout(self, data: list, flags: list[dict]) -> None:
+        if self.fixed_height is None:
+            return super().compute_layout(data, flags)
+
+        self._size_needs_update = False
+        n = len(data)
+        padding_left, padding_top, padding_right, padding_bottom = self.padding
+        self.minimum_size = (
+            padding_left + padding_right,
+            padding_top + padding_bottom + n * self.fixed_height + max(0, n - 1) * self.spacing,
+        )
+
+        # the displayed views only move when the geometry changes
+        geometry = (n, self.x, self.y, self.width, self.height, tuple(self.padding), self.spacing, self.fixed_height)
+        if geometry != self._fixed_geometry:
+            self._fixed_geometry = geometry
+            viewport = self.recycleview.get_viewport()
+            for view, index in list(self.view_indices.items()):
+                self.refresh_view_layout(index, {}, view, viewport)
+
+    def get_view_index_at(self, pos: tuple[float, float]) -> int:
+        if self.fixed_height is None:
+            return super().get_view_index_at(pos)
+
+        n = len(self.view_opts)
+        top = self.y + self.height - self.padding[1]
+        index = int((top - pos[1]) // (self.fixed_height + self.spacing))
+        return min(max(index, 0), max(n - 1, 0))
+
+    def compute_visible_views(self, data: list, viewport: tuple[float, float, float, float]) -> list[int]:
+        if self.fixed_height is None:
+            return super().compute_visible_views(data, viewport)
+        if not data:
+            return []
+
+        x, y, w, h = viewport
+        return list(range(self.get_view_index_at((x, y + h)), self.get_view_index_at((x, y)) + 1))
+
+
+class SelectableRecycleBoxLayout(LayoutSelectionBehavior, GlowRecycleBoxLayout):
+
+    is_node_selected = ObjectProperty(defaultvalue=None, allownone=True)
+    '''Function returning if the data at an index is selected, used instead of
+    `selected_nodes` so that the selection can be stored by the widget.
+    '''
+
+    def refresh_view_layout(self, index: int, layout: dict, view: Widget, viewport: tuple) -> None:
+        if self.is_node_selected is None:
+            return super().refresh_view_layout(index, layout, view, viewport)
+
+        super(LayoutSelectionBehavior, self).refresh_view_layout(index, layout, view, viewport)
+        self.apply_selection(index, view, self.is_node_selected(index))
+
+    def refresh_selection(self) -> None:
+        '''Apply the selection to the displayed views.'''
+        if self.recycleview is None or self.is_node_selected is None:
+            return
+
+        for index, view in list(self.recycleview.view_adapter.views.items()):
+            self.apply_selection(index, view, self.is_node_selected(index))
@@ -6,6 +6,9 @@ from .cells import (  # noqa F401
     GlowIconCell,
 )
 from .table import (  # noqa F401
+    GlowVirtualTableRow,
+    GlowTableGroupRow,
+    GlowFastTableRow,
     GlowTableRow,
     GlowTable,
 )
@@ -0,0 +1,311 @@
+__all__ = (
+    'CountAggregate',
+    'MaxAggregate',
+    'MeanAggregate',
+    'MinAggregate',
+    'ReducerAggregate',
+    'SumAggregate',
+    'TableAggregate',
+    'TableAggregates',
+)
+
+import copy
+from collections import Counter
+from functools import partial
+from operator import is_not
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Self,
+)
+
+from kivy_glow.uix.table.storage import (
+    TableStore,
+    typed_sort_key,
+)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+is_not_none = partial(is_not, None)
+
+
+class TableAggregate:
+    '''Aggregate of the values of a column, the empty cells excluded.
+
+    :meth:`load` computes it over all the values, then :meth:`add` and
+    :meth:`remove` maintain it when rows are inserted, updated or deleted.
+    Aggregates which are not :attr:`incremental` are loaded again with all
+    the values instead, once read after a change.
+    '''
+
+    incremental = True
+
+    @property
+    def value(self) -> Any:
+        raise NotImplementedError
+
+    def load(self, values: list) -> None:
+        '''Compute the aggregate of the values.'''
+        raise NotImplementedError
+
+    def add(self, value: Any) -> None:
+        raise NotImplementedError
+
+    def remove(self, value: Any) -> None:
+        raise NotImplementedError
+
+    def clone(self) -> Self:
+        '''New aggregate of the same kind, sharing no state with this one,
+        e.g. for the rows of a group. A deep copy by default.
+        '''
+        return copy.deepcopy(self)
+
+
+class SumAggregate(TableAggregate):
+    '''Sum of the numbers.'''
+
+    def __init__(self) -> None:
+        self._sum = 0
+
+    @property
+    def value(self) -> Any:
+        return self._sum
+
+    def load(self, values: list) -> None:
+        self._sum = sum(filter(is_number, values))
+
+    def add(self, value: Any) -> None:
+        if is_number(value):
+            self._sum += value
+
+    def remove(self, value: Any) -> None:
+        if is_number(value):
+            self._sum -= value
+
+
+class CountAggregate(TableAggregate):
+    '''Number of values.'''
+
+    def __init__(self) -> None:
+        self._count = 0
+
+    @property
+    def value(self) -> Any:
+        return self._count
+
+    def load(self, values: list) -> None:
+        self._count = len(values)
+
+    def add(self, value: Any) -> None:
+        self._count += 1
+
+    def remove(self, value: Any) -> None:
+        self._count -= 1
+
+
+class MeanAggregate(TableAggregate):
+    '''Mean of the numbers, None without numbers.'''
+
+    def __init__(self) -> None:
+        self._sum = 0
+        self._count = 0
+
+    @property
+    def value(self) -> Any:
+        return self._sum / self._count if self._count else None
+
+    def load(self, values: list) -> None:
+        numbers = list(filter(is_number, values))
+        self._sum = sum(numbers)
+        self._count = len(numbers)
+
+    def add(self, value: Any) -> None:
+        if is_number(value):
+            self._sum += value
+            self._count += 1
+
+    def remove(self, value: Any) -> None:
+        if is_number(value):
+            self._sum -= value
+            self._count -= 1
+
+
+class MinAggregate(TableAggregate):
+    '''Smallest value, None without values.
+
+    The values are counted, removing the smallest value only looks for the
+    next one among the distinct values, on access. Values of different types
+    are compared with :func:`~kivy_glow.uix.table.storage.typed_sort_key`.
+    '''
+
+    reverse = False
+
+    def __init__(self) -> None:
+        self._counts = Counter()
+        self._extreme = None
+        self._dirty = False
+
+    @property
+    def value(self) -> Any:
+        if self._dirty:
+            self._extreme = self._find_extreme()
+            self._dirty = False
+        return self._extreme
+
+    def load(self, values: list) -> None:
+        self._counts = Counter(values)
+        self._extreme = self._find_extreme()
+        self._dirty = False
+
+    def add(self, value: Any) -> None:
+        self._counts[value] += 1
+        if self._dirty:
+            return
+        if self._extreme is None:
+            self._extreme = value
+            return
+        key, extreme_key = typed_sort_key(value), typed_sort_key(self._extreme)
+        if key > extreme_key if self.reverse else key < extreme_key:
+            self._extreme = value
+
+    def remove(self, value: Any) -> None:
+        counts = self._counts
+        counts[value] -= 1
+        if counts[value] <= 0:
+            del counts[value]
+            if value == self._extreme:
+                self._dirty = True
+
+    def clone(self) -> Self:
+        # the counts are replaced when loaded
+        return type(self)()
+
+    def _find_extreme(self) -> Any:
+        if not self._counts:
+            return None
+        return max(self._counts, key=typed_sort_key) if self.reverse else min(self._counts, key=typed_sort_key)
+
+
+class MaxAggregate(MinAggregate):
+    '''Largest value, None without values.'''
+
+    reverse = True
+
+
+class ReducerAggregate(TableAggregate):
+    '''`reducer(values)` of the values, computed on access. It is loaded
+    again with the values of the column after a change.
+    '''
+
+    incremental = False
+
+    def __init__(self, reducer: Callable[[list], Any]) -> None:
+        self.reducer = reducer
+        self._values = []
+        self._result = None
+        self._dirty = True
+
+    @property
+    def value(self) -> Any:
+        if self._dirty:
+            self._result = self.reducer(self._values)
+            self._dirty = False
+        return self._result
+
+    def load(self, values: list) -> None:
+        self._values = values
+        self._dirty = True
+
+    def clone(self) -> Self:
+        return type(self)(self.reducer)
+
+
+AGGREGATES = {
+    'sum': SumAggregate,
+    'count': CountAggregate,
+    'mean': MeanAggregate,
+    'min': MinAggregate,
+    'max': MaxAggregate,
+}
+
+
+def create_aggregate(aggregate: str | Callable[[list], Any] | TableAggregate) -> TableAggregate:
+    '''Aggregate of a column from its `aggregate` in
+    :attr:`GlowTable.columns_info`: a name, a reducer or an aggregate.
+    '''
+    if isinstance(aggregate, TableAggregate):
+        return aggregate
+    if isinstance(aggregate, str):
+        if aggregate not in AGGREGATES:
+            raise ValueError(f'unknown aggregate {aggregate!r}, expected one of {", ".join(AGGREGATES)} or a function')
+        return AGGREGATES[aggregate]()
+    return ReducerAggregate(aggregate)
+
+
+def compute_aggregate(aggregate: str | Callable[[list], Any] | TableAggregate, values: list) -> Any:
+    '''Value of an aggregate over values, with a clone of the aggregate,
+    so the aggregate given in :attr:`GlowTable.columns_info` keeps its state.
+    '''
+    aggregate = create_aggregate(aggregate).clone()
+    aggregate.load(values)
+    return aggregate.value
+
+
+class TableAggregates:
+    '''Aggregates of the value property of columns of a
+    :class:`~kivy_glow.uix.table.storage.TableStore`, by column index.
+
+    :meth:`load` computes them over the column arrays, :meth:`add_rows` and
+    :meth:`remove_rows` update them with the values of the changed rows only:
+    remove the rows before they are deleted or updated, add them once they
+    are inserted or updated.
+    '''
+
+    def __init__(self, store: TableStore, aggregates: dict[int, TableAggregate]) -> None:
+        self.store = store
+        self.aggregates = aggregates
+        # columns of the aggregates which are not incremental, changed since loaded
+        self._stale = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.aggregates)
+
+    def load(self) -> None:
+        for column_idx in self.aggregates:
+            self._load_column(column_idx)
+        self._stale.clear()
+
+    def _load_column(self, column_idx: int) -> None:
+        self.aggregates[column_idx].load(list(filter(is_not_none, self.store.get_column(column_idx))))
+
+    def add_rows(self, row_indices: Iterable[int]) -> None:
+        self._update_rows(row_indices, added=True)
+
+    def remove_rows(self, row_indices: Iterable[int]) -> None:
+        self._update_rows(row_indices, added=False)
+
+    def get_values(self) -> dict[int, Any]:
+        for column_idx in self._stale:
+            self._load_column(column_idx)
+        self._stale.clear()
+        return {column_idx: aggregate.value for column_idx, aggregate in self.aggregates.items()}
+
+    def _update_rows(self, row_indices: Iterable[int], added: bool) -> None:
+        if not self.aggregates:
+            return
+
+        row_indices = list(row_indices)
+        get_value = self.store.get_value
+        for column_idx, aggregate in self.aggregates.items():
+            if not aggregate.incremental:
+                self._stale.add(column_idx)
+                continue
+            update = aggregate.add if added else aggregate.remove
+            for row_idx in row_indices:
+                value = get_value(row_idx, column_idx)
+                if value is not None:
+                    update(value)
@@ -0,0 +1,100 @@
+__all__ = ('TableDataModel', 'TableRowsView')
+
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+)
+
+from kivy.event import EventDispatcher
+from kivy.uix.recycleview.datamodel import RecycleDataModelBehavior
+
+
+class TableRowsView:
+    '''Read only sequence of the RecycleView data of the displayed rows.
+
+    The data of a row is built on demand by `get_row_data(display_idx)`, so
+    nothing is stored per row. The last built rows are cached, call
+    :meth:`invalidate` when the data changes.
+
+    Iterating the view only yields what the RecycleView layout reads, the
+    sizes of the rows: `get_layout_data(display_idx)` if given, otherwise
+    empty dicts (default sizes), so a layout pass does not build every row.
+    '''
+
+    cache_size = 256
+
+    def __init__(self, get_row_data: Callable[[int], dict], length: int = 0,
+                 get_layout_data: Callable[[int], dict] | None = None) -> None:
+        self.get_row_data = get_row_data
+        self.get_layout_data = get_layout_data
+        self.start = 0
+        self.stop = length
+        self._cache = {}
+
+    def set_range(self, start: int, stop: int) -> None:
+        '''Display the rows from `start` to `stop` (the current page).'''
+        self.start = start
+        self.stop = max(start, stop)
+        self._cache.clear()
+
+    def invalidate(self, index: int | None = None) -> None:
+        '''Forget the cached data of a row, or of all the rows.'''
+        if index is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(index, None)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        length = self.stop - self.start
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('table row index out of range')
+
+        cache = self._cache
+        row_data = cache.get(index)
+        if row_data is None:
+            if len(cache) >= self.cache_size:
+                cache.clear()
+            row_data = cache[index] = self.get_row_data(self.start + index)
+        return row_data
+
+    def __iter__(self) -> Iterator[dict]:
+        get_layout_data = self.get_layout_data
+        if get_layout_data is None:
+            empty = {}
+            for _ in range(len(self)):
+                yield empty
+        else:
+            for index in range(self.start, self.stop):
+                yield get_layout_data(index)
+
+
+class TableDataModel(RecycleDataModelBehavior, EventDispatcher):
+    '''RecycleView data model whose :attr:`data` is any sequence of dicts,
+    e.g. a :class:`TableRowsView`. Unlike
+    :class:`~kivy.uix.recycleview.datamodel.RecycleDataModel` the data is not
+    copied into a ListProperty: call :meth:`refresh` after changing it.
+    '''
+
+    def __init__(self, data: Any = None, **kwargs) -> None:
+        self.data = data if data is not None else []
+        super().__init__(**kwargs)
+
+    def __getitem__(self, index: int) -> dict:
+        return self.data[index]
+
+    def refresh(self, **kwargs) -> None:
+        '''Notify the RecycleView of a change, with the `modified`, `appended`,
+        `inserted` or `removed` keyword of
+        :class:`~kivy.uix.recycleview.datamodel.RecycleDataModel`, or none
+        for a full refresh.
+        '''
+        self.dispatch('on_data_changed', **kwargs)
@@ -0,0 +1,247 @@
+__all__ = ('CSVExporter', 'ParquetExporter', 'TableExportJob', 'TableExporter', 'XLSXExporter')
+
+import csv
+import os
+import queue
+import threading
+from typing import (
+    Any,
+    Callable,
+    Sequence,
+)
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+
+class TableExporter:
+    '''Destination of rows written by chunks, see :meth:`GlowTable.export_data`.
+
+    :meth:`open`, :meth:`write` and :meth:`close` are called in a worker
+    thread, so the file is never written by the main thread.
+    '''
+
+    def __init__(self, path: str, chunk_size: int = 5000) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+
+    def open(self, names: list[str]) -> None:
+        '''Create the file, with the names of the columns.'''
+        raise NotImplementedError
+
+    def write(self, rows: list[Sequence]) -> None:
+        '''Write a chunk of at most :attr:`chunk_size` rows.'''
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        '''Close and remove the incomplete file, after a cancel or an error.'''
+        try:
+            self.close()
+        finally:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class CSVExporter(TableExporter):
+    '''Rows written to a CSV file, after a row of the names of the columns.
+    None values are written as empty values.
+
+    `writer_options` are given to :func:`csv.writer`, e.g. `delimiter`.
+    '''
+
+    def __init__(self, path: str, encoding: str = 'utf-8', chunk_size: int = 5000, **writer_options) -> None:
+        super().__init__(path, chunk_size)
+        self.encoding = encoding
+        self.writer_options = writer_options
+
+        self._file = None
+        self._writer = None
+
+    def open(self, names: list[str]) -> None:
+        self._file = open(self.path, 'w', encoding=self.encoding, newline='')
+        self._writer = csv.writer(self._file, **self.writer_options)
+        self._writer.writerow(names)
+
+    def write(self, rows: list[Sequence]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class XLSXExporter(TableExporter):
+    '''Rows written to a sheet of an Excel workbook, in write only mode so the
+    cells are not kept in memory. Requires `openpyxl`.
+    '''
+
+    def __init__(self, path: str, sheet_name: str = 'Sheet', chunk_size: int = 5000) -> None:
+        super().__init__(path, chunk_size)
+        self.sheet_name = sheet_name
+
+        self._workbook = None
+        self._sheet = None
+
+    def open(self, names: list[str]) -> None:
+        try:
+            from openpyxl import Workbook  # noqa: PLC0415
+        except ImportError as e:
+            raise ImportError('XLSXExporter requires openpyxl, pip install openpyxl') from e
+
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(self.sheet_name)
+        self._sheet.append(names)
+
+    def write(self, rows: list[Sequence]) -> None:
+        append = self._sheet.append
+        for row in rows:
+            append(row)
+
+    def close(self) -> None:
+        if self._workbook is not None:
+            workbook, self._workbook = self._workbook, None
+            # a write only workbook is written to the file once
+            workbook.save(self.path)
+
+
+class ParquetExporter(TableExporter):
+    '''Rows written to a Parquet file, a row group per chunk. The types of
+    the columns are inferred from the first chunk. Requires `pyarrow`.
+    '''
+
+    def __init__(self, path: str, compression: str = 'snappy', chunk_size: int = 50000) -> None:
+        super().__init__(path, chunk_size)
+        self.compression = compression
+
+        self._names = None
+        self._writer = None
+
+    def open(self, names: list[str]) -> None:
+        try:
+            import pyarrow  # noqa: F401, PLC0415
+            import pyarrow.parquet  # noqa: F401, PLC0415
+        except ImportError as e:
+            raise ImportError('ParquetExporter requires pyarrow, pip install pyarrow') from e
+
+        # the file is created with the schema of the first chunk
+        self._names = list(names)
+
+    def write(self, rows: list[Sequence]) -> None:
+        import pyarrow  # noqa: PLC0415
+        import pyarrow.parquet as parquet  # noqa: PLC0415
+
+        # arrow tables are built by column
+        columns = {name: list(values) for name, values in zip(self._names, zip(*rows))}
+        if self._writer is None:
+            table = pyarrow.table(columns)
+            self._writer = parquet.ParquetWriter(self.path, table.schema, compression=self.compression)
+        else:
+            table = pyarrow.table(columns, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        elif self._names is not None:
+            import pyarrow  # noqa: PLC0415
+            import pyarrow.parquet as parquet  # noqa: PLC0415
+
+            # no rows, the columns have no type
+            parquet.write_table(pyarrow.table({name: [] for name in self._names}), self.path)
+        self._names = None
+
+
+class TableExportJob:
+    '''Writes rows to a :class:`TableExporter` in a worker thread.
+
+    `read_rows(start, stop)` is called on the main thread and returns the
+    rows from `start` to `stop`, so the table is only read by the main
+    thread, one chunk per frame, while the previous chunk is written.
+    `on_progress(written_rows, progress)` and `on_finished(error)` are called
+    on the main thread, not after :meth:`cancel`.
+    '''
+
+    def __init__(self, exporter: TableExporter, names: list[str], count: int,
+                 read_rows: Callable[[int, int], list[Sequence]],
+                 on_progress: Callable[[int, float], None],
+                 on_finished: Callable[[Exception | None], None]) -> None:
+        self.exporter = exporter
+        self.names = names
+        self.count = count
+        self.read_rows = read_rows
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+
+        self._cancelled = threading.Event()
+        self._chunks = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        '''Stop writing and remove the incomplete file.'''
+        self._cancelled.set()
+        # unblock the worker waiting for the main thread
+        self._chunks.put(None)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _run(self) -> None:
+        exporter = self.exporter
+        chunk_size = max(int(exporter.chunk_size), 1)
+        error = None
+        try:
+            exporter.open(self.names)
+            if self.count:
+                self._request(0, min(chunk_size, self.count))
+
+            for start in range(0, self.count, chunk_size):
+                rows = self._chunks.get()
+                if self._cancelled.is_set():
+                    break
+                if isinstance(rows, Exception):
+                    raise rows
+
+                # the next chunk is read while this one is written
+                stop = min(start + chunk_size, self.count)
+                if stop < self.count:
+                    self._request(stop, min(stop + chunk_size, self.count))
+                exporter.write(rows)
+                self._call(self.on_progress, stop, stop / self.count)
+        except Exception as e:
+            Logger.error(f'GlowTable: can not export to {type(exporter).__name__}: {e!r}')
+            error = e
+
+        try:
+            if error is not None or self._cancelled.is_set():
+                exporter.abort()
+            else:
+                exporter.close()
+        except Exception as e:
+            Logger.error(f'GlowTable: can not close {type(exporter).__name__}: {e!r}')
+            error = error or e
+        self._call(self.on_finished, error)
+
+    def _request(self, start: int, stop: int) -> None:
+        Clock.schedule_once(lambda _: self._read(start, stop), -1)
+
+    def _read(self, start: int, stop: int) -> None:
+        if self._cancelled.is_set():
+            return
+
+        try:
+            rows = self.read_rows(start, stop)
+        except Exception as e:
+            rows = e
+        self._chunks.put(rows)
+
+    def _call(self, callback: Callable, *args: Any) -> None:
+        Clock.schedule_once(lambda _: callback(*args) if not self._cancelled.is_set() else None, -1)
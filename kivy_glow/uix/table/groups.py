@@ -0,0 +1,114 @@
+__all__ = ('TableGroups', 'index_groups')
+
+import bisect
+from itertools import accumulate
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Sequence,
+)
+
+
+def index_groups(values: Sequence, key: Callable[[Any], Hashable] | None = None) -> tuple[list, list[int]]:
+    '''Keys of the groups of the values of a column, by first appearance, and
+    the group of each value, in a single pass over the column.
+    '''
+    groups = {}
+    setdefault = groups.setdefault
+    if key is None:
+        group_of = [setdefault(value, len(groups)) for value in values]
+    else:
+        group_of = [setdefault(key(value), len(groups)) for value in values]
+    return list(groups), group_of
+
+
+class TableGroups:
+    '''Displayed rows grouped by key, and the entries of the RecycleView: the
+    header of each group followed by its rows unless it is collapsed.
+
+    The rows of a group are contiguous in the display order, so a group is
+    only its first displayed row and its size. Collapsing or expanding a
+    group updates the offsets of the groups, not the rows.
+
+    `collapsed` is the set of the keys of the collapsed groups, kept when
+    the groups are computed again.
+    '''
+
+    def __init__(self, keys: list, sizes: list[int], collapsed: set) -> None:
+        self.keys = keys
+        self.sizes = sizes
+        self.collapsed = collapsed
+        # first displayed row of each group
+        self.starts = list(accumulate(sizes, initial=0))[:-1]
+        # values of the aggregates of the groups, computed when displayed
+        self.aggregates = {}
+
+        self._indices = {key: group_idx for group_idx, key in enumerate(keys)}
+        self._entry_starts = []
+        self._length = 0
+        self._update_entries()
+
+    def __len__(self) -> int:
+        '''Number of entries, headers and rows of the expanded groups.'''
+        return self._length
+
+    def _update_entries(self) -> None:
+        collapsed = self.collapsed
+        entry_starts = list(accumulate(
+            (1 if key in collapsed else 1 + size for key, size in zip(self.keys, self.sizes)),
+            initial=0,
+        ))
+        self._length = entry_starts.pop()
+        self._entry_starts = entry_starts
+
+    def index(self, key: Hashable) -> int | None:
+        return self._indices.get(key)
+
+    def is_collapsed(self, group_idx: int) -> bool:
+        return self.keys[group_idx] in self.collapsed
+
+    def entry_at(self, entry_idx: int) -> tuple[int, int | None]:
+        '''Group of an entry and its displayed row, None for the header.'''
+        group_idx = bisect.bisect_right(self._entry_starts, entry_idx) - 1
+        offset = entry_idx - self._entry_starts[group_idx]
+        return group_idx, (self.starts[group_idx] + offset - 1 if offset else None)
+
+    def group_at(self, row_idx: int) -> int:
+        '''Group of a displayed row.'''
+        return bisect.bisect_right(self.starts, row_idx) - 1
+
+    def header_index(self, group_idx: int) -> int:
+        '''Entry of the header of a group.'''
+        return self._entry_starts[group_idx]
+
+    def entry_index(self, row_idx: int) -> int | None:
+        '''Entry of a displayed row, None if its group is collapsed.'''
+        group_idx = self.group_at(row_idx)
+        if self.is_collapsed(group_idx):
+            return None
+        return self._entry_starts[group_idx] + 1 + row_idx - self.starts[group_idx]
+
+    def set_collapsed(self, group_idx: int, collapsed: bool) -> slice | None:
+        '''Collapse or expand a group, return the entries of its rows, hidden
+        or shown, None if the group did not change.
+        '''
+        key = self.keys[group_idx]
+        if (key in self.collapsed) == collapsed:
+            return None
+
+        if collapsed:
+            self.collapsed.add(key)
+        else:
+            self.collapsed.discard(key)
+        self._update_entries()
+
+        start = self._entry_starts[group_idx] + 1
+        return slice(start, start + self.sizes[group_idx])
+
+    def set_all_collapsed(self, collapsed: bool) -> None:
+        if collapsed:
+            self.collapsed.update(self.keys)
+        else:
+            self.collapsed.clear()
+        self._update_entries()
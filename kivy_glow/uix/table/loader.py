@@ -0,0 +1,379 @@
+__all__ = ('ArrowLoader', 'CSVLoader', 'SQLiteLoader', 'TableLoadJob', 'TableLoader', 'infer_columns_info')
+
+import csv
+import io
+import os
+import sqlite3
+import threading
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Sequence,
+)
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+from kivy_glow.uix.table.provider import (
+    SQLiteDataProvider,
+    TableDataProvider,
+)
+
+
+def mixed_sort_key(value: Any) -> tuple:
+    '''Sort key of a column of numbers and other values, numbers first.'''
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value))
+
+
+def infer_columns_info(names: Sequence[str], rows: Sequence[Sequence]) -> list[dict]:
+    ''':attr:`GlowTable.columns_info` of sortable label columns from the
+    names of the columns and a sample of rows. Numeric columns are not
+    searchable, columns with numbers are sorted by :func:`mixed_sort_key`.
+    '''
+    columns_info = []
+    for column_idx, name in enumerate(names):
+        values = [row[column_idx] for row in rows if column_idx < len(row) and row[column_idx] is not None]
+        numbers = [isinstance(value, (int, float)) and not isinstance(value, bool) for value in values]
+        columns_info.append({
+            'name': str(name),
+            'viewclass': 'GlowLabelCell',
+            'properties': ['text'],
+            'sortable': True,
+            'sort_key': mixed_sort_key if any(numbers) else None,
+            'searchable': not numbers or not all(numbers),
+        })
+    return columns_info
+
+
+class TableLoader:
+    '''Source of rows read by chunks, see :meth:`GlowTable.load_data`.
+
+    :meth:`open`, :meth:`read` and :meth:`close` are called in a worker
+    thread, so the file or the database is never read by the main thread.
+    '''
+
+    def __init__(self, chunk_size: int = 5000) -> None:
+        self.chunk_size = chunk_size
+
+    def open(self) -> list[str]:
+        '''Open the source and return the names of its columns.'''
+        raise NotImplementedError
+
+    def read(self) -> Iterator[list[Sequence]]:
+        '''Chunks of at most :attr:`chunk_size` rows.'''
+        raise NotImplementedError
+
+    def progress(self) -> float | None:
+        '''Read part of the source, from 0 to 1, None if unknown.'''
+        return None
+
+    def close(self) -> None:
+        pass
+
+    def get_provider(self) -> TableDataProvider:
+        '''Lazy data provider of the same rows, if the source supports it.'''
+        raise NotImplementedError(f'{type(self).__name__} can not be used as a data provider')
+
+
+class CSVLoader(TableLoader):
+    '''Rows of a CSV file. The first row gives the names of the columns,
+    unless `names` are given. Numbers are converted when the values of a
+    column in the first chunk are all numbers, empty values are None.
+
+    `reader_options` are given to :func:`csv.reader`, e.g. `delimiter`.
+    '''
+
+    def __init__(self, path: str, names: Sequence[str] | None = None, encoding: str = 'utf-8',
+                 chunk_size: int = 5000, **reader_options) -> None:
+        super().__init__(chunk_size)
+        self.path = path
+        self.names = list(names) if names is not None else None
+        self.encoding = encoding
+        self.reader_options = reader_options
+
+        self._file = None
+        self._reader = None
+        self._size = 0
+        self._converters = None
+
+    def open(self) -> list[str]:
+        self._size = os.path.getsize(self.path)
+        self._file = open(self.path, 'rb')
+        self._reader = csv.reader(io.TextIOWrapper(self._file, encoding=self.encoding, newline=''), **self.reader_options)
+        if self.names is not None:
+            return self.names
+        return next(self._reader, [])
+
+    def read(self) -> Iterator[list[Sequence]]:
+        chunk = []
+        for row in self._reader:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield self._convert(chunk)
+                chunk = []
+        if chunk:
+            yield self._convert(chunk)
+
+    def progress(self) -> float | None:
+        if not self._size or self._file is None or self._file.closed:
+            return None
+        return min(self._file.tell() / self._size, 1.0)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def _convert(self, rows: list[list[str]]) -> list[list]:
+        if self._converters is None:
+            # the types of the columns are inferred from the first chunk
+            n_columns = max(len(row) for row in rows)
+            self._converters = [self._infer_converter([row[idx] for row in rows if idx < len(row)]) for idx in range(n_columns)]
+
+        converters = self._converters
+        return [
+            [converters[idx](value) if idx < len(converters) else value for idx, value in enumerate(row)]
+            for row in rows
+        ]
+
+    @staticmethod
+    def _infer_converter(values: list[str]) -> Callable[[str], Any]:
+        values = [value for value in values if value != '']
+        for number_type in (int, float):
+            try:
+                for value in values:
+                    number_type(value)
+            except ValueError:
+                continue
+            if values:
+                return partial(CSVLoader._to_number, number_type)
+        return CSVLoader._to_str
+
+    @staticmethod
+    def _to_number(number_type: type, value: str) -> Any:
+        if value == '':
+            return None
+        try:
+            return number_type(value)
+        except ValueError:
+            # kept as text, see mixed_sort_key
+            return value
+
+    @staticmethod
+    def _to_str(value: str) -> str | None:
+        return value if value != '' else None
+
+
+class SQLiteLoader(TableLoader):
+    '''Rows of a SQLite table or view, read only.
+
+    `columns` are the names of the loaded columns, all the columns by
+    default. :meth:`get_provider` gives a :class:`SQLiteDataProvider` of the
+    same rows, which are then fetched while they are displayed instead of
+    being loaded.
+    '''
+
+    def __init__(self, database: str, table: str, columns: Sequence[str] | None = None, where: str | None = None,
+                 parameters: Sequence = (), uri: bool = False, chunk_size: int = 5000) -> None:
+        super().__init__(chunk_size)
+        self.database = database
+        self.table = table
+        self.columns = list(columns) if columns is not None else None
+        self.where = where
+        self.parameters = tuple(parameters)
+        self.uri = uri
+
+        self._connection = None
+        self._cursor = None
+        self._count = None
+        self._read = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.uri:
+            return sqlite3.connect(self.database, uri=True)
+        return sqlite3.connect(f'file:{self.database}?mode=ro', uri=True)
+
+    def _quote(self, identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def _get_columns(self, connection: sqlite3.Connection) -> list[str]:
+        if self.columns is None:
+            self.columns = [row[1] for row in connection.execute(f'PRAGMA table_info({self._quote(self.table)})')]
+        return self.columns
+
+    def open(self) -> list[str]:
+        self._connection = self._connect()
+        columns = self._get_columns(self._connection)
+        where = f' WHERE {self.where}' if self.where else ''
+        self._count = self._connection.execute(
+            f'SELECT COUNT(*) FROM {self._quote(self.table)}{where}', self.parameters,
+        ).fetchone()[0]
+        self._cursor = self._connection.execute(
+            f'SELECT {", ".join(map(self._quote, columns))} FROM {self._quote(self.table)}{where}', self.parameters,
+        )
+        self._read = 0
+        return columns
+
+    def read(self) -> Iterator[list[Sequence]]:
+        while True:
+            rows = self._cursor.fetchmany(self.chunk_size)
+            if not rows:
+                return
+            self._read += len(rows)
+            yield rows
+
+    def progress(self) -> float | None:
+        if not self._count:
+            return None
+        return self._read / self._count
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get_provider(self) -> SQLiteDataProvider:
+        if self.columns is None:
+            connection = self._connect()
+            try:
+                self._get_columns(connection)
+            finally:
+                connection.close()
+        return SQLiteDataProvider(self.database, self.table, self.columns, self.where, self.parameters, self.uri)
+
+
+class ArrowLoader(TableLoader):
+    '''Rows of an Arrow IPC (Feather v2) or Parquet file, read by record
+    batches. Requires `pyarrow`.
+
+    `columns` are the names of the loaded columns, all the columns by default.
+    '''
+
+    def __init__(self, path: str, columns: Sequence[str] | None = None, chunk_size: int = 5000) -> None:
+        super().__init__(chunk_size)
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+
+        self._batches = None
+        self._file = None
+        self._count = None
+        self._read = 0
+        self._batch_count = None
+        self._batches_read = 0
+
+    def open(self) -> list[str]:
+        try:
+            import pyarrow.ipc as ipc  # noqa: PLC0415
+            import pyarrow.parquet as parquet  # noqa: PLC0415
+        except ImportError as e:
+            raise ImportError('ArrowLoader requires pyarrow, pip install pyarrow') from e
+
+        if self.path.endswith('.parquet'):
+            self._file = parquet.ParquetFile(self.path)
+            self._count = self._file.metadata.num_rows
+            names = self.columns or self._file.schema_arrow.names
+            self._batches = self._file.iter_batches(batch_size=self.chunk_size, columns=names)
+        else:
+            self._file = ipc.open_file(self.path)
+            self._batch_count = self._file.num_record_batches
+            names = self.columns or self._file.schema.names
+            self._batches = (
+                self._file.get_batch(batch_idx).select(names)
+                for batch_idx in range(self._file.num_record_batches)
+            )
+        self._read = 0
+        self._batches_read = 0
+        return list(names)
+
+    def read(self) -> Iterator[list[Sequence]]:
+        for batch in self._batches:
+            self._batches_read += 1
+            # arrow batches are converted by column
+            for offset in range(0, batch.num_rows, self.chunk_size):
+                part = batch.slice(offset, self.chunk_size)
+                rows = list(zip(*(column.to_pylist() for column in part.columns)))
+                self._read += len(rows)
+                yield rows
+
+    def progress(self) -> float | None:
+        if self._count:
+            return self._read / self._count
+        if self._batch_count:
+            return self._batches_read / self._batch_count
+        return None
+
+    def close(self) -> None:
+        self._batches = None
+        self._file = None
+
+
+class TableLoadJob:
+    '''Reads a :class:`TableLoader` in a worker thread.
+
+    `on_columns(names, columns_info)` then `on_rows(rows, progress)` for each
+    chunk and `on_finished(error)` are called on the main thread. Only a few
+    chunks are read ahead of the main thread, so the rows waiting to be
+    displayed do not fill the memory.
+    '''
+
+    max_pending_chunks = 2
+
+    def __init__(self, loader: TableLoader, on_columns: Callable[[list[str], list[dict]], None],
+                 on_rows: Callable[[list[Sequence], float | None], None],
+                 on_finished: Callable[[Exception | None], None]) -> None:
+        self.loader = loader
+        self.on_columns = on_columns
+        self.on_rows = on_rows
+        self.on_finished = on_finished
+
+        self._cancelled = threading.Event()
+        self._pending = threading.Semaphore(self.max_pending_chunks)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        '''Stop reading, the callbacks are not called anymore.'''
+        self._cancelled.set()
+        # unblock the worker waiting for the main thread
+        self._pending.release()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _run(self) -> None:
+        loader = self.loader
+        error = None
+        try:
+            names = loader.open()
+            columns_sent = False
+            for rows in loader.read():
+                if not columns_sent:
+                    self._call(self.on_columns, names, infer_columns_info(names, rows))
+                    columns_sent = True
+
+                self._pending.acquire()
+                if self._cancelled.is_set():
+                    return
+                self._call(self._on_chunk, rows, loader.progress())
+
+            if not columns_sent:
+                self._call(self.on_columns, names, infer_columns_info(names, []))
+        except Exception as e:
+            Logger.error(f'GlowTable: can not load {type(loader).__name__}: {e!r}')
+            error = e
+        finally:
+            loader.close()
+            self._call(self.on_finished, error)
+
+    def _call(self, callback: Callable, *args) -> None:
+        Clock.schedule_once(lambda _: callback(*args) if not self._cancelled.is_set() else None, -1)
+
+    def _on_chunk(self, rows: list[Sequence], progress: float | None) -> None:
+        self._pending.release()
+        self.on_rows(rows, progress)
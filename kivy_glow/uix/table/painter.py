@@ -0,0 +1,226 @@
+__all__ = ('CellPainter', 'TextureCache')
+
+from collections import OrderedDict
+from typing import Any
+
+from kivy.core.text import Label as CoreLabel
+from kivy.graphics import (
+    Color,
+    InstructionGroup,
+    Rectangle,
+)
+from kivy.graphics.texture import Texture
+from kivy.metrics import (
+    dp,
+    sp,
+)
+from kivy.utils import (
+    colormap,
+    get_color_from_hex,
+)
+
+from kivy_glow.icons import (
+    icons,
+    material_icons,
+)
+from kivy_glow.theme import ThemeManager
+
+# how the fast cells of each viewclass are drawn, the others are widgets
+DRAWN_CELLS = {
+    'GlowLabelCell': 'label',
+    'GlowIconCell': 'icon',
+}
+# drawn until the row is hovered or touched, then they become widgets
+INTERACTIVE_CELLS = {
+    'GlowButtonCell': 'button',
+    'GlowIconButtonCell': 'button',
+    'GlowSwitchCell': 'switch',
+    'GlowCheckboxCell': 'checkbox',
+}
+
+ICON_STYLES = ('outlined', 'rounded', 'sharp')
+ICON_WEIGHTS = ('100', '200', '300', '400', '500', '600', '700')
+
+
+def get_icon_glyph(icon: str) -> tuple[str, str]:
+    '''Font name and text of an icon, like :class:`~kivy_glow.uix.icon.GlowIcon`.'''
+    parts = icon.split(':')
+    if len(parts) == 1 and icon in icons:
+        return 'Icons', icons[icon]
+    if len(parts) in (3, 4):
+        icon_name, icon_style, icon_weight = parts[:3]
+        if icon_name in material_icons and icon_style in ICON_STYLES and icon_weight in ICON_WEIGHTS:
+            font_name = f'MaterialIcons_{icon_style}_{icon_weight}'
+            if len(parts) == 4:
+                font_name += f'_{parts[3]}'
+            return font_name, material_icons[icon_name]
+    return 'Icons', ''
+
+
+def get_color(color: Any) -> list[float] | None:
+    '''Color of a cell property, given like to a ColorProperty.'''
+    if color is None:
+        return None
+    if isinstance(color, str):
+        if color.startswith('#'):
+            return get_color_from_hex(color)
+        return colormap.get(color.lower())
+    return list(color)
+
+
+class TextureCache:
+    '''Least recently used textures of rendered texts.
+
+    Textures are rendered white and tinted when drawn, so a text has a single
+    texture whatever its color.
+    '''
+
+    def __init__(self, size: int = 2048) -> None:
+        self.size = size
+        self._textures = OrderedDict()
+
+    def get(self, text: str, font_name: str, font_size: float, bold: bool = False, italic: bool = False,
+            width: int | None = None, halign: str = 'left') -> Texture | None:
+        '''Texture of the text, shortened to fit `width` if given.'''
+        if not text:
+            return None
+
+        key = (text, font_name, font_size, bold, italic, width, halign)
+        texture = self._textures.get(key)
+        if texture is not None:
+            self._textures.move_to_end(key)
+            return texture
+
+        label = CoreLabel(
+            text=text,
+            font_name=font_name,
+            font_size=font_size,
+            bold=bold,
+            italic=italic,
+            halign=halign,
+            text_size=(width, None),
+            shorten=width is not None,
+            shorten_from='right',
+            max_lines=1,
+        )
+        label.refresh()
+        texture = label.texture
+
+        self._textures[key] = texture
+        if len(self._textures) > self.size:
+            self._textures.popitem(last=False)
+        return texture
+
+    def clear(self) -> None:
+        self._textures.clear()
+
+
+class CellPainter:
+    '''Draws the cells of a row into an :class:`~kivy.graphics.InstructionGroup`
+    instead of creating their widgets.
+
+    Cells are drawn from their properties like the widgets would display them:
+    text and font style of labels, icon and icon size of icons and a preview
+    of the interactive cells, their text, icon or state.
+    '''
+
+    textures = TextureCache()
+
+    def __init__(self, theme_cls: ThemeManager) -> None:
+        self.theme_cls = theme_cls
+        self.group = InstructionGroup()
+
+    def clear(self) -> None:
+        self.group.clear()
+
+    def draw(self, kind: str, properties: dict, pos: tuple[float, float], size: tuple[float, float]) -> None:
+        '''Draw a cell of a kind of :data:`DRAWN_CELLS` or :data:`INTERACTIVE_CELLS`
+        in the rectangle of `pos` and `size`.
+        '''
+        if properties.get('hidden'):
+            return
+
+        if kind == 'label':
+            self._draw_text(properties, properties.get('text'), pos, size, properties.get('halign') or 'left')
+        elif kind == 'icon':
+            self._draw_icon(properties.get('icon'), properties.get('icon_size'), self._get_text_color(properties), pos, size)
+        elif kind == 'button':
+            color = get_color(properties.get('text_color')) or self.theme_cls.primary_color
+            if properties.get('disabled'):
+                color = self.theme_cls.disabled_color
+            if properties.get('text'):
+                self._draw_text(properties, properties['text'], pos, size, 'center', color)
+            elif properties.get('icon'):
+                icon_color = get_color(properties.get('icon_color')) or color
+                self._draw_icon(properties['icon'], properties.get('icon_size'), icon_color, pos, size)
+        elif kind == 'switch':
+            icon = 'toggle-switch' if properties.get('active') else 'toggle-switch-off-outline'
+            self._draw_icon(icon, dp(36), self._get_state_color(properties), pos, size)
+        elif kind == 'checkbox':
+            if properties.get('active'):
+                icon = properties.get('checkbox_icon_active') or 'checkbox-marked-outline'
+            else:
+                icon = properties.get('checkbox_icon_inactive') or 'checkbox-blank-outline'
+            self._draw_icon(icon, None, self._get_state_color(properties), pos, size)
+
+    def _draw_text(self, properties: dict, text: Any, pos: tuple[float, float], size: tuple[float, float],
+                   halign: str, color: list[float] | None = None) -> None:
+        if text is None:
+            return
+
+        font_style = self.theme_cls.font_styles.get(properties.get('font_style') or 'BodyM', {})
+        font_name = properties.get('font_name') or font_style.get('font_name', 'Roboto')
+        font_size = properties.get('font_size') or sp(font_style.get('font_size', 15))
+        bold = properties.get('bold', font_style.get('bold', False)) or False
+        italic = properties.get('italic', font_style.get('italic', False)) or False
+
+        texture = self.textures.get(str(text), font_name, font_size, bold, italic, max(int(size[0]), 1), halign)
+        self._draw_texture(texture, color or self._get_text_color(properties), pos, size, centered=False)
+
+    def _draw_icon(self, icon: str | None, icon_size: float | None, color: list[float],
+                   pos: tuple[float, float], size: tuple[float, float]) -> None:
+        if not icon:
+            return
+
+        font_name, glyph = get_icon_glyph(icon)
+        texture = self.textures.get(glyph, font_name, icon_size or dp(24))
+        self._draw_texture(texture, color, pos, size, centered=True)
+
+    def _draw_texture(self, texture: Texture | None, color: list[float], pos: tuple[float, float],
+                      size: tuple[float, float], centered: bool) -> None:
+        if texture is None:
+            return
+
+        x, y = pos
+        width, height = size
+        if centered:
+            x += (width - texture.width) / 2
+        y += (height - texture.height) / 2
+
+        self.group.add(Color(rgba=color))
+        self.group.add(Rectangle(texture=texture, pos=(int(x), int(y)), size=texture.size))
+
+    def _get_text_color(self, properties: dict) -> list[float]:
+        if properties.get('disabled'):
+            return self.theme_cls.disabled_color
+
+        color = get_color(properties.get('color'))
+        if color is not None:
+            return color
+
+        theme_cls = self.theme_cls
+        return {
+            'Secondary': theme_cls.secondary_text_color,
+            'PrimaryOpposite': theme_cls.opposite_text_color,
+            'SecondaryOpposite': theme_cls.opposite_secondary_text_color,
+            'Warning': theme_cls.warning_color,
+            'Success': theme_cls.success_color,
+            'Error': theme_cls.error_color,
+        }.get(properties.get('theme_color'), theme_cls.text_color)
+
+    def _get_state_color(self, properties: dict) -> list[float]:
+        if properties.get('disabled'):
+            return self.theme_cls.disabled_color
+        if properties.get('active'):
+            return get_color(properties.get('active_color')) or self.theme_cls.primary_color
+        return get_color(properties.get('inactive_color')) or self.theme_cls.secondary_text_color
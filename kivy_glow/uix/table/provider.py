@@ -0,0 +1,320 @@
+__all__ = ('SQLiteDataProvider', 'TableBlockCache', 'TableDataProvider')
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Sequence,
+)
+
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+
+class TableDataProvider:
+    '''Lazy data source of a :class:`~kivy_glow.uix.table.GlowTable`.
+
+    The table asks for the rows it displays, by blocks, so the data set is
+    never loaded as a whole. Rows are sequences of cells like the rows of
+    :attr:`GlowTable.table_data`.
+
+    :meth:`fetch` is called in a worker thread unless :attr:`thread_safe` is
+    False. :meth:`count`, :meth:`sort` and :meth:`filter` are called on the
+    main thread, then the table reloads its rows.
+    '''
+
+    thread_safe = True
+
+    def count(self) -> int:
+        '''Number of rows, with the current filter.'''
+        raise NotImplementedError
+
+    def fetch(self, offset: int, limit: int) -> list[Sequence]:
+        '''Rows from `offset`, at most `limit`, with the current sort and filter.'''
+        raise NotImplementedError
+
+    def sort(self, column: int | None, order: str = 'ASC') -> None:
+        '''Sort the rows by a column, 'ASC' or 'DSC'. None for the natural order.'''
+        raise NotImplementedError
+
+    def filter(self, filters: dict[int, Any] | None = None) -> None:
+        '''Keep the rows matching all the column filters. None to remove them.'''
+        raise NotImplementedError
+
+    def close(self) -> None:
+        '''Release the resources of the provider.'''
+        pass
+
+
+class SQLiteDataProvider(TableDataProvider):
+    '''Rows of a SQLite table or view.
+
+    `columns` are the names of the selected columns, in the order of
+    :attr:`GlowTable.columns_info`. `where` and `parameters` restrict the
+    rows permanently, :meth:`filter` adds column filters on top of them:
+    {column index: value} or {column index: (operator, value)}, with one of
+    the operators =, !=, <, <=, >, >=, like, in.
+
+    Each thread uses its own connection, opened read only.
+    '''
+
+    operators = ('=', '!=', '<', '<=', '>', '>=', 'like', 'in')
+
+    def __init__(self, database: str, table: str, columns: Sequence[str], where: str | None = None,
+                 parameters: Sequence = (), uri: bool = False) -> None:
+        self.database = database
+        self.table = table
+        self.columns = list(columns)
+        self.where = where
+        self.parameters = tuple(parameters)
+        self.uri = uri
+
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._order_by = ''
+        self._filter_clauses = []
+        self._filter_parameters = ()
+        self._count = None
+        self._tiebreak = None
+
+    def _quote(self, identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # sqlite connections can not be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            if self.uri:
+                connection = sqlite3.connect(self.database, uri=True, check_same_thread=False)
+            else:
+                connection = sqlite3.connect(f'file:{self.database}?mode=ro', uri=True, check_same_thread=False)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _where(self) -> tuple[str, tuple]:
+        clauses = ([f'({self.where})'] if self.where else []) + self._filter_clauses
+        if not clauses:
+            return '', ()
+        return ' WHERE ' + ' AND '.join(clauses), self.parameters + self._filter_parameters
+
+    def count(self) -> int:
+        if self._count is None:
+            where, parameters = self._where()
+            self._count = self._get_connection().execute(
+                f'SELECT COUNT(*) FROM {self._quote(self.table)}{where}', parameters,
+            ).fetchone()[0]
+        return self._count
+
+    def fetch(self, offset: int, limit: int) -> list[Sequence]:
+        where, parameters = self._where()
+        columns = ', '.join(self._quote(column) for column in self.columns)
+        return self._get_connection().execute(
+            f'SELECT {columns} FROM {self._quote(self.table)}{where}{self._order_by} LIMIT ? OFFSET ?',
+            parameters + (limit, offset),
+        ).fetchall()
+
+    def sort(self, column: int | None, order: str = 'ASC') -> None:
+        if column is None:
+            self._order_by = ''
+        else:
+            direction = 'DESC' if order == 'DSC' else 'ASC'
+            # keeps the order of equal values stable between blocks
+            self._order_by = f' ORDER BY {self._quote(self.columns[column])} {direction}, {self._get_tiebreak()}'
+
+    def _get_tiebreak(self) -> str:
+        '''Columns ordering the rows of equal values: the rowid, the primary
+        key of a table without rowid, or the selected columns of a view.
+        '''
+        if self._tiebreak is None:
+            connection = self._get_connection()
+            table = self._quote(self.table)
+            columns = None
+            row = connection.execute('SELECT type FROM sqlite_master WHERE name = ?', (self.table, )).fetchone()
+            # the rowid of a view is not meaningful
+            if row is None or row[0] != 'view':
+                try:
+                    connection.execute(f'SELECT rowid FROM {table} LIMIT 0')
+                    columns = ['rowid']
+                except sqlite3.OperationalError:
+                    pass
+
+            if columns is None:
+                primary_key = sorted((pk, name) for _, name, _, _, _, pk in connection.execute(f'PRAGMA table_info({table})') if pk)
+                columns = [self._quote(name) for _, name in primary_key] or [self._quote(column) for column in self.columns]
+            self._tiebreak = ', '.join(columns)
+        return self._tiebreak
+
+    def filter(self, filters: dict[int, Any] | None = None) -> None:
+        clauses = []
+        parameters = []
+        for column, value in (filters or {}).items():
+            operator = '='
+            if isinstance(value, tuple):
+                operator, value = value
+                operator = operator.lower()
+                if operator not in self.operators:
+                    raise ValueError(f'unknown filter operator {operator!r}')
+
+            name = self._quote(self.columns[column])
+            if value is None:
+                clauses.append(f'{name} IS {"NOT " if operator == "!=" else ""}NULL')
+            elif operator == 'in':
+                value = list(value)
+                clauses.append(f'{name} IN ({", ".join("?" * len(value))})')
+                parameters.extend(value)
+            else:
+                clauses.append(f'{name} {operator.upper()} ?')
+                parameters.append(value)
+
+        self._filter_clauses = clauses
+        self._filter_parameters = tuple(parameters)
+        self._count = None
+
+    def invalidate(self) -> None:
+        '''Forget the cached row count, after the database changed.'''
+        self._count = None
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+class TableBlockCache:
+    '''LRU cache of the rows of a :class:`TableDataProvider`, by blocks of
+    `block_size` rows.
+
+    A missing row is loaded with its block and the `prefetch` blocks around
+    it in a worker thread, then `on_rows_loaded(start, stop)` is called on
+    the main thread. Blocks which went far from the requested rows before
+    their turn (fast scrolling) are not fetched. At most `max_blocks` blocks
+    are kept, so memory does not depend on the size of the data set.
+    '''
+
+    def __init__(self, provider: TableDataProvider, on_rows_loaded: Callable[[int, int], None],
+                 block_size: int = 256, max_blocks: int = 16, prefetch: int = 1) -> None:
+        self.provider = provider
+        self.on_rows_loaded = on_rows_loaded
+        self.block_size = block_size
+        self.max_blocks = max(max_blocks, 2 * prefetch + 2)
+        self.prefetch = prefetch
+
+        self._blocks = OrderedDict()
+        self._loading = set()
+        # number of rows of the provider, None while unknown
+        self._count = None
+        self._generation = 0
+        self._last_block = 0
+        self._executor = ThreadPoolExecutor(max_workers=1) if provider.thread_safe else None
+
+    def get_row(self, index: int) -> Sequence | None:
+        '''Row at index, None while its block is loading.'''
+        block_idx, offset = divmod(index, self.block_size)
+        self.request(block_idx)
+
+        block = self._blocks.get(block_idx)
+        if block is None:
+            return None
+        self._blocks.move_to_end(block_idx)
+        return block[offset] if offset < len(block) else None
+
+    def get_rows(self, indices: Iterable[int]) -> list[Sequence | None]:
+        '''Rows at indices, the blocks which are not cached are fetched in
+        the calling thread, once per block. They are not cached, so the
+        blocks of the displayed rows are kept.
+        '''
+        fetched = {}
+        rows = []
+        for index in indices:
+            block_idx, offset = divmod(index, self.block_size)
+            block = self._blocks.get(block_idx)
+            if block is None:
+                block = fetched.get(block_idx)
+            if block is None:
+                block = fetched[block_idx] = self.provider.fetch(block_idx * self.block_size, self.block_size)
+            rows.append(block[offset] if offset < len(block) else None)
+        return rows
+
+    def request(self, block_idx: int) -> None:
+        '''Load a block and the blocks around it if needed.'''
+        self._last_block = block_idx
+        # blocks after the last row are not prefetched
+        stop = -(-self._count // self.block_size) if self._count is not None else None
+        for idx in (block_idx, *(block_idx + d * sign for d in range(1, self.prefetch + 1) for sign in (1, -1))):
+            if idx < 0 or (stop is not None and idx >= stop):
+                continue
+            if idx not in self._blocks and idx not in self._loading:
+                self._load(idx)
+
+    def reset(self, count: int | None = None) -> None:
+        '''Drop all the blocks, e.g. after a sort or filter change. `count`
+        is the number of rows of the provider, if known.
+        '''
+        self._generation += 1
+        self._blocks.clear()
+        self._loading.clear()
+        self._count = count
+
+    def close(self) -> None:
+        self.reset()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, block_idx: int) -> None:
+        self._loading.add(block_idx)
+        offset = block_idx * self.block_size
+
+        if self._executor is None:
+            self._loading.discard(block_idx)
+            self._store_block(block_idx, self.provider.fetch(offset, self.block_size))
+            return
+
+        future = self._executor.submit(self._fetch, self._generation, block_idx)
+        future.add_done_callback(partial(self._on_fetched, self._generation, block_idx))
+
+    def _fetch(self, generation: int, block_idx: int) -> list[Sequence] | None:
+        # skip blocks which are not wanted anymore
+        if generation != self._generation or abs(block_idx - self._last_block) > self.max_blocks // 2:
+            return None
+        return self.provider.fetch(block_idx * self.block_size, self.block_size)
+
+    def _on_fetched(self, generation: int, block_idx: int, future: Future) -> None:
+        # called in the worker thread
+        Clock.schedule_once(partial(self._on_block_loaded, generation, block_idx, future), -1)
+
+    def _on_block_loaded(self, generation: int, block_idx: int, future: Future, *args) -> None:
+        if generation != self._generation:
+            return
+        self._loading.discard(block_idx)
+
+        try:
+            rows = future.result()
+        except Exception as e:
+            Logger.error(f'GlowTable: can not fetch rows {block_idx * self.block_size}+{self.block_size}: {e!r}')
+            return
+        if rows is None:
+            return
+
+        self._store_block(block_idx, rows)
+        start = block_idx * self.block_size
+        self.on_rows_loaded(start, start + len(rows))
+
+    def _store_block(self, block_idx: int, rows: list[Sequence]) -> None:
+        blocks = self._blocks
+        blocks[block_idx] = rows
+        blocks.move_to_end(block_idx)
+        while len(blocks) > self.max_blocks:
+            blocks.popitem(last=False)
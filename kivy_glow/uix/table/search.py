@@ -0,0 +1,205 @@
+__all__ = ('TableSearchIndex', )
+
+import re
+from bisect import bisect_left
+from typing import (
+    Any,
+    Iterable,
+)
+
+from kivy_glow.uix.table.storage import (
+    TableStore,
+    index_runs,
+)
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(value: Any) -> set[str]:
+    '''Lower case words of a value.'''
+    if value is None or isinstance(value, bool):
+        return set()
+    return set(TOKEN_RE.findall(str(value).lower()))
+
+
+class TableSearchIndex:
+    '''Inverted index of the words of the value property of the `columns` of
+    a :class:`~kivy_glow.uix.table.storage.TableStore`.
+
+    :meth:`search` matches every word of the query as a prefix, so rows are
+    found while the query is being typed. The index is built on the first
+    search, updated with :meth:`update_rows`, :meth:`append_rows`,
+    :meth:`insert_rows`, :meth:`delete_rows`, :meth:`move_rows` and
+    :meth:`evict_rows`, and rebuilt after :meth:`invalidate`.
+    '''
+
+    def __init__(self, store: TableStore, columns: Iterable[int]) -> None:
+        self.store = store
+        self.columns = list(columns)
+
+        self._postings = {}
+        self._tokens = []
+        self._tokens_dirty = False
+        self._built = False
+        self._reset_rows()
+
+    def _reset_rows(self) -> None:
+        # postings hold row ids, which do not change when rows shift: the
+        # stored row of an id is `_id_rows[id] - _evicted`
+        self._row_tokens = []
+        self._row_ids = []
+        self._id_rows = {}
+        self._next_id = 0
+        self._evicted = 0
+
+    def invalidate(self) -> None:
+        '''Rebuild the index on the next search.'''
+        self._postings = {}
+        self._tokens = []
+        self._built = False
+        self._reset_rows()
+
+    def update_rows(self, row_indices: Iterable[int]) -> None:
+        '''Index the new values of rows.'''
+        if not self._built:
+            return
+
+        for row_idx in row_indices:
+            old_tokens = self._row_tokens[row_idx]
+            new_tokens = self._get_row_tokens(row_idx)
+            row_id = self._row_ids[row_idx]
+            for token in old_tokens - new_tokens:
+                self._remove_posting(token, row_id)
+            for token in new_tokens - old_tokens:
+                self._add_posting(token, row_id)
+            self._row_tokens[row_idx] = new_tokens
+
+    def append_rows(self, count: int) -> None:
+        '''Index the rows added at the end of the store.'''
+        self.insert_rows(len(self._row_tokens), count)
+
+    def insert_rows(self, row_idx: int, count: int) -> None:
+        '''Index the rows inserted in the store before `row_idx`. Only the ids
+        of the rows after them are shifted, the rows are not indexed again.
+        '''
+        if not self._built:
+            return
+
+        row_tokens = [self._get_row_tokens(idx) for idx in range(row_idx, row_idx + count)]
+        row_ids = range(self._next_id, self._next_id + count)
+        self._next_id += count
+        for tokens, row_id in zip(row_tokens, row_ids):
+            for token in tokens:
+                self._add_posting(token, row_id)
+
+        self._row_tokens[row_idx:row_idx] = row_tokens
+        self._row_ids[row_idx:row_idx] = row_ids
+        self._update_id_rows(row_idx)
+
+    def delete_rows(self, row_indices: Iterable[int]) -> None:
+        '''Forget rows, before or after they were deleted from the store.'''
+        if not self._built:
+            return
+
+        runs = list(index_runs(row_indices))
+        for start, stop in reversed(runs):
+            for tokens, row_id in zip(self._row_tokens[start:stop], self._row_ids[start:stop]):
+                for token in tokens:
+                    self._remove_posting(token, row_id)
+                del self._id_rows[row_id]
+            del self._row_tokens[start:stop]
+            del self._row_ids[start:stop]
+        if runs:
+            self._update_id_rows(runs[0][0])
+
+    def move_rows(self, row_indices: Iterable[int], row_idx: int) -> None:
+        '''Move rows like :meth:`TableStore.move_rows`, without indexing them again.'''
+        if not self._built:
+            return
+
+        runs = list(index_runs(row_indices))
+        if not runs:
+            return
+        for rows in (self._row_tokens, self._row_ids):
+            moved = [row for start, stop in runs for row in rows[start:stop]]
+            for start, stop in reversed(runs):
+                del rows[start:stop]
+            rows[row_idx:row_idx] = moved
+        self._update_id_rows(min(runs[0][0], row_idx))
+
+    def evict_rows(self, count: int) -> None:
+        '''Forget the first rows, after they were evicted from the store.'''
+        if not self._built:
+            return
+
+        count = min(count, len(self._row_tokens))
+        for tokens, row_id in zip(self._row_tokens[:count], self._row_ids[:count]):
+            for token in tokens:
+                self._remove_posting(token, row_id)
+            del self._id_rows[row_id]
+        del self._row_tokens[:count]
+        del self._row_ids[:count]
+        # the stored rows of the other ids are shifted without updating them
+        self._evicted += count
+
+    def _update_id_rows(self, start: int) -> None:
+        '''Stored rows of the ids of the rows from `start`, after they shifted.'''
+        self._id_rows.update(zip(self._row_ids[start:], range(start + self._evicted, len(self._row_ids) + self._evicted)))
+
+    def search(self, query: str) -> set[int]:
+        '''Rows containing a word starting with each word of the query.'''
+        words = tokenize(query)
+        if not self._built:
+            self._build()
+        if self._tokens_dirty:
+            self._tokens = sorted(self._postings)
+            self._tokens_dirty = False
+
+        rows = None
+        # the longest words match the fewest rows
+        for word in sorted(words, key=len, reverse=True):
+            matches = set()
+            tokens = self._tokens
+            for token_idx in range(bisect_left(tokens, word), len(tokens)):
+                token = tokens[token_idx]
+                if not token.startswith(word):
+                    break
+                matches.update(self._postings[token])
+
+            rows = matches if rows is None else rows & matches
+            if not rows:
+                return set()
+
+        if rows is None:
+            return set(range(len(self.store)))
+        id_rows = self._id_rows
+        evicted = self._evicted
+        return {id_rows[row_id] - evicted for row_id in rows}
+
+    def _build(self) -> None:
+        self._postings = {}
+        self._reset_rows()
+        self._built = True
+        self.append_rows(len(self.store))
+        self._tokens = sorted(self._postings)
+        self._tokens_dirty = False
+
+    def _get_row_tokens(self, row_idx: int) -> set[str]:
+        tokens = set()
+        for column_idx in self.columns:
+            tokens |= tokenize(self.store.get_value(row_idx, column_idx))
+        return tokens
+
+    def _add_posting(self, token: str, row_id: int) -> None:
+        rows = self._postings.get(token)
+        if rows is None:
+            rows = self._postings[token] = set()
+            self._tokens_dirty = True
+        rows.add(row_id)
+
+    def _remove_posting(self, token: str, row_id: int) -> None:
+        rows = self._postings[token]
+        rows.discard(row_id)
+        if not rows:
+            del self._postings[token]
+            self._tokens_dirty = True
@@ -0,0 +1,435 @@
+__all__ = ('TableStore', 'typed_sort_key')
+
+import bisect
+from functools import cmp_to_key
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+
+
+def index_runs(indices: Iterable[int]) -> Iterator[tuple[int, int]]:
+    '''Contiguous `(start, stop)` runs of the sorted unique indices.'''
+    start = stop = None
+    for index in sorted(set(indices)):
+        if index == stop:
+            stop += 1
+            continue
+        if start is not None:
+            yield start, stop
+        start, stop = index, index + 1
+    if start is not None:
+        yield start, stop
+
+
+def typed_sort_key(value: Any) -> tuple:
+    '''Sort key of values of different types: numbers first, then the other
+    values grouped by type.
+    '''
+    if isinstance(value, (int, float)):
+        return (0, '', value)
+    return (1, type(value).__name__, value)
+
+
+class TableStore:
+    '''Columnar storage of the :class:`~kivy_glow.uix.table.GlowTable` data.
+
+    Each cell property of each column is kept in its own array, created the
+    first time a cell sets it, instead of one dict per row with `col_{i}_{prop}`
+    keys. Memory grows with the number of used properties, and the data of a
+    row for the RecycleView is built on demand with :meth:`get_view_data`.
+
+    The schema is one `(value_property, allowed_properties, properties)`
+    tuple per column: the property of plain cell values, the properties that
+    dict cells may set and the properties of list / tuple cells, in order.
+
+    Sort orders are cached as permutations of the row indices until the
+    sorted columns change, see :meth:`get_order`.
+
+    Rows are appended and the first rows evicted in O(rows) for a bounded
+    stream of rows, see :meth:`append_rows` and :meth:`evict_rows`.
+    '''
+
+    def __init__(self, schema: Sequence[tuple[str, Sequence[str], Sequence[str]]] = ()) -> None:
+        self.schema = list(schema)
+        self.columns = [{} for _ in self.schema]
+        self._empty_view_data = self._get_empty_view_data()
+        self._length = 0
+        # evicted rows still at the start of the arrays
+        self._head = 0
+        # (order, sort keys) by sort_by, sort keys are None for orders computed elsewhere
+        self._orders = {}
+        # changed when the stored rows shift, so row indices taken before are stale
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def set_schema(self, schema: Sequence[tuple[str, Sequence[str], Sequence[str]]]) -> None:
+        '''Set the schema and clear the data.'''
+        self.schema = list(schema)
+        self._empty_view_data = self._get_empty_view_data()
+        self.clear()
+
+    def clear(self) -> None:
+        self.columns = [{} for _ in self.schema]
+        self._length = 0
+        self._head = 0
+        self._orders.clear()
+        self.version += 1
+
+    def parse_cell(self, column: int, cell: Any) -> dict[str, Any]:
+        '''Properties of a cell given like in :attr:`GlowTable.table_data`.'''
+        value_property, allowed_properties, properties = self.schema[column]
+        if isinstance(cell, dict):
+            return {key: value for key, value in cell.items() if key in allowed_properties}
+        if isinstance(cell, (list, tuple)):
+            return dict(zip(properties, cell))
+        return {value_property: cell}
+
+    def load_rows(self, rows: Iterable[Sequence]) -> None:
+        '''Replace the data by rows given like in :attr:`GlowTable.table_data`.'''
+        rows = rows if isinstance(rows, Sequence) else list(rows)
+        length = len(rows)
+        columns = [{} for _ in self.schema]
+        parse_cell = self.parse_cell
+        n_columns = len(columns)
+
+        for row_idx, row in enumerate(rows):
+            for column_idx, cell in enumerate(row[:n_columns]):
+                properties = columns[column_idx]
+                for key, value in parse_cell(column_idx, cell).items():
+                    if value is None:
+                        continue
+                    values = properties.get(key)
+                    if values is None:
+                        values = properties[key] = [None] * length
+                    values[row_idx] = value
+
+        self.columns = columns
+        self._length = length
+        self._head = 0
+        self._orders.clear()
+        self.version += 1
+
+    def load_columns(self, columns: Sequence[Sequence | dict[str, Sequence]]) -> None:
+        '''Replace the data by columns: for each column, either a sequence of
+        values of its value property, or a dict of property: sequence.
+        '''
+        length = None
+        loaded = []
+        for column_idx, column in enumerate(columns[:len(self.schema)]):
+            if not isinstance(column, dict):
+                column = {self.schema[column_idx][0]: column}
+            properties = {}
+            for key, values in column.items():
+                values = list(values)
+                if length is None:
+                    length = len(values)
+                elif len(values) != length:
+                    raise ValueError(f'column {column_idx} `{key}` has {len(values)} values, expected {length}')
+                properties[key] = values
+            loaded.append(properties)
+
+        loaded.extend({} for _ in range(len(self.schema) - len(loaded)))
+        self.columns = loaded
+        self._length = length or 0
+        self._head = 0
+        self._orders.clear()
+        self.version += 1
+
+    def set_row(self, row_idx: int, row: Sequence) -> None:
+        '''Replace the cells of a row.'''
+        self._orders.clear()
+        for properties in self.columns:
+            for values in properties.values():
+                values[self._head + row_idx] = None
+        for column_idx, cell in enumerate(row[:len(self.columns)]):
+            self.set_cell(row_idx, column_idx, cell)
+
+    def set_cell(self, row_idx: int, column_idx: int, cell: Any) -> None:
+        '''Update the properties of a cell, given like in
+        :attr:`GlowTable.table_data`.
+        '''
+        self._drop_orders(column_idx)
+        properties = self.columns[column_idx]
+        for key, value in self.parse_cell(column_idx, cell).items():
+            values = properties.get(key)
+            if values is None:
+                if value is None:
+                    continue
+                values = properties[key] = [None] * (self._head + self._length)
+            values[self._head + row_idx] = value
+
+    def insert_rows(self, row_idx: int, rows: Iterable[Sequence]) -> None:
+        '''Insert rows given like in :attr:`GlowTable.table_data` before
+        `row_idx`.
+        '''
+        rows = rows if isinstance(rows, Sequence) else list(rows)
+        count = len(rows)
+        if not count:
+            return
+
+        inserted_idx = row_idx
+        if row_idx < self._length:
+            # appended rows do not shift the stored rows
+            self._compact()
+            self.version += 1
+        row_idx += self._head
+        parse_cell = self.parse_cell
+        for column_idx, properties in enumerate(self.columns):
+            inserted = {}
+            for offset, row in enumerate(rows):
+                if column_idx >= len(row):
+                    continue
+                for key, value in parse_cell(column_idx, row[column_idx]).items():
+                    if value is not None:
+                        inserted.setdefault(key, [None] * count)[offset] = value
+
+            for key in inserted.keys() - properties.keys():
+                properties[key] = [None] * (self._head + self._length)
+            for key, values in properties.items():
+                values[row_idx:row_idx] = inserted.get(key) or [None] * count
+
+        self._length += count
+        self._insert_into_orders(inserted_idx, count)
+
+    def append_rows(self, rows: Iterable[Sequence]) -> None:
+        '''Add rows given like in :attr:`GlowTable.table_data` at the end.'''
+        self.insert_rows(self._length, rows)
+
+    def evict_rows(self, count: int) -> None:
+        '''Delete the first `count` rows. They are only removed from the
+        arrays once as many rows as stored were evicted, so evicting costs
+        O(count) on average.
+        '''
+        count = min(count, self._length)
+        if count <= 0:
+            return
+
+        self._head += count
+        self._length -= count
+        self._orders.clear()
+        self.version += 1
+        if self._head > self._length:
+            self._compact()
+
+    def _compact(self) -> None:
+        '''Remove the evicted rows from the arrays.'''
+        if not self._head:
+            return
+
+        for properties in self.columns:
+            for values in properties.values():
+                del values[:self._head]
+        self._head = 0
+
+    def delete_rows(self, row_indices: Iterable[int]) -> None:
+        '''Delete rows by index.'''
+        self._compact()
+        runs = list(index_runs(row_indices))
+        for properties in self.columns:
+            for values in properties.values():
+                for start, stop in reversed(runs):
+                    del values[start:stop]
+
+        self._length -= sum(stop - start for start, stop in runs)
+        self._delete_from_orders([row_idx for start, stop in runs for row_idx in range(start, stop)])
+        self.version += 1
+
+    def move_rows(self, row_indices: Iterable[int], row_idx: int) -> None:
+        '''Move rows, in their order, so that the first one is at `row_idx`
+        once they are moved.
+        '''
+        self._compact()
+        runs = list(index_runs(row_indices))
+        for properties in self.columns:
+            for values in properties.values():
+                moved = [value for start, stop in runs for value in values[start:stop]]
+                for start, stop in reversed(runs):
+                    del values[start:stop]
+                values[row_idx:row_idx] = moved
+        self._orders.clear()
+        self.version += 1
+
+    def permute(self, order: Sequence[int]) -> None:
+        '''Reorder the rows, row `i` becomes the row `order[i]`.'''
+        self._compact()
+        for properties in self.columns:
+            for key, values in properties.items():
+                properties[key] = [values[row_idx] for row_idx in order]
+        self._orders.clear()
+        self.version += 1
+
+    def get_order(self, sort_by: Sequence[tuple[int, str]],
+                  sort_keys: dict[int, Callable[[Any], Any]] | None = None) -> Sequence[int]:
+        '''Row indices sorted by the value property of the columns of
+        `sort_by`, `(column index, 'ASC' | 'DSC')` pairs by priority. The sort
+        is stable in both orders, `sort_keys` are optional key functions by
+        column and empty cells sort after the values in both orders. Columns
+        of values which can not be compared are sorted by :func:`typed_sort_key`.
+
+        Orders are cached until the sorted columns change.
+        '''
+        sort_by = tuple(sort_by)
+        cached = self._orders.get(sort_by)
+        if cached is not None:
+            return cached[0]
+
+        sort_keys = sort_keys or {}
+        order = list(range(self._length))
+        # stable sorts from the lowest priority column
+        for column_idx, sort_order in reversed(sort_by):
+            key = sort_keys.get(column_idx)
+            values = self.get_column(column_idx)
+            rows = [row_idx for row_idx in order if values[row_idx] is not None]
+            empty_rows = [row_idx for row_idx in order if values[row_idx] is None] if len(rows) < len(order) else []
+            keys = values if key is None else [None if value is None else key(value) for value in values]
+            try:
+                rows.sort(key=keys.__getitem__, reverse=sort_order == 'DSC')
+            except TypeError:
+                rows.sort(key=lambda row_idx: typed_sort_key(keys[row_idx]), reverse=sort_order == 'DSC')
+            order = rows + empty_rows
+
+        self._orders[sort_by] = (order, sort_keys)
+        return order
+
+    def has_order(self, sort_by: Sequence[tuple[int, str]]) -> bool:
+        return tuple(sort_by) in self._orders
+
+    def set_order(self, sort_by: Sequence[tuple[int, str]], order: Sequence[int]) -> None:
+        '''Cache an order computed elsewhere, e.g. by a custom sorting function.
+        It is dropped when rows are inserted or deleted.
+        '''
+        self._orders[tuple(sort_by)] = (order, None)
+
+    def _insert_into_orders(self, row_idx: int, count: int) -> None:
+        '''Insert the new rows into the cached orders with a binary search,
+        instead of sorting all the rows again.
+        '''
+        shifted = row_idx < self._length - count
+        for sort_by, (order, sort_keys) in list(self._orders.items()):
+            if sort_keys is None:
+                del self._orders[sort_by]
+                continue
+
+            if shifted:
+                order = [idx + count if idx >= row_idx else idx for idx in order]
+            else:
+                order = list(order)
+            key = cmp_to_key(self._get_rows_comparator(sort_by, sort_keys))
+            for new_idx in range(row_idx, row_idx + count):
+                bisect.insort(order, new_idx, key=key)
+            self._orders[sort_by] = (order, sort_keys)
+
+    def _delete_from_orders(self, deleted: list[int]) -> None:
+        deleted_set = set(deleted)
+        for sort_by, (order, sort_keys) in list(self._orders.items()):
+            if sort_keys is None:
+                del self._orders[sort_by]
+                continue
+            self._orders[sort_by] = (
+                [idx - bisect.bisect_left(deleted, idx) for idx in order if idx not in deleted_set],
+                sort_keys,
+            )
+
+    def _get_rows_comparator(self, sort_by: tuple, sort_keys: dict) -> Callable[[int, int], int]:
+        '''Comparison of two rows in the order of :meth:`get_order`.'''
+        columns = [
+            (self.get_column(column_idx), sort_keys.get(column_idx), sort_order == 'DSC')
+            for column_idx, sort_order in sort_by
+        ]
+
+        def compare(a: int, b: int) -> int:
+            for values, key, descending in columns:
+                value_a, value_b = values[a], values[b]
+                if value_a is None or value_b is None:
+                    if value_a is None and value_b is None:
+                        continue
+                    # empty cells after the values
+                    return 1 if value_a is None else -1
+
+                if key is not None:
+                    value_a, value_b = key(value_a), key(value_b)
+                try:
+                    less, greater = value_a < value_b, value_b < value_a
+                except TypeError:
+                    value_a, value_b = typed_sort_key(value_a), typed_sort_key(value_b)
+                    less, greater = value_a < value_b, value_b < value_a
+                if less or greater:
+                    return (1 if less else -1) if descending else (-1 if less else 1)
+            # stable
+            return a - b
+
+        return compare
+
+    def _drop_orders(self, column_idx: int) -> None:
+        for sort_by in [sort_by for sort_by in self._orders if any(column == column_idx for column, _ in sort_by)]:
+            del self._orders[sort_by]
+
+    def get_value(self, row_idx: int, column_idx: int) -> Any:
+        '''Value of the value property of a cell.'''
+        values = self.columns[column_idx].get(self.schema[column_idx][0])
+        return values[self._head + row_idx] if values is not None else None
+
+    def get_column(self, column_idx: int, key: str | None = None) -> Sequence:
+        '''Values of a cell property (the value property by default) of a
+        column. Do not modify the returned sequence.
+        '''
+        if key is None:
+            key = self.schema[column_idx][0]
+        self._compact()
+        values = self.columns[column_idx].get(key)
+        return values if values is not None else [None] * self._length
+
+    def get_row(self, row_idx: int) -> list:
+        '''Cells of a row: plain values when only the value property is set,
+        dicts of properties otherwise.
+        '''
+        row = []
+        row_idx += self._head
+        for column_idx, properties in enumerate(self.columns):
+            cell = {key: values[row_idx] for key, values in properties.items() if values[row_idx] is not None}
+            value_property = self.schema[column_idx][0]
+            if not cell:
+                row.append(None)
+            elif len(cell) == 1 and value_property in cell:
+                row.append(cell[value_property])
+            else:
+                row.append(cell)
+        return row
+
+    def _get_empty_view_data(self) -> dict[str, None]:
+        # recycled views keep the values missing from their data
+        return {
+            f'col_{column_idx}_{key}': None
+            for column_idx, (value_property, _, properties) in enumerate(self.schema)
+            for key in (value_property, *properties)
+        }
+
+    def get_view_data(self, row_idx: int) -> dict[str, Any]:
+        '''`col_{i}_{property}` values of a row, for the row viewclass. The
+        value and the properties of the schema are None when not set.
+        '''
+        view_data = dict(self._empty_view_data)
+        row_idx += self._head
+        for column_idx, properties in enumerate(self.columns):
+            for key, values in properties.items():
+                value = values[row_idx]
+                if value is not None:
+                    view_data[f'col_{column_idx}_{key}'] = value
+        return view_data
+
+    def format_row(self, row: Sequence) -> dict[str, Any]:
+        '''`col_{i}_{property}` values of a row given like in
+        :attr:`GlowTable.table_data`, without storing it.
+        '''
+        view_data = dict(self._empty_view_data)
+        for column_idx, cell in enumerate(row[:len(self.schema)]):
+            for key, value in self.parse_cell(column_idx, cell).items():
+                if value is not None:
+                    view_data[f'col_{column_idx}_{key}'] = value
+        return view_data
@@ -1,12 +1,27 @@
 __all__ = ('GlowTable', )
 
+import bisect
+import hashlib
 import os
-import uuid
-from typing import Self
+import weakref
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Self,
+    Sequence,
+)
 
 from kivy.animation import Animation
 from kivy.clock import Clock
+from kivy.core.window import Window
 from kivy.effects.scroll import ScrollEffect
+from kivy.graphics import (
+    PopMatrix,
+    PushMatrix,
+    Translate,
+)
 from kivy.input.motionevent import MotionEvent
 from kivy.lang import Builder
 from kivy.metrics import dp
@@ -19,7 +34,6 @@ from kivy.properties import (
     OptionProperty,
     StringProperty,
 )
-from kivy.uix.recycleview.layout import LayoutSelectionBehavior
 from kivy.uix.recycleview.views import RecycleDataViewBehavior
 from kivy.uix.widget import Widget
 
@@ -30,9 +44,47 @@ from kivy_glow.uix.behaviors import HoverBehavior
 from kivy_glow.uix.boxlayout import GlowBoxLayout
 from kivy_glow.uix.button import GlowButton
 from kivy_glow.uix.checkbox import GlowCheckbox
+from kivy_glow.uix.label import GlowLabel
 from kivy_glow.uix.paginator import GlowPaginator
-from kivy_glow.uix.recycleboxlayout import GlowRecycleBoxLayout
 from kivy_glow.uix.recycleview import GlowRecycleView
+from kivy_glow.uix.table.aggregates import (
+    TableAggregates,
+    compute_aggregate,
+    create_aggregate,
+    is_not_none,
+)
+from kivy_glow.uix.table.datamodel import (
+    TableDataModel,
+    TableRowsView,
+)
+from kivy_glow.uix.table.exporter import (
+    TableExporter,
+    TableExportJob,
+)
+from kivy_glow.uix.table.groups import (
+    TableGroups,
+    index_groups,
+)
+from kivy_glow.uix.table.loader import (
+    TableLoader,
+    TableLoadJob,
+    infer_columns_info,
+)
+from kivy_glow.uix.table.painter import (
+    DRAWN_CELLS,
+    INTERACTIVE_CELLS,
+    CellPainter,
+)
+from kivy_glow.uix.table.provider import (
+    TableBlockCache,
+    TableDataProvider,
+)
+from kivy_glow.uix.table.search import TableSearchIndex
+from kivy_glow.uix.table.storage import (
+    TableStore,
+    index_runs,
+)
+from kivy_glow.utils.selection import SelectionModel
 
 with open(
     os.path.join(kivy_glow_uix_dir, 'table', 'table.kv'), encoding='utf-8',
@@ -40,6 +92,51 @@ with open(
     Builder.load_string(kv_file.read())
 
 
+PLACEHOLDER_VALUES = {
+    'str': '',
+    'int': 0,
+    'float': 0.0,
+    'bool': False,
+    'tuple': (),
+    'list': [],
+    'color': (0, 0, 0, 0),
+}
+
+
+class GlowTableException(Exception):
+    pass
+
+
+# number of tables using each generated row viewclass
+_row_viewclass_users = {}
+
+
+def acquire_row_viewclass(rule: str, base: str = 'GlowTableRow') -> str:
+    '''Name of the `base` subclass with the kv `rule` body, loaded once for
+    all the tables with the same columns.
+    '''
+    viewclass = f'GlowRow-{hashlib.sha1(f"{base}:{rule}".encode("utf-8")).hexdigest()[:16]}'
+    if viewclass not in _row_viewclass_users:
+        Builder.load_string(f'<{viewclass}@{base}>:\n' + rule, filename=f'{viewclass}.kv')
+        _row_viewclass_users[viewclass] = 0
+
+    _row_viewclass_users[viewclass] += 1
+    return viewclass
+
+
+def release_row_viewclass(viewclass: str) -> None:
+    '''Unload the rule of a row viewclass when no table uses it anymore.'''
+    users = _row_viewclass_users.get(viewclass)
+    if users is None:
+        return
+
+    if users > 1:
+        _row_viewclass_users[viewclass] = users - 1
+    else:
+        del _row_viewclass_users[viewclass]
+        Builder.unload_file(f'{viewclass}.kv')
+
+
 def get_cell_property_connection(cell_idx: int, cell_property: str, cell_property_type: int, offset: int) -> str:
     if cell_property_type == 'str':
         return ' ' * offset + f'{cell_property}: str(root.col_{cell_idx}_{cell_property}) if root.col_{cell_idx}_{cell_property} is not None else ""\n'
@@ -69,16 +166,20 @@ class GlowTableRow(GlowBoxLayout,
     index = NumericProperty(defaultvalue=None, allownone=True)
     selected = BooleanProperty(defaultvalue=False)
 
-    _clicked = False
     refreshing = False
+    _set_visible_event = None
 
     def __init__(self, *args, **kwargs) -> None:
+        # column index of the cell widgets created by the row, see _create_cell_widget
+        self._widget_cells = {}
         super().__init__(*args, **kwargs)
         self.size_hint_y = None
 
     def refresh_view_attrs(self, instance: GlowRecycleView, index: int, data: dict) -> None:
         ''' Catch and handle the view changes '''
-        self.opacity = 0
+        fixed_height = instance.layout_manager.fixed_height
+        if fixed_height is None:
+            self.opacity = 0
         self.refreshing = True
 
         self.idx = data['idx']
@@ -87,9 +188,18 @@ class GlowTableRow(GlowBoxLayout,
         self.bg_color = self.row_bg_color
         self.index = index
 
+        if fixed_height is not None:
+            # the layout gives the height, the row is not measured
+            if self._set_visible_event is not None:
+                self._set_visible_event.cancel()
+            self.height = fixed_height
+            self.opacity = 1
+            self.refreshing = False
+            return
+
         self.do_layout()
 
-        Clock.schedule_once(self._set_visible)
+        self._set_visible_event = Clock.schedule_once(self._set_visible)
 
     def _set_visible(self, *args) -> None:
         self.height = max(dp(56), self.minimum_height)
@@ -101,9 +211,8 @@ class GlowTableRow(GlowBoxLayout,
             return False
 
         if self.table.selectable and self.ids.row_checkbox.collide_point(*touch.pos) and not self.ids.row_checkbox.disabled:
-            self._clicked = True
             self.ids.row_checkbox.on_touch_down(touch)
-            self.parent.select_with_touch(self.index, touch)
+            self.table._on_row_checkbox(self)
             self.table.dispatch('on_row_selected', self)
             return True
 
@@ -121,12 +230,8 @@ class GlowTableRow(GlowBoxLayout,
 
     def apply_selection(self, instance: GlowRecycleView, index: int, is_selected: bool) -> None:
         self.selected = is_selected
-        if not self._clicked and 'row_checkbox' in self.ids:
-            self.ids.row_checkbox.active = self.selected
-        else:
-            self.table._selected_rows[self.idx] = is_selected
-
-        self._clicked = False
+        if 'row_checkbox' in self.ids:
+            self.ids.row_checkbox.active = is_selected
 
     def on_enter(self) -> None:
         self.bg_color = self.hover_row_bg_color
@@ -134,9 +239,296 @@ class GlowTableRow(GlowBoxLayout,
     def on_leave(self) -> None:
         self.bg_color = self.row_bg_color
 
+    def _create_cell_widget(self, viewclass: str) -> Widget:
+        '''Cell widget created outside of the kv rule of the row. It displays
+        and changes the properties of the column given by :attr:`_widget_cells`.
+        '''
+        cell_viewclass = getattr(table_cells, viewclass)
+        widget = cell_viewclass(size_hint=(None, None))
+        if not cell_viewclass.use_wrapper:
+            widget.adaptive_height = True
+
+        for cell_property, cell_property_type in cell_viewclass.allowed_properties:
+            if cell_property_type == 'function':
+                event = cell_property if widget.property(cell_property[3:], quiet=True) is None else cell_property[3:]
+                widget.bind(**{event: partial(self._on_cell_event, cell_property)})
+
+        # the value changed by the widget is kept by the row, like by a widget cell
+        widget.bind(**{cell_viewclass.value_property[0]: partial(self._on_cell_value, cell_viewclass.value_property[0])})
+        return widget
+
+    def _get_cell_properties(self, cell_idx: int, properties: Sequence[str]) -> dict:
+        '''Properties of a cell kept by the row, None when not set. Events are
+        left out, see :meth:`_on_cell_event`.
+        '''
+        property_types = self.table._cell_property_types[cell_idx]
+        return {
+            cell_property: getattr(self, f'col_{cell_idx}_{cell_property}', None)
+            for cell_property in properties
+            if property_types.get(cell_property) != 'function'
+        }
+
+    def _apply_cell_properties(self, widget: Widget, cell_idx: int, properties: Sequence[str]) -> None:
+        # unset properties get the placeholder of their type, like in the kv rule of a widget cell
+        property_types = self.table._cell_property_types[cell_idx]
+        for cell_property, value in self._get_cell_properties(cell_idx, properties).items():
+            if value is None:
+                value = PLACEHOLDER_VALUES.get(property_types.get(cell_property))
+            setattr(widget, cell_property, value)
+
+    def _on_cell_event(self, cell_property: str, widget: Widget, *args) -> None:
+        cell_idx = self._widget_cells.get(widget)
+        function = getattr(self, f'col_{cell_idx}_{cell_property}', None) if cell_idx is not None else None
+        if function is not None and not self.refreshing:
+            function(self.table, widget)
+
+    def _on_cell_value(self, value_property: str, widget: Widget, value: Any) -> None:
+        cell_idx = self._widget_cells.get(widget)
+        if cell_idx is not None:
+            setattr(self, f'col_{cell_idx}_{value_property}', value)
+
+
+class GlowFastTableRow(GlowTableRow):
+    '''Row of a table with :attr:`GlowTable.fast_cells`.
+
+    Label and icon cells are drawn into the canvas of the row with cached
+    textures, the cells are empty widgets only giving their place.
+    Interactive cells are drawn the same way until the row is hovered or
+    touched, then they become widgets, in one row at a time.
+    '''
 
-class SelectableRecycleBoxLayout(LayoutSelectionBehavior, GlowRecycleBoxLayout):
-    pass
+    table = None
+
+    # row showing the widgets of its interactive cells
+    _active_row = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._cell_widgets = {}
+        self._cell_widgets_shown = False
+        self._cell_rects = None
+        self._translate = Translate()
+        self._redraw_trigger = Clock.create_trigger(lambda _: self.redraw_cells(), -1)
+        self._layout_trigger = Clock.create_trigger(lambda _: self._update_cells_layout(), -1)
+        super().__init__(*args, **kwargs)
+
+        self._painter = CellPainter(self.theme_cls)
+        self.canvas.after.add(PushMatrix())
+        self.canvas.after.add(self._translate)
+        self.canvas.after.add(self._painter.group)
+        self.canvas.after.add(PopMatrix())
+
+    def on_kv_post(self, base_widget: Widget) -> None:
+        super().on_kv_post(base_widget)
+        for widget_id, widget in self.ids.items():
+            if widget_id.startswith('col_'):
+                widget.bind(pos=lambda *_: self._layout_trigger(), size=lambda *_: self._layout_trigger())
+
+    def refresh_view_attrs(self, instance: GlowRecycleView, index: int, data: dict) -> None:
+        super().refresh_view_attrs(instance, index, data)
+        if self._cell_widgets_shown:
+            for cell_idx, _, properties, _ in self.table._fast_columns:
+                if cell_idx in self._cell_widgets:
+                    self._apply_cell_properties(self._cell_widgets[cell_idx], cell_idx, properties)
+        self.redraw_cells()
+
+    def redraw_cells(self) -> None:
+        '''Draw the cells again, after their properties changed.'''
+        self._redraw_trigger.cancel()
+        self._painter.clear()
+        if self.table is None:
+            return
+
+        self._cell_rects = self.__get_cell_rects()
+        for cell_idx, kind, properties, viewclass in self.table._fast_columns:
+            if viewclass is not None and self._cell_widgets_shown:
+                continue
+            pos, size = self._cell_rects[cell_idx]
+            self._painter.draw(kind, self._get_cell_properties(cell_idx, properties), pos, size)
+
+    def _update_cells_layout(self) -> None:
+        # moving the row only moves the drawn cells
+        self._translate.xy = self.pos
+        if self.table is not None and self.__get_cell_rects() != self._cell_rects:
+            self._redraw_trigger()
+
+    def __get_cell_rects(self) -> dict[int, tuple]:
+        '''Place of the cells, relative to the row.'''
+        rects = {}
+        for cell_idx, _, _, _ in self.table._fast_columns:
+            cell = self.ids[f'col_{cell_idx}']
+            rects[cell_idx] = ((cell.x - self.x, cell.y - self.y), tuple(cell.size))
+        return rects
+
+    def show_cell_widgets(self) -> None:
+        '''Replace the drawn interactive cells by their widgets.'''
+        if self._cell_widgets_shown or self.table is None:
+            return
+
+        active_row = GlowFastTableRow._active_row and GlowFastTableRow._active_row()
+        if active_row is not None:
+            active_row.hide_cell_widgets()
+        GlowFastTableRow._active_row = weakref.ref(self)
+
+        self._cell_widgets_shown = True
+        for cell_idx, _, properties, viewclass in self.table._fast_columns:
+            if viewclass is None:
+                continue
+
+            widget = self._cell_widgets.get(cell_idx)
+            if widget is None:
+                widget = self._cell_widgets[cell_idx] = self._create_cell_widget(viewclass)
+                self._widget_cells[widget] = cell_idx
+                self.__place_cell_widget(self.ids[f'col_{cell_idx}'], widget)
+            self._apply_cell_properties(widget, cell_idx, properties)
+            self.ids[f'col_{cell_idx}'].add_widget(widget)
+        self.redraw_cells()
+
+    def hide_cell_widgets(self) -> None:
+        '''Draw the interactive cells again instead of their widgets.'''
+        if not self._cell_widgets_shown:
+            return
+
+        self._cell_widgets_shown = False
+        for widget in self._cell_widgets.values():
+            if widget.parent is not None:
+                widget.parent.remove_widget(widget)
+        self.redraw_cells()
+
+    def __place_cell_widget(self, cell: Widget, widget: Widget) -> None:
+        def place(*args) -> None:
+            if widget.use_wrapper:
+                widget.center = cell.center
+            else:
+                widget.width = cell.width
+                widget.x = cell.x
+                widget.center_y = cell.center_y
+
+        cell.bind(pos=place, size=place)
+        widget.bind(size=place)
+        place()
+
+    def on_touch_down(self, touch: MotionEvent) -> bool:
+        if self.collide_point(touch.x, touch.y):
+            self.show_cell_widgets()
+        return super().on_touch_down(touch)
+
+    def on_enter(self) -> None:
+        super().on_enter()
+        self.show_cell_widgets()
+
+    def on_theme_style(self, theme_manager: ThemeManager, theme_style: str) -> None:
+        '''Fired when the app :attr:`theme_style` value changes.'''
+        super().on_theme_style(theme_manager, theme_style)
+        self._redraw_trigger()
+
+
+class GlowVirtualTableRow(GlowTableRow):
+    '''Row of a table with :attr:`GlowTable.virtual_columns`.
+
+    Only the cells of the columns in the horizontal viewport of the table are
+    widgets, placed like the header of their column. The widgets of the
+    columns scrolled out of the viewport are reused for the columns scrolled in.
+    '''
+
+    table = None
+
+    def __init__(self, *args, **kwargs) -> None:
+        # displayed widgets by column index, unused widgets by viewclass
+        self._cell_widgets = {}
+        self._free_widgets = {}
+        super().__init__(*args, **kwargs)
+
+    def on_kv_post(self, base_widget: Widget) -> None:
+        super().on_kv_post(base_widget)
+        self.ids.row_cells.bind(height=lambda *_: self.place_cell_widgets())
+
+    def refresh_view_attrs(self, instance: GlowRecycleView, index: int, data: dict) -> None:
+        super().refresh_view_attrs(instance, index, data)
+        virtual_columns = self.table._virtual_columns
+        for cell_idx, widget in self._cell_widgets.items():
+            self._apply_cell_properties(widget, cell_idx, virtual_columns[cell_idx][1])
+        self.update_columns()
+
+    def update_columns(self) -> None:
+        '''Display the cells of the visible columns of the table.'''
+        if self.table is None:
+            return
+
+        table = self.table
+        visible_columns = table._visible_columns
+        cells = self.ids.row_cells
+        for cell_idx in [cell_idx for cell_idx in self._cell_widgets if cell_idx not in visible_columns]:
+            widget = self._cell_widgets.pop(cell_idx)
+            del self._widget_cells[widget]
+            cells.remove_widget(widget)
+            self._free_widgets.setdefault(type(widget).__name__, []).append(widget)
+
+        for cell_idx in visible_columns:
+            if cell_idx in self._cell_widgets:
+                continue
+
+            viewclass, properties = table._virtual_columns[cell_idx]
+            free_widgets = self._free_widgets.get(viewclass)
+            if free_widgets:
+                widget = free_widgets.pop()
+            else:
+                widget = self._create_cell_widget(viewclass)
+                widget.bind(size=self.__on_cell_widget_size)
+            self._cell_widgets[cell_idx] = widget
+            self._widget_cells[widget] = cell_idx
+            self._apply_cell_properties(widget, cell_idx, properties)
+            cells.add_widget(widget)
+
+        self.place_cell_widgets()
+
+    def place_cell_widgets(self) -> None:
+        '''Place the cells like the header of their column.'''
+        for cell_idx, widget in self._cell_widgets.items():
+            self.__place_cell_widget(cell_idx, widget)
+
+    def __place_cell_widget(self, cell_idx: int, widget: Widget) -> None:
+        column_rects = self.table._column_rects
+        if cell_idx >= len(column_rects):
+            return
+
+        # relative to the first column, like the cells container
+        x, width = column_rects[cell_idx]
+        if widget.use_wrapper:
+            widget.center_x = x + width / 2
+        else:
+            widget.width = width
+            widget.x = x
+        widget.center_y = self.ids.row_cells.height / 2
+
+    def __on_cell_widget_size(self, widget: Widget, size: list) -> None:
+        cell_idx = self._widget_cells.get(widget)
+        if cell_idx is not None:
+            self.__place_cell_widget(cell_idx, widget)
+
+
+class GlowTableGroupRow(GlowBoxLayout,
+                        RecycleDataViewBehavior):
+    '''Header of a group of rows of a table with :attr:`GlowTable.group_by`,
+    a touch collapses or expands the group.
+    '''
+
+    key = ObjectProperty(defaultvalue=None, allownone=True)
+    text = StringProperty(defaultvalue='')
+    aggregates_text = StringProperty(defaultvalue='')
+    expanded = BooleanProperty(defaultvalue=True)
+
+    table = None
+
+    def on_touch_down(self, touch: MotionEvent) -> bool:
+        if not self.collide_point(touch.x, touch.y):
+            return False
+
+        if self.table is not None:
+            self.table.toggle_group(self.key)
+        return True
+
+    def apply_selection(self, instance: GlowRecycleView, index: int, is_selected: bool) -> None:
+        pass
 
 
 class GlowTable(GlowBoxLayout):
@@ -147,6 +539,13 @@ class GlowTable(GlowBoxLayout):
 
     rows_per_page = NumericProperty(defaultvalue=10)
 
+    row_height = NumericProperty(defaultvalue=None, allownone=True)
+    '''
+        Height of every row. Rows are then not measured when they are displayed,
+        scrolling only rebinds their data. Cells must fit in it.
+        Rows of a data_provider have the default height of 56dp when it is None.
+    '''
+
     columns_info = ListProperty()
     '''
         columns_info = [
@@ -158,14 +557,70 @@ class GlowTable(GlowBoxLayout):
              'viewclass': 'GlowLabelCell',
              'properties': ['text'],
              'constant_properties': {'color': '#FFFFFF'},
+             'sortable': False,
+             'sort_key': None,
              'sorting_function': None,
+             'searchable': True,
+             'aggregate': None,
+             'aggregate_format': None,
             },
         ]
+
+        A click on the header of a 'sortable' column sorts the rows by its values,
+        transformed by 'sort_key' if given, see sort_by.
+        'sorting_function(rows)' returns the (sorted indices, sorted rows) of the rows instead.
+        The values of 'searchable' columns are matched by search_text.
+        'aggregate' shows the 'sum', 'count', 'mean', 'min' or 'max' of the values of the
+        column in a footer, or reducer(values) for a function, or a TableAggregate.
+        They are updated with the changed rows only, over all the rows, filtered or not.
+        'aggregate_format' is a format string like '{:.2f}' or a function(value) -> str.
     '''
     table_data = ListProperty()
+    '''
+        Rows of the table, a list of cells per row.
+
+        The rows are copied into the table storage: the rows changed by
+        insert_rows, append_rows, update_cells, delete_rows, move_rows,
+        load_columns or load_data are not written back to table_data. They are
+        kept when columns_info changes, and replaced when table_data is set
+        or update_table_data is called.
+    '''
+
+    data_provider = ObjectProperty(defaultvalue=None, allownone=True)
+    '''
+        Lazy data source used instead of table_data, see TableDataProvider.
+        Only the displayed rows are fetched, by blocks, and rows have a fixed height.
+        Columns with 'sortable': True in columns_info are sorted by the provider.
+    '''
 
     use_pagination = BooleanProperty(defaultvalue=False)
 
+    search_text = StringProperty(defaultvalue='')
+    '''
+        Only display the rows with words starting with each word of the text,
+        in their 'searchable' columns. Bind it to the text of an input.
+        Changes are applied after filter_delay. Not supported with a data_provider.
+    '''
+
+    max_rows = NumericProperty(defaultvalue=None, allownone=True)
+    '''
+        Maximum number of rows kept by append_rows, the oldest rows are dropped
+        when new rows are appended. Dropping rows costs O(dropped rows), so
+        the table can display an endless stream of rows, e.g. logs.
+    '''
+
+    auto_scroll = BooleanProperty(defaultvalue=False)
+    '''
+        Scroll to the last row when append_rows adds rows while the last row
+        is displayed, so the table follows the stream until it is scrolled up.
+    '''
+
+    filter_delay = NumericProperty(defaultvalue=.3)
+    '''
+        Delay in seconds before search_text and set_filter changes are applied,
+        so that filtering does not run on every keystroke.
+    '''
+
     sorted_on = NumericProperty(defaultvalue=None, allownone=True)
     '''
         By which column is the input data sorted
@@ -177,6 +632,48 @@ class GlowTable(GlowBoxLayout):
         Use or not use checkboxes for rows.
     '''
 
+    fast_cells = BooleanProperty(defaultvalue=False)
+    '''
+        Draw the GlowLabelCell and GlowIconCell cells into the canvas of the rows
+        with cached textures instead of creating their widgets.
+        The interactive cells are drawn too, and become widgets when their row
+        is hovered or touched. Drawn cells only use the properties changing how
+        they look: text, icon, color, theme_color, font_style, font_name, font_size,
+        bold, italic, halign, icon_size, hidden and disabled.
+        Rows have a fixed height, row_height or 56dp.
+    '''
+
+    virtual_columns = BooleanProperty(defaultvalue=False)
+    '''
+        Only create the cells of the columns in the horizontal viewport, plus
+        virtual_columns_overscan columns on each side, for tables with many columns.
+        The cell widgets of the columns scrolled out are reused for the columns
+        scrolled in. Rows have a fixed height, row_height or 56dp.
+        fast_cells is not used with virtual_columns.
+    '''
+
+    virtual_columns_overscan = NumericProperty(defaultvalue=2)
+    '''
+        Number of columns created on each side of the horizontal viewport with
+        virtual_columns, so that they are ready before they are scrolled in.
+    '''
+
+    group_by = NumericProperty(defaultvalue=None, allownone=True)
+    '''
+        Index of the column whose values group the displayed rows. Each group has a
+        header showing its key, its number of rows and the values of the 'aggregate'
+        of the columns over its rows, a touch on it collapses or expands the group.
+        Groups are in the order of their first displayed row, so sorting by the
+        grouping column sorts the groups. Rows have a fixed height, row_height or 56dp.
+        Not supported with a data_provider.
+    '''
+
+    group_key = ObjectProperty(defaultvalue=None, allownone=True)
+    '''
+        Function(value) -> key of the group of a value of the group_by column,
+        the value itself by default. Keys must be hashable.
+    '''
+
     effect_cls = ObjectProperty(defaultvalue=ScrollEffect)
 
     header_color = ColorProperty(defaultvalue=None, allownone=True)
@@ -190,16 +687,63 @@ class GlowTable(GlowBoxLayout):
     _hover_row_color = ColorProperty(defaultvalue=(0, 0, 0, 0))
 
     _viewclass = StringProperty(defaultvalue='GlowTableRow')
+    _has_footer = BooleanProperty(defaultvalue=False)
     _cell_viewclasses = []
-    _formatted_table_data = []
-    _display_table_data = ListProperty()
-    _selected_rows = {}
-    _original_rows = {}
+    # {property: type} of the cells, by column index
+    _cell_property_types = []
+    # (column index, how it is drawn, properties, interactive viewclass) of the fast cells
+    _fast_columns = []
+    # (viewclass, properties) by column index, with virtual_columns
+    _virtual_columns = []
+    # (x, width) of the columns, relative to the first column
+    _column_rects = []
+    _visible_columns = range(0)
 
     def __init__(self, *args, **kwargs) -> None:
         self._header = None
+        self._footer = None
+        self._footer_labels = {}
         self.paginator = None
         self.table_checkbox = None
+        self._resetting_table_checkbox = False
+        self._release_viewclass = None
+
+        # selected stored rows
+        self._selection = SelectionModel()
+        self._last_checked_row = None
+
+        # rows are stored by column, the RecycleView data is built on demand
+        self._store = TableStore()
+        self._rows_view = TableRowsView(self._get_row_view_data)
+        self._data_model = TableDataModel(self._rows_view)
+        # displayed rows as indices of the stored rows, None when not sorted
+        self._sort_by = []
+        self._order = None
+        self._order_inverse = None
+        # filtered stored rows, None when they must be computed again
+        self._filters = {}
+        self._filter_matches = None
+        self._search_index = None
+        self._filter_trigger = Clock.create_trigger(lambda _: self.apply_filters(), self.filter_delay)
+        self._block_cache = None
+        self._provider_count = 0
+        self._placeholder_row_data = {}
+        # False once the stored rows were changed by the table, see table_data
+        self._rows_from_table_data = True
+        self._reload_trigger = Clock.create_trigger(lambda _: self.reload_data(), -1)
+        # rows of append_rows, added once per frame
+        self._pending_rows = []
+        self._append_trigger = Clock.create_trigger(lambda _: self.flush_rows())
+        self._load_job = None
+        self._export_job = None
+        # aggregates of the footer, by column
+        self._aggregates = TableAggregates(self._store, {})
+        self._footer_trigger = Clock.create_trigger(lambda _: self.__update_footer(), -1)
+        self._columns_trigger = Clock.create_trigger(lambda _: self.__update_visible_columns(), -1)
+        # (keys, group of each stored row) of the group_by column, displayed groups
+        self._group_index = None
+        self._groups = None
+        self._collapsed_groups = set()
 
         self.bind(header_color=self.setter('_header_color'))
         self.bind(odd_row_color=self.setter('_odd_row_color'))
@@ -210,13 +754,22 @@ class GlowTable(GlowBoxLayout):
         self.bind(_odd_row_color=lambda _, __: self._update_colors_trigger())
         self.bind(_even_row_color=lambda _, __: self._update_colors_trigger())
         self.bind(_hover_row_color=lambda _, __: self._update_colors_trigger())
+        self.bind(_header_color=lambda _, __: self._update_colors_trigger())
 
         self.bind(selectable=lambda _, __: self.__update_table_view())
+        self.bind(fast_cells=lambda _, __: self.__update_table_view())
+        self.bind(virtual_columns=lambda _, __: self.__update_table_view())
+        self.bind(virtual_columns_overscan=lambda _, __: self._columns_trigger())
 
         super().__init__(*args, **kwargs)
 
         self.register_event_type('on_row_press')
         self.register_event_type('on_row_selected')
+        self.register_event_type('on_load_progress')
+        self.register_event_type('on_load_finished')
+        self.register_event_type('on_export_progress')
+        self.register_event_type('on_export_finished')
+        self.register_event_type('on_export_cancelled')
 
         Clock.schedule_once(self.set_default_colors, -1)
         Clock.schedule_once(self.initialize_table, -1)
@@ -225,19 +778,21 @@ class GlowTable(GlowBoxLayout):
 
     @property
     def selected_rows(self) -> list[int]:
-        return [idx for idx, selected in self._selected_rows.items() if selected]
+        if self._order is None:
+            return list(self._selection)
+        return sorted(idx for idx in map(self._display_index, self._selection) if idx is not None)
 
     @property
     def selected_original_rows(self) -> list[int]:
-        return [self._original_rows[idx] for idx in self.selected_rows]
+        return list(self._selection)
 
     @property
     def selected_rows_data(self) -> list[dict]:
-        return [self.table_data[idx] for idx in self.selected_original_rows]
+        return self._get_rows(map(self._row_at, self.selected_rows))
 
     @property
     def selected_original_rows_data(self) -> list[dict]:
-        return [self.table_data[idx] for idx in self.selected_rows]
+        return self._get_rows(self.selected_original_rows)
 
     def set_default_colors(self, *args) -> None:
 
@@ -313,30 +868,38 @@ class GlowTable(GlowBoxLayout):
                           minimum_width=self._header.setter('size_hint_min_x'))
         self._header.bind(minimum_width=self.ids.glow_table_layout.setter('size_hint_min_x'))
 
+        self.ids.glow_table_view.bind(scroll_x=self.ids.glow_table_footer.setter('scroll_x'))
+
+        self.ids.glow_table_view.bind(scroll_x=lambda *_: self._columns_trigger(),
+                                      width=lambda *_: self._columns_trigger())
+        self.ids.glow_table_layout.bind(width=lambda *_: self._columns_trigger())
+        self.ids.glow_table_footer.add_widget(self._footer)
+        self._footer.bind(height=self.ids.glow_table_footer.setter('height'),
+                          minimum_width=self._footer.setter('size_hint_min_x'))
+
     def on_columns_info(self, instance: Self, value: list[dict]) -> None:
         self.__update_table_view()
 
     def on_sorted_order(self, instance: Self, value: str) -> None:
-        if self.selectable:
-            columns = self._header.children[::-1][1:]
-        else:
-            columns = self._header.children[::-1]
-
-        if self.sorted_order == 'ASC':
-            columns[self.sorted_on].icon = 'arrow-down'
-        else:
-            columns[self.sorted_on].icon = 'arrow-up'
+        self.__update_sort_icons()
 
     def on_sorted_on(self, instance: Self, value: int) -> None:
+        self.__update_sort_icons()
+
+    def __update_sort_icons(self) -> None:
+        if self._header is None:
+            return
+
         if self.selectable:
             columns = self._header.children[::-1][1:]
         else:
             columns = self._header.children[::-1]
 
-        if self.sorted_order == 'ASC':
-            columns[self.sorted_on].icon = 'arrow-down'
-        else:
-            columns[self.sorted_on].icon = 'arrow-up'
+        sort_by = self._sort_by or ([(self.sorted_on, self.sorted_order)] if self.sorted_on is not None else [])
+        sort_orders = dict(sort_by)
+        for column_idx, column in enumerate(columns):
+            sort_order = sort_orders.get(column_idx)
+            column.icon = 'blank' if sort_order is None else ('arrow-down' if sort_order == 'ASC' else 'arrow-up')
 
     def on_table_data(self, instance: Self, value: list) -> None:
         self.__update_table_data()
@@ -350,102 +913,524 @@ class GlowTable(GlowBoxLayout):
             items_per_page=self.rows_per_page,
             pos_hint={'right': 1} if self.pagination_pos == 'right' else ({'left': 0} if self.pagination_pos == 'left' else {'center_x': .5}),
             reset_page=False,
+            total_items=self._get_rows_count(),
         )
         self.paginator.bind(on_page_changed=self._update_display_table_data)
 
     def select_all(self, is_selected: bool) -> None:
+        '''Unselect or select the rows of the page, or all the displayed rows
+        without pagination.
         '''
-            Uncselect or select checkboxes on the entire page.
-            If update_selected_rows is False then only the visual representation will be produced
-              and when the page is refreshed all checkboxes will be returned back.
-        '''
-        if self.selectable and len(self._display_table_data):
-            rows = min(self.rows_per_page, len(self._formatted_table_data)) if self.use_pagination else len(self._formatted_table_data)
-
-            for idx in range(rows):
-                if is_selected:
-                    self.ids.glow_table_layout.select_node(idx)
-                else:
-                    self.ids.glow_table_layout.deselect_node(idx)
+        if not self.selectable:
+            return
+
+        view = self._rows_view
+        if self._groups is not None:
+            self._selection.select_many([self._order[idx] for idx in self.__get_page_rows()], is_selected)
+        elif self._order is not None:
+            self._selection.select_many(self._order[view.start:view.stop], is_selected)
+        elif view.start == 0 and view.stop >= self._selection.length:
+            self._selection.select_all(is_selected)
+        else:
+            self._selection.select_range(view.start, view.stop, is_selected)
+        self.ids.glow_table_layout.refresh_selection()
 
-                offset = 0
-                if self.use_pagination:
-                    offset = self.paginator.page * self.rows_per_page
+    def invert_selection(self) -> None:
+        '''Invert the selection of the rows of the page, or of all the
+        displayed rows without pagination.
+        '''
+        if not self.selectable:
+            return
 
-                self._selected_rows[idx + offset] = is_selected
+        view = self._rows_view
+        if self._order is None and view.start == 0 and view.stop >= self._selection.length:
+            self._selection.invert()
+        else:
+            for idx in self.__get_page_rows():
+                self._selection.toggle(self._row_at(idx))
+        self.ids.glow_table_layout.refresh_selection()
 
     def select_one(self, row_idx: int, is_selected: bool) -> None:
         '''Unselect or select checkbox on the list item.'''
-        same_page = True
-        if self.use_pagination:
-            same_page = self.paginator.page == (row_idx // self.rows_per_page)
-
-        if same_page:
-            if is_selected:
-                self.ids.glow_table_layout.select_node(row_idx)
-            else:
-                self.ids.glow_table_layout.deselect_node(row_idx)
-
-        self._selected_rows[row_idx] = is_selected
+        self._selection.select(self._row_at(row_idx), is_selected)
+        self.ids.glow_table_layout.refresh_selection()
 
     def select_items(self, table_rows_ids: list[int], is_selected: bool) -> None:
         '''Unselect or select checkbox on the list items.'''
-        for row_idx in table_rows_ids:
-            self.select_one(row_idx, is_selected)
+        self._selection.select_many(map(self._row_at, table_rows_ids), is_selected)
+        self.ids.glow_table_layout.refresh_selection()
+
+    def select_range(self, from_row_idx: int, to_row_idx: int, is_selected: bool = True) -> None:
+        '''Unselect or select the rows from `from_row_idx` to `to_row_idx`,
+        both included, like a shift click on a checkbox.
+        '''
+        start, stop = sorted((from_row_idx, to_row_idx))
+        if self._order is None:
+            self._selection.select_range(start, stop + 1, is_selected)
+        else:
+            self._selection.select_many(self._order[start:stop + 1], is_selected)
+        self.ids.glow_table_layout.refresh_selection()
+
+    def _on_row_checkbox(self, row: GlowTableRow) -> None:
+        is_selected = not row.selected
+        if 'shift' in Window.modifiers and self._last_checked_row is not None:
+            self.select_range(self._last_checked_row, row.idx, is_selected)
+        else:
+            self.select_one(row.idx, is_selected)
+        self._last_checked_row = row.idx
+
+    def _is_node_selected(self, index: int) -> bool:
+        row_idx = self._entry_row(self._rows_view.start + index)
+        return row_idx is not None and self._selection.is_selected(self._row_at(row_idx))
+
+    def _entry_row(self, entry_idx: int) -> int | None:
+        '''Displayed row of an entry of the RecycleView, None for a group header.'''
+        if self._groups is None:
+            return entry_idx
+        return self._groups.entry_at(entry_idx)[1]
+
+    def __get_page_rows(self) -> Iterable[int]:
+        '''Displayed rows of the page, or of the table without pagination.'''
+        view = self._rows_view
+        if self._groups is None:
+            return range(view.start, view.stop)
+        return [row_idx for row_idx in map(self._entry_row, range(view.start, view.stop)) if row_idx is not None]
 
     def update_table_data(self) -> None:
+        '''Load :attr:`table_data` again, e.g. after it was changed in place.'''
         self.__update_table_data(update_selected_rows=False)
 
+    def load_columns(self, columns: list) -> None:
+        '''Fill the table by columns instead of :attr:`table_data` rows, e.g.
+        from arrays: for each column either the values of its value property
+        or a dict of property: values. Call it after :attr:`columns_info` is set.
+        '''
+        self._store.load_columns(columns)
+        self._rows_from_table_data = False
+        self._group_index = None
+        self.__reload_aggregates()
+        self.__invalidate_filter()
+        self.__reset_selection()
+        self.__update_display()
+
+    def load_data(self, loader: TableLoader, infer_columns: bool = True, lazy: bool = False) -> None:
+        '''Replace the rows by the rows of a loader of
+        :mod:`kivy_glow.uix.table.loader`, e.g. a CSVLoader, read by chunks
+        in a worker thread. The rows are displayed as soon as their chunk is
+        read and the table can be used while loading continues,
+        `on_load_progress` is dispatched after each chunk.
+
+        :attr:`columns_info` is inferred from the names of the columns and the
+        first chunk, unless `infer_columns` is False. With `lazy` the loader
+        is bound as the :attr:`data_provider` instead, e.g. a SQLiteLoader.
+        '''
+        self.cancel_loading()
+        if lazy:
+            data_provider = loader.get_provider()
+            if infer_columns:
+                self.columns_info = infer_columns_info(data_provider.columns, data_provider.fetch(0, loader.chunk_size))
+            self.data_provider = data_provider
+            return
+
+        self.data_provider = None
+        self.table_data = []
+        # table_data may already be empty, the stored rows are cleared anyway
+        self.__update_table_data()
+        self._load_job = TableLoadJob(
+            loader,
+            on_columns=lambda _, columns_info: setattr(self, 'columns_info', columns_info) if infer_columns else None,
+            on_rows=self.__on_rows_loaded,
+            on_finished=self.__on_load_finished,
+        )
+        self._load_job.start()
+
+    def cancel_loading(self) -> None:
+        '''Stop :meth:`load_data`, the rows already loaded are kept.'''
+        if self._load_job is not None:
+            self._load_job.cancel()
+            self._load_job = None
+
+    def __on_rows_loaded(self, rows: list[Sequence], progress: float | None) -> None:
+        self.insert_rows(rows)
+        self.dispatch('on_load_progress', len(self._store), progress)
+
+    def __on_load_finished(self, error: Exception | None) -> None:
+        self._load_job = None
+        self.dispatch('on_load_finished', error)
+
+    def export_data(self, exporter: TableExporter, columns: Sequence[int] | None = None) -> None:
+        '''Write the displayed rows of all the pages, sorted, filtered and
+        grouped, to an exporter of :mod:`kivy_glow.uix.table.exporter`, e.g. a
+        CSVExporter, in a worker thread. `on_export_progress` is dispatched
+        after each chunk.
+
+        The order of the rows is taken when the export starts and the rows are
+        read by chunks, without copying the data. Rows appended meanwhile are
+        not exported, inserting, deleting or moving rows stops the export with
+        an error. `columns` are the indices of the exported columns, all of
+        them by default.
+        '''
+        if self.data_provider is not None:
+            raise GlowTableException('The rows of a data provider can not be exported by the table')
+
+        self.cancel_export()
+        columns = list(range(len(self.columns_info))) if columns is None else list(columns)
+        order = self._order
+        self._export_job = TableExportJob(
+            exporter,
+            names=[self.columns_info[column_idx].get('name', f'Column_{column_idx}') for column_idx in columns],
+            count=len(order) if order is not None else len(self._store),
+            read_rows=partial(self.__read_export_rows, order, columns, self._store.version),
+            on_progress=lambda exported_rows, progress: self.dispatch('on_export_progress', exported_rows, progress),
+            on_finished=self.__on_export_finished,
+        )
+        self._export_job.start()
+
+    def cancel_export(self) -> None:
+        '''Stop :meth:`export_data`, the incomplete file is removed.'''
+        if self._export_job is not None:
+            self._export_job.cancel()
+            self._export_job = None
+            self.dispatch('on_export_cancelled')
+
+    def __read_export_rows(self, order: Sequence[int] | None, columns: list[int], version: int,
+                           start: int, stop: int) -> list[tuple]:
+        store = self._store
+        if store.version != version:
+            raise GlowTableException('The rows were inserted, deleted or moved during the export')
+
+        row_indices = order[start:stop] if order is not None else range(start, stop)
+        # rows are read by column
+        return list(zip(*(
+            [values[row_idx] for row_idx in row_indices]
+            for values in map(store.get_column, columns)
+        )))
+
+    def __on_export_finished(self, error: Exception | None) -> None:
+        self._export_job = None
+        self.dispatch('on_export_finished', error)
+
+    def reload_data(self) -> None:
+        '''Reload the rows of the :attr:`data_provider`, e.g. after its data or
+        its filter changed.
+        '''
+        if self.data_provider is None:
+            return
+
+        self._provider_count = self.data_provider.count()
+        self._block_cache.reset(self._provider_count)
+        self.__reset_selection()
+        self.__update_display()
+
+    def on_data_provider(self, instance: Self, data_provider: TableDataProvider | None) -> None:
+        if self._block_cache is not None:
+            self._block_cache.close()
+            self._block_cache = None
+
+        if data_provider is not None:
+            self._block_cache = TableBlockCache(data_provider, self._on_provider_rows_loaded)
+        else:
+            self._provider_count = 0
+        # after the kv rules are applied
+        self._reload_trigger()
+
     def __on_click_column(self, instance: Self, column: int) -> None:
-        sorting_function = self.columns_info[column].get('sorting_function', None)
+        column_info = self.columns_info[column]
+        if not column_info.get('sortable', False) and (column_info.get('sorting_function') is None or self.data_provider is not None):
+            return
 
-        if sorting_function is not None:
-            if self.sorted_on == column:
-                if self.sorted_order == 'ASC':
-                    self.sorted_order = 'DSC'
-                else:
-                    self.sorted_order = 'ASC'
-            else:
-                self.sorted_order = 'ASC'
+        if self.sorted_on == column and len(self._sort_by) <= 1:
+            sorted_order = 'DSC' if self.sorted_order == 'ASC' else 'ASC'
+        else:
+            sorted_order = 'ASC'
+        self.sort_by([(column, sorted_order)])
 
-            for child in self._header.children:
-                child.icon = 'blank'
+    def sort_by(self, sort_by: list[tuple[int, str]] | None) -> None:
+        '''Sort the rows by columns, `(column index, 'ASC' | 'DSC')` pairs by
+        priority, or restore the order of the data with None.
 
-            self.sorted_on = column
+        The sort is stable and the orders are cached until the sorted columns
+        change, so sorting again by the same columns is free and the row data
+        is never copied. A :attr:`data_provider` is sorted by the first column.
+        '''
+        sort_by = [(column, sorted_order) for column, sorted_order in (sort_by or [])]
+        self._sort_by = sort_by
+        if sort_by:
+            self.sorted_order = sort_by[0][1]
+            self.sorted_on = sort_by[0][0]
+        else:
+            self.sorted_on = None
+        self.__update_sort_icons()
 
-            new_table_indices, new_table_data = sorting_function(self.table_data[:])
+        if self.data_provider is not None:
+            self.data_provider.sort(*(sort_by[0] if sort_by else (None, )))
+            self.reload_data()
+            return
 
-            rows = self.rows_per_page if self.use_pagination else len(self._formatted_table_data)
-            for idx in range(rows):
-                self.ids.glow_table_layout.deselect_node(idx)
+        self.__update_display()
 
-            if self.sorted_order == 'ASC':
-                instance.icon = 'arrow-down'
-            else:
-                instance.icon = 'arrow-up'
-                new_table_data = new_table_data[::-1]
-                new_table_indices = new_table_indices[::-1]
+    def set_filter(self, column: int, predicate: Callable[[Any], bool] | Any | None) -> None:
+        '''Only display the rows for which `predicate(value)` is True, value
+        being the value property of the column. None removes the filter.
 
-            new_selected_rows = {}
-            new_original_rows = {}
-            for new_idx, old_idx in enumerate(new_table_indices):
-                new_selected_rows[new_idx] = self._selected_rows[old_idx]
-                new_original_rows[new_idx] = self._original_rows[old_idx]
+        With a :attr:`data_provider` the filters are given to
+        :meth:`TableDataProvider.filter` instead: a value or (operator, value).
+        '''
+        if predicate is None:
+            self._filters.pop(column, None)
+        else:
+            self._filters[column] = predicate
+        self._filter_trigger()
 
-            self.table_data = new_table_data
+    def clear_filters(self) -> None:
+        '''Remove the column filters and the search.'''
+        self._filters.clear()
+        self.search_text = ''
+        self._filter_trigger()
 
-            self._selected_rows = new_selected_rows
-            self._original_rows = new_original_rows
+    def apply_filters(self) -> None:
+        '''Apply the filter changes now instead of after :attr:`filter_delay`.
 
-            if self.use_pagination:
-                self._update_display_table_data(self.paginator, self.paginator.page)
+        Filtering displays a subset of the stored rows, their data and the
+        selection are not changed.
+        '''
+        self._filter_trigger.cancel()
+        if self.data_provider is not None:
+            self.data_provider.filter(dict(self._filters) or None)
+            self.reload_data()
+            return
+
+        self._filter_matches = None
+        self.__update_display()
+
+    def on_search_text(self, instance: Self, search_text: str) -> None:
+        self._filter_trigger()
+
+    def on_filter_delay(self, instance: Self, filter_delay: float) -> None:
+        self._filter_trigger.timeout = filter_delay
+
+    def __is_filtered(self) -> bool:
+        return bool(self._filters) or bool(self.search_text.strip())
+
+    def __get_filter_matches(self) -> set[int]:
+        store = self._store
+        rows = None
+
+        search_text = self.search_text.strip()
+        if search_text:
+            if self._search_index is None:
+                self._search_index = TableSearchIndex(store, (
+                    column_idx for column_idx, column_info in enumerate(self.columns_info)
+                    if column_info.get('searchable', True)
+                ))
+            rows = self._search_index.search(search_text)
+
+        for column_idx, predicate in self._filters.items():
+            values = store.get_column(column_idx)
+            if rows is None:
+                rows = {row_idx for row_idx, value in enumerate(values) if predicate(value)}
             else:
-                for idx, selected in self._selected_rows.items():
-                    if selected:
-                        self.ids.glow_table_layout.select_node(idx)
+                rows = {row_idx for row_idx in rows if predicate(values[row_idx])}
+
+        return rows if rows is not None else set(range(len(store)))
+
+    def __invalidate_filter(self, search_index: bool = True) -> None:
+        '''Compute the filtered rows again, after stored rows shifted.'''
+        self._filter_matches = None
+        if search_index and self._search_index is not None:
+            self._search_index.invalidate()
+
+    def __update_order(self) -> None:
+        self._order_inverse = None
+        self._groups = None
+        if self.data_provider is not None:
+            self._order = None
+            return
+
+        order = self.__get_sort_order() if self._sort_by else None
+        if self.__is_filtered():
+            if self._filter_matches is None:
+                self._filter_matches = self.__get_filter_matches()
+            matches = self._filter_matches
+            order = sorted(matches) if order is None else [row_idx for row_idx in order if row_idx in matches]
+
+        self._order = order
+        if self.group_by is not None:
+            self.__group_order()
+
+    def __group_order(self) -> None:
+        '''Display the rows of each group together, in their displayed order.'''
+        if self._group_index is None:
+            self._group_index = index_groups(self._store.get_column(int(self.group_by)), self.group_key)
+        keys, group_of = self._group_index
+
+        rows = [[] for _ in keys]
+        displayed_groups = []
+        for row_idx in (self._order if self._order is not None else range(len(self._store))):
+            group_rows = rows[group_of[row_idx]]
+            if not group_rows:
+                displayed_groups.append(group_of[row_idx])
+            group_rows.append(row_idx)
+
+        self._order = [row_idx for group in displayed_groups for row_idx in rows[group]]
+        self._groups = TableGroups(
+            [keys[group] for group in displayed_groups],
+            [len(rows[group]) for group in displayed_groups],
+            self._collapsed_groups,
+        )
+
+    def on_group_by(self, instance: Self, group_by: int | None) -> None:
+        self._group_index = None
+        self._collapsed_groups.clear()
+        if self.ids:
+            self.__update_display()
+
+    def on_group_key(self, instance: Self, group_key: Callable[[Any], Any] | None) -> None:
+        self.on_group_by(self, self.group_by)
+
+    def get_groups(self) -> list[tuple[Any, int]]:
+        '''(key, number of displayed rows) of the displayed groups.'''
+        if self._groups is None:
+            return []
+        return list(zip(self._groups.keys, self._groups.sizes))
+
+    def collapse_group(self, key: Any) -> None:
+        '''Hide the rows of a group, only the entries after its header move.'''
+        self.__set_group_collapsed(key, True)
+
+    def expand_group(self, key: Any) -> None:
+        self.__set_group_collapsed(key, False)
+
+    def toggle_group(self, key: Any) -> None:
+        groups = self._groups
+        group_idx = groups.index(key) if groups is not None else None
+        if group_idx is not None:
+            self.__set_group_collapsed(key, not groups.is_collapsed(group_idx))
+
+    def collapse_all_groups(self) -> None:
+        self.__set_all_groups_collapsed(True)
+
+    def expand_all_groups(self) -> None:
+        self.__set_all_groups_collapsed(False)
+
+    def __set_group_collapsed(self, key: Any, collapsed: bool) -> None:
+        groups = self._groups
+        group_idx = groups.index(key) if groups is not None else None
+        if group_idx is None:
+            return
+
+        entries = groups.set_collapsed(group_idx, collapsed)
+        if entries is None:
+            return
+        if self.use_pagination:
+            self.__update_entries()
+            return
+
+        self._rows_view.set_range(0, len(groups))
+        if collapsed:
+            self._data_model.refresh(removed=entries)
+        else:
+            # RecycleView data has no inserted slice, rows have a fixed height
+            # so the layout does not depend on the number of entries
+            self._data_model.refresh()
+        self.ids.glow_table_layout.refresh_selection()
+
+    def __set_all_groups_collapsed(self, collapsed: bool) -> None:
+        if self._groups is None:
+            return
+
+        self._groups.set_all_collapsed(collapsed)
+        self.__update_entries()
+
+    def get_group_aggregates(self, key: Any) -> dict[int, Any]:
+        '''Values of the 'aggregate' of the columns over the displayed rows of
+        a group, by column index.
+        '''
+        groups = self._groups
+        group_idx = groups.index(key) if groups is not None else None
+        if group_idx is None:
+            return {}
+
+        values = groups.aggregates.get(group_idx)
+        if values is None:
+            start = groups.starts[group_idx]
+            rows = self._order[start:start + groups.sizes[group_idx]]
+            values = groups.aggregates[group_idx] = {}
+            for column_idx, column_info in enumerate(self.columns_info):
+                if column_info.get('aggregate') is None:
+                    continue
+                column = self._store.get_column(column_idx)
+                column_values = list(filter(is_not_none, map(column.__getitem__, rows)))
+                values[column_idx] = compute_aggregate(column_info['aggregate'], column_values)
+        return values
+
+    def __get_group_view_data(self, group_idx: int) -> dict:
+        groups = self._groups
+        key = groups.keys[group_idx]
+        aggregates_text = '   '.join(
+            f'{self.columns_info[column_idx].get("name", f"Column_{column_idx}")}: {self.__format_aggregate(column_idx, value)}'
+            for column_idx, value in self.get_group_aggregates(key).items()
+        )
+        return {
+            'viewclass': 'GlowTableGroupRow',
+            'key': key,
+            'text': f'{key} ({groups.sizes[group_idx]})',
+            'aggregates_text': aggregates_text,
+            'expanded': not groups.is_collapsed(group_idx),
+            'bg_color': self._header_color,
+            'table': self,
+        }
+
+    def __get_sort_order(self) -> list[int]:
+        store = self._store
+        column, _ = self._sort_by[0]
+        sorting_function = self.columns_info[column].get('sorting_function')
+        if len(self._sort_by) == 1 and sorting_function is not None:
+            ascending = ((column, 'ASC'), )
+            if not store.has_order(ascending):
+                indices, _ = sorting_function([store.get_row(row_idx) for row_idx in range(len(store))])
+                indices = list(indices)
+                store.set_order(ascending, indices)
+                # the order of a sorting function is only reversed
+                store.set_order(((column, 'DSC'), ), indices[::-1])
+
+        sort_keys = {
+            column_idx: column_info['sort_key']
+            for column_idx, column_info in enumerate(self.columns_info)
+            if column_info.get('sort_key') is not None
+        }
+        return store.get_order(self._sort_by, sort_keys)
+
+    def _row_at(self, idx: int) -> int:
+        '''Index of the stored row displayed at idx.'''
+        return self._order[idx] if self._order is not None else idx
+
+    def _display_index(self, row_idx: int) -> int | None:
+        '''Index where the stored row is displayed, None if it is filtered out.'''
+        if self._order is None:
+            return row_idx
+        if self._order_inverse is None:
+            inverse = [None] * len(self._store)
+            for idx, stored_idx in enumerate(self._order):
+                inverse[stored_idx] = idx
+            self._order_inverse = inverse
+        return self._order_inverse[row_idx]
+
+    def __check_movable(self) -> None:
+        '''Rows are moved by display index, which is their stored index
+        only when the table is not sorted, filtered nor grouped.
+        '''
+        if self._order is None:
+            return
+        if self.__is_filtered():
+            raise GlowTableException('Rows can not be moved while the table is filtered')
+        if self._groups is not None:
+            raise GlowTableException('Rows can not be moved while the table is grouped')
+        raise GlowTableException('Rows can not be moved while the table is sorted')
 
     def _on_click_table_checkbox(self, instance: GlowCheckbox, active: bool) -> None:
-        self.select_all(active)
+        if not self._resetting_table_checkbox:
+            self.select_all(active)
 
     def __update_table_view(self) -> None:
         if self._header is None:
@@ -460,9 +1445,24 @@ class GlowTable(GlowBoxLayout):
         else:
             self._header.clear_widgets()
 
+        if self._footer is None:
+            self._footer = GlowBoxLayout(
+                adaptive_height=True,
+                orientation='horizontal',
+                bg_color=self._header_color,
+                padding=['10dp'],
+                spacing='5dp',
+            )
+            self.bind(_header_color=self._footer.setter('bg_color'))
+        else:
+            self._footer.clear_widgets()
+        self._footer_labels = {}
+        aggregates = {}
+
         _cell_viewclasses = []
-        viewclass = f'GlowRow-{uuid.uuid4()}'
-        view_header = f'<{viewclass}@GlowTableRow>:\n'
+        _fast_columns = []
+        _virtual_columns = []
+        fast_cells = self.fast_cells and not self.virtual_columns
         view_body = ''
         view_properties = ''
 
@@ -479,6 +1479,10 @@ class GlowTable(GlowBoxLayout):
             self.table_checkbox.bind(active=self._on_click_table_checkbox)
             self._header.add_widget(self.table_checkbox)
 
+            footer_spacer = Widget(size_hint_x=None, width=self.table_checkbox.width)
+            self.table_checkbox.bind(width=footer_spacer.setter('width'))
+            self._footer.add_widget(footer_spacer)
+
         for cell_idx, cell in enumerate(self.columns_info):
             cell_viewclass_name = cell.get('viewclass', 'GlowLabelCell')
             column_name = cell.get('name', f'Column_{cell_idx}')
@@ -489,30 +1493,84 @@ class GlowTable(GlowBoxLayout):
             cell_max_width = cell.get('max_width', None)
             cell_width = cell.get('width', 100)
 
-            self._header.add_widget(
-                GlowButton(
-                    icon='blank' if self.sorted_on != cell_idx else ('arrow-down' if self.sorted_order == 'ASC' else 'arrow-up'),
-                    pos_hint={'center_y': .5, 'left': 0},
-                    text_color=self.theme_cls.text_color,
-                    icon_color=self.theme_cls.text_color,
-                    size_hint_min_x=cell_min_width,
-                    size_hint_max_x=cell_max_width,
-                    size_hint_x=cell_size_hint,
-                    adaptive_height=True,
-                    font_style='TitleM',
-                    width=cell_width,
-                    text=column_name,
-                    anchor_x='left',
-                    padding=(0, ),
-                    mode='text',
-                    on_press=lambda button, column=cell_idx: self.__on_click_column(button, column),
-                ),
+            header_button = GlowButton(
+                icon='blank' if self.sorted_on != cell_idx else ('arrow-down' if self.sorted_order == 'ASC' else 'arrow-up'),
+                pos_hint={'center_y': .5, 'left': 0},
+                text_color=self.theme_cls.text_color,
+                icon_color=self.theme_cls.text_color,
+                size_hint_min_x=cell_min_width,
+                size_hint_max_x=cell_max_width,
+                size_hint_x=cell_size_hint,
+                adaptive_height=True,
+                font_style='TitleM',
+                width=cell_width,
+                text=column_name,
+                anchor_x='left',
+                padding=(0, ),
+                mode='text',
+                on_press=lambda button, column=cell_idx: self.__on_click_column(button, column),
+            )
+            self._header.add_widget(header_button)
+            if self.virtual_columns:
+                # the header places the cells of the columns
+                header_button.bind(x=lambda *_: self._columns_trigger(), width=lambda *_: self._columns_trigger())
+
+            footer_label = GlowLabel(
+                pos_hint={'center_y': .5},
+                size_hint_min_x=cell_min_width,
+                size_hint_max_x=cell_max_width,
+                size_hint_x=cell_size_hint,
+                adaptive_height=True,
+                font_style='TitleS',
+                width=cell_width,
             )
+            self._footer.add_widget(footer_label)
+            if cell.get('aggregate') is not None:
+                aggregates[cell_idx] = create_aggregate(cell['aggregate'])
+                self._footer_labels[cell_idx] = footer_label
 
             cell_viewclass = getattr(table_cells, cell_viewclass_name)
             allowed_properties, property_types = zip(*cell_viewclass.allowed_properties)
 
             cell_id = f'col_{cell_idx}'
+            fast_kind = DRAWN_CELLS.get(cell_viewclass_name) or INTERACTIVE_CELLS.get(cell_viewclass_name)
+            is_fast = fast_cells and fast_kind is not None
+            if is_fast or self.virtual_columns:
+                if is_fast:
+                    # the row draws the cell in the place of an empty widget
+                    view_body += ' ' * 4 + 'Widget:\n'
+                    view_body += ' ' * 8 + f'id: {cell_id}\n'
+                    view_body += ' ' * 8 + f'size_hint_x: {cell_size_hint}\n'
+                    view_body += ' ' * 8 + f'size_hint_min_x: {cell_min_width}\n'
+                    view_body += ' ' * 8 + f'size_hint_max_x: {cell_max_width}\n'
+                    view_body += ' ' * 8 + f'width: {cell_width}\n'
+
+                # the row keeps the properties, its cell widgets are created by the row
+                row_properties = []
+                for cell_property in cell_properties:
+                    if cell_property == 'value':
+                        cell_property = cell_viewclass.value_property[0]
+                    elif cell_property not in allowed_properties:
+                        continue
+                    view_properties += ' ' * 4 + f'col_{cell_idx}_{cell_property}: None\n'
+                    row_properties.append(cell_property)
+
+                for cell_constant_property, cell_constant_property_value in cell_constant_properties.items():
+                    if cell_constant_property not in row_properties:
+                        view_properties += ' ' * 4 + f'col_{cell_idx}_{cell_constant_property}: {cell_constant_property_value}\n'
+                        row_properties.append(cell_constant_property)
+
+                self.columns_info[cell_idx]['properties'] = [cell_property for cell_property in cell_properties if cell_property in allowed_properties]
+                _cell_viewclasses.append((cell_viewclass_name, cell_viewclass.value_property[0], allowed_properties))
+                if is_fast:
+                    _fast_columns.append((
+                        cell_idx, fast_kind, tuple(row_properties),
+                        cell_viewclass_name if cell_viewclass_name in INTERACTIVE_CELLS else None,
+                    ))
+                else:
+                    _virtual_columns.append((cell_viewclass_name, tuple(row_properties)))
+                continue
+
             if cell_viewclass.use_wrapper:
                 view_body += ' ' * 4 + 'GlowBoxLayout:\n'
                 view_body += ' ' * 8 + 'use_wrapper: True\n'
@@ -568,98 +1626,451 @@ class GlowTable(GlowBoxLayout):
             if cell_viewclass.use_wrapper:
                 view_body += ' ' * 8 + 'GlowHSpacer\n'
 
-        self.view = view_header + view_properties + view_body
+        if self.virtual_columns:
+            # the cells are placed relative to the first column
+            view_body += ' ' * 4 + 'RelativeLayout:\n'
+            view_body += ' ' * 8 + 'id: row_cells\n'
 
-        Builder.load_string(self.view)
-        self._viewclass = f'{viewclass}'
+        # tables with the same columns share the row viewclass
+        if self.virtual_columns:
+            base_viewclass = 'GlowVirtualTableRow'
+        else:
+            base_viewclass = 'GlowFastTableRow' if fast_cells else 'GlowTableRow'
+        viewclass = acquire_row_viewclass(view_properties + view_body, base_viewclass)
+        self.view = f'<{viewclass}@{base_viewclass}>:\n' + view_properties + view_body
+
+        self._fast_columns = _fast_columns
+        self._virtual_columns = _virtual_columns
+        self._column_rects = []
+        self._visible_columns = range(0)
+        self._columns_trigger()
+        release_viewclass = self._release_viewclass
+        self._release_viewclass = weakref.finalize(self, release_row_viewclass, viewclass)
+        self._viewclass = viewclass
+        if release_viewclass is not None:
+            release_viewclass()
         self._cell_viewclasses = _cell_viewclasses
+        self._cell_property_types = [
+            dict(getattr(table_cells, viewclass_name).allowed_properties)
+            for viewclass_name, _, _ in _cell_viewclasses
+        ]
 
-    def __update_table_data(self, update_selected_rows: bool = True) -> None:
+        self._search_index = None
+        self._filter_matches = None
+        rows = None
+        if not self._rows_from_table_data and self.data_provider is None:
+            # the rows changed by the table are parsed again with the new columns
+            store = self._store
+            rows = [store.get_row(row_idx) for row_idx in range(len(store))]
+        self._store.set_schema([
+            (value_property, allowed_properties, column_info['properties'])
+            for (_, value_property, allowed_properties), column_info in zip(_cell_viewclasses, self.columns_info)
+        ])
+        self._aggregates = TableAggregates(self._store, aggregates)
+        self._has_footer = bool(aggregates)
+        self.__reload_aggregates()
+        # shown while the rows of a data provider are loading
+        self._placeholder_row_data = self._store.format_row(())
+        self._placeholder_row_data.update({
+            f'col_{cell_idx}_{getattr(table_cells, viewclass_name).value_property[0]}':
+                PLACEHOLDER_VALUES.get(getattr(table_cells, viewclass_name).value_property[1])
+            for cell_idx, (viewclass_name, _, _) in enumerate(_cell_viewclasses)
+        })
+        if self.data_provider is not None:
+            self._reload_trigger()
+        elif rows is not None:
+            self.__update_table_data(update_selected_rows=False, rows=rows)
+        elif self.table_data:
+            self.__update_table_data(update_selected_rows=False)
+
+    def __update_table_data(self, update_selected_rows: bool = True, rows: list | None = None) -> None:
+        self._store.load_rows(self.table_data if rows is None else rows)
+        self._rows_from_table_data = rows is None
+        self._group_index = None
+        self.__reload_aggregates()
+        self.__invalidate_filter()
         if update_selected_rows:
-            self.select_all(is_selected=False)
-            self._selected_rows = dict.fromkeys(range(len(self.table_data)), False)
-            self._original_rows = {i: i for i in range(len(self.table_data))}
-        formatted_table_data = []
-
-        for row_idx, row in enumerate(self.table_data):
-            formatted_row_data = {}
-            for cell_idx, cell_data in enumerate(row):
-                if isinstance(cell_data, dict):
-                    for key, value in cell_data.items():
-                        if key in self._cell_viewclasses[cell_idx][2]:
-                            formatted_row_data[f'col_{cell_idx}_{key}'] = value
-                elif isinstance(cell_data, (list, tuple)):
-                    for row_property, value in (zip(self.columns_info[cell_idx]['properties'], cell_data)):
-                        formatted_row_data[f'col_{cell_idx}_{row_property}'] = value
-                else:
-                    formatted_row_data[f'col_{cell_idx}_{self._cell_viewclasses[cell_idx][1]}'] = cell_data
+            self.__reset_selection()
+        else:
+            self._selection.resize(len(self._store))
+        self.__update_display()
 
-            formatted_row_data['idx'] = row_idx
-            if row_idx % 2 == 0:
-                formatted_row_data['row_bg_color'] = self._even_row_color
-            else:
-                formatted_row_data['row_bg_color'] = self._odd_row_color
+    def __reset_selection(self) -> None:
+        self._selection.reset(self._provider_count if self.data_provider is not None else len(self._store))
+        self._last_checked_row = None
+
+    def __update_display(self) -> None:
+        self.__update_row_height()
+        self.__update_order()
+        self.__update_entries()
 
-            formatted_row_data['hover_row_bg_color'] = self._hover_row_color
-            formatted_row_data['table'] = self
-            formatted_table_data.append(formatted_row_data)
+    def __update_entries(self) -> None:
+        '''Display the entries of the page, rows and group headers.'''
+        # group headers have their own viewclass
+        self.ids.glow_table_view.key_viewclass = 'viewclass' if self._groups is not None else None
 
-        self._formatted_table_data = formatted_table_data
         if self.use_pagination:
-            self.paginator.items = self._formatted_table_data
+            self.paginator.total_items = self.__get_entries_count()
             self._update_display_table_data(self.paginator, self.paginator.page)
         else:
-            self._display_table_data = self._formatted_table_data
+            self._rows_view.set_range(0, self.__get_entries_count())
+            self._data_model.refresh()
 
-    def update_table_row_data(self, row_idx: int, row_data: list) -> None:
-        formatted_row_data = {}
-        for cell_idx, cell_data in enumerate(row_data):
-            if isinstance(cell_data, dict):
-                for key, value in cell_data.items():
-                    if key in self._cell_viewclasses[cell_idx][2]:
-                        formatted_row_data[f'col_{cell_idx}_{key}'] = value
-            else:
-                formatted_row_data[f'col_{cell_idx}_{self._cell_viewclasses[cell_idx][1]}'] = cell_data
+    def __get_entries_count(self) -> int:
+        return len(self._groups) if self._groups is not None else self._get_rows_count()
+
+    def on_row_height(self, instance: Self, row_height: float | None) -> None:
+        if self.ids:
+            self.__update_row_height()
+
+    def __update_row_height(self) -> None:
+        layout = self.ids.glow_table_layout
+        if self.row_height is not None:
+            layout.fixed_height = self.row_height
+        else:
+            # rows of a data provider, with fast cells, virtual columns or groups all have the default height
+            fixed = self.data_provider is not None or self.fast_cells or self.virtual_columns or self.group_by is not None
+            layout.fixed_height = layout.default_height if fixed else None
+
+    def _get_rows_count(self) -> int:
+        '''Number of displayed rows, all pages included.'''
+        if self.data_provider is not None:
+            return self._provider_count
+        if self._order is not None:
+            return len(self._order)
+        return len(self._store)
+
+    def _get_rows(self, row_indices: Iterable[int]) -> list[list]:
+        if self.data_provider is not None:
+            # fetched by blocks, not one row at a time
+            return [list(row) if row is not None else [] for row in self._block_cache.get_rows(row_indices)]
+        return [self._store.get_row(row_idx) for row_idx in row_indices]
+
+    def _on_provider_rows_loaded(self, start: int, stop: int) -> None:
+        view = self._rows_view
+        start = max(start, view.start) - view.start
+        stop = min(stop, view.stop) - view.start
+        if start >= stop:
+            return
+
+        for index in range(start, stop):
+            view.invalidate(index)
+        self._data_model.refresh(modified=slice(start, stop))
+
+    def _get_row_view_data(self, entry_idx: int) -> dict:
+        row_idx = self._entry_row(entry_idx)
+        if row_idx is None:
+            return self.__get_group_view_data(self._groups.entry_at(entry_idx)[0])
+
+        if self.data_provider is not None:
+            row = self._block_cache.get_row(row_idx)
+            row_data = self._store.format_row(row) if row is not None else dict(self._placeholder_row_data)
+        else:
+            row_data = self._store.get_view_data(self._row_at(row_idx))
 
-        formatted_row_data['idx'] = row_idx
+        row_data['idx'] = row_idx
         if row_idx % 2 == 0:
-            formatted_row_data['row_bg_color'] = self._even_row_color
+            row_data['row_bg_color'] = self._even_row_color
+        else:
+            row_data['row_bg_color'] = self._odd_row_color
+
+        row_data['hover_row_bg_color'] = self._hover_row_color
+        row_data['table'] = self
+        if self._groups is not None:
+            row_data['viewclass'] = self._viewclass
+        return row_data
+
+    def update_table_row_data(self, row_idx: int, row_data: list) -> None:
+        self.__check_editable()
+        stored_idx = self._row_at(row_idx)
+        self._aggregates.remove_rows((stored_idx, ))
+        self._store.set_row(stored_idx, row_data)
+        self._group_index = None
+        self._aggregates.add_rows((stored_idx, ))
+        self._footer_trigger()
+        self.__update_search_index((row_idx, ))
+        self.__invalidate_filter(search_index=False)
+        self.__refresh_rows((row_idx, ))
+
+    def update_cells(self, cells: dict[tuple[int, int], Any]) -> None:
+        '''Update cells: {(row index, column index): cell}, with cells given
+        like in :attr:`table_data`. A dict cell only changes its properties.
+        '''
+        self.__check_editable()
+        stored_indices = {self._row_at(row_idx) for row_idx, _ in cells}
+        self._aggregates.remove_rows(stored_indices)
+        for (row_idx, column_idx), cell in cells.items():
+            self._store.set_cell(self._row_at(row_idx), column_idx, cell)
+        if self.group_by is not None and any(column_idx == self.group_by for _, column_idx in cells):
+            self._group_index = None
+        self._aggregates.add_rows(stored_indices)
+        self._footer_trigger()
+        # the displayed rows stay in place until the next sort or filter
+        self.__update_search_index(row_idx for row_idx, _ in cells)
+        if any(column_idx in self._filters or self.columns_info[column_idx].get('searchable', True) for _, column_idx in cells):
+            self.__invalidate_filter(search_index=False)
+        self.__refresh_rows(row_idx for row_idx, _ in cells)
+
+    def insert_rows(self, rows: Sequence[Sequence], row_idx: int | None = None) -> None:
+        '''Insert rows given like in :attr:`table_data` before the row displayed
+        at `row_idx`, at the end by default. Sorted or filtered tables display
+        the new rows where the sort and the filters put them.
+        '''
+        self.__check_editable()
+        count = len(rows)
+        if not count:
+            return
+
+        length = len(self._store)
+        displayed = self._get_rows_count()
+        if row_idx is None or row_idx >= displayed:
+            stored_idx = length
+        else:
+            stored_idx = self._row_at(max(row_idx, 0))
+        self._store.insert_rows(stored_idx, rows)
+        self._group_index = None
+        self._aggregates.add_rows(range(stored_idx, stored_idx + count))
+        self._footer_trigger()
+
+        self._selection.insert(stored_idx, count)
+        self.__invalidate_filter(search_index=False)
+        if self._search_index is not None:
+            self._search_index.insert_rows(stored_idx, count)
+
+        if self._order is not None:
+            self.__update_display()
+        elif stored_idx == length:
+            self.__update_rows_view({'appended': slice(length, length + count)})
+        elif count == 1:
+            self.__update_rows_view({'inserted': stored_idx})
+        else:
+            # the RecycleView inserts one item per flag, a full refresh is O(rows) once
+            self.__update_rows_view({})
+
+    def append_rows(self, rows: Iterable[Sequence]) -> None:
+        '''Append rows given like in :attr:`table_data` at the next frame, the
+        rows appended during a frame are displayed at once.
+
+        Only the new and the dropped rows, see :attr:`max_rows`, are refreshed:
+        a frame costs O(rows) when the table is not sorted nor filtered, and
+        the rows have a fixed height, see :attr:`row_height`.
+        '''
+        self.__check_editable()
+        self._pending_rows.extend(rows)
+        self._append_trigger()
+
+    def flush_rows(self) -> None:
+        '''Append the rows of :meth:`append_rows` now.'''
+        self._append_trigger.cancel()
+        rows, self._pending_rows = self._pending_rows, []
+        max_rows = None if self.max_rows is None else int(self.max_rows)
+        if max_rows is not None and len(rows) > max_rows:
+            # rows dropped as soon as they are appended
+            rows = rows[len(rows) - max_rows:]
+
+        store = self._store
+        length = len(store)
+        count = len(rows)
+        evicted = max(0, length + count - max_rows) if max_rows is not None else 0
+        if not count and not evicted:
+            return
+
+        follow_tail = self.auto_scroll and self.__is_tail_visible()
+
+        store.append_rows(rows)
+        self._group_index = None
+        self._aggregates.add_rows(range(length, length + count))
+        self._aggregates.remove_rows(range(evicted))
+        self._footer_trigger()
+        if self._search_index is not None:
+            # the appended rows are indexed before the first rows are evicted
+            self._search_index.append_rows(count)
+            self._search_index.evict_rows(evicted)
+        store.evict_rows(evicted)
+        self._selection.insert(length, count)
+        self._selection.delete(range(evicted))
+        if self._last_checked_row is not None and self._order is None:
+            self._last_checked_row = self._last_checked_row - evicted if self._last_checked_row >= evicted else None
+        self.__invalidate_filter(search_index=False)
+
+        if self._order is not None:
+            self.__update_display()
         else:
-            formatted_row_data['row_bg_color'] = self._odd_row_color
+            flags = []
+            if evicted:
+                flags.append({'removed': slice(0, evicted)})
+            if count:
+                flags.append({'appended': slice(length - evicted, length - evicted + count)})
+            self.__update_rows_view(*flags)
+
+        if follow_tail:
+            self.ids.glow_table_view.scroll_y = 0
+
+    def on_max_rows(self, instance: Self, max_rows: int | None) -> None:
+        # the rows over the maximum are dropped at the next frame
+        if max_rows is not None and len(self._store) > max_rows:
+            self._append_trigger()
+
+    def __is_tail_visible(self) -> bool:
+        view = self.ids.glow_table_view
+        return self.ids.glow_table_layout.height <= view.height or view.scroll_y <= 0
+
+    def delete_rows(self, row_indices: Iterable[int]) -> None:
+        '''Delete rows by index.'''
+        self.__check_editable()
+        deleted = sorted({self._row_at(row_idx) for row_idx in row_indices})
+        if not deleted:
+            return
+
+        self._aggregates.remove_rows(deleted)
+        self._footer_trigger()
+        self._store.delete_rows(deleted)
+        self._group_index = None
+
+        self._selection.delete(deleted)
+        self.__invalidate_filter(search_index=False)
+        if self._search_index is not None:
+            self._search_index.delete_rows(deleted)
+
+        if self._order is not None:
+            self.__update_display()
+        else:
+            self.__update_rows_view(*({'removed': slice(start, stop)} for start, stop in reversed(list(index_runs(deleted)))))
 
-        formatted_row_data['hover_row_bg_color'] = self._hover_row_color
-        formatted_row_data['table'] = self
-        self._formatted_table_data[row_idx] = formatted_row_data
+    def move_rows(self, row_indices: Iterable[int], row_idx: int) -> None:
+        '''Move rows, in their order, so that the first one is at `row_idx`
+        once they are moved.
 
+        The table must not be sorted, filtered nor grouped, see
+        :meth:`sort_by`, :meth:`clear_filters` and :attr:`group_by`.
+        '''
+        self.__check_editable()
+        self.__check_movable()
+        moved = sorted(set(row_indices))
+        if not moved:
+            return
+
+        count = len(moved)
+        row_idx = min(max(row_idx, 0), len(self._store) - count)
+        self._store.move_rows(moved, row_idx)
+
+        self._selection.move(moved, row_idx)
+        self.__invalidate_filter(search_index=False)
+        if self._search_index is not None:
+            self._search_index.move_rows(moved, row_idx)
+        # the rows in between shifted
+        self.__update_rows_view({'modified': slice(min(moved[0], row_idx), max(moved[-1], row_idx + count - 1) + 1)})
+
+    def get_aggregates(self) -> dict[int, Any]:
+        '''Values of the 'aggregate' of the columns, by column index.'''
+        return self._aggregates.get_values()
+
+    def __reload_aggregates(self) -> None:
+        self._aggregates.load()
+        self._footer_trigger()
+
+    def __update_footer(self) -> None:
+        values = self._aggregates.get_values() if self.data_provider is None else {}
+        for column_idx, label in self._footer_labels.items():
+            label.text = self.__format_aggregate(column_idx, values.get(column_idx))
+
+    def __format_aggregate(self, column_idx: int, value: Any) -> str:
+        aggregate_format = self.columns_info[column_idx].get('aggregate_format')
+        if value is None:
+            return ''
+        if aggregate_format is None:
+            return str(value)
+        if callable(aggregate_format):
+            return aggregate_format(value)
+        return aggregate_format.format(value)
+
+    def __update_search_index(self, row_indices: Iterable[int]) -> None:
+        if self._search_index is not None:
+            self._search_index.update_rows({self._row_at(row_idx) for row_idx in row_indices})
+
+    def __check_editable(self) -> None:
+        if self.data_provider is not None:
+            raise GlowTableException('The rows of a data provider can not be changed by the table')
+        self._rows_from_table_data = False
+
+    def __refresh_rows(self, row_indices: Iterable[int]) -> None:
+        view = self._rows_view
+        groups = self._groups
+        if groups is not None:
+            # the rows and the aggregates in the headers of their groups
+            row_indices = list(row_indices)
+            changed_groups = {groups.group_at(row_idx) for row_idx in row_indices}
+            for group_idx in changed_groups:
+                groups.aggregates.pop(group_idx, None)
+            row_indices = [groups.header_index(group_idx) for group_idx in changed_groups] + [
+                entry_idx for entry_idx in map(groups.entry_index, row_indices) if entry_idx is not None
+            ]
+        indices = [row_idx - view.start for row_idx in row_indices if view.start <= row_idx < view.stop]
+        if not indices:
+            return
+
+        for index in indices:
+            view.invalidate(index)
+        self._data_model.refresh(modified=slice(min(indices), max(indices) + 1))
+
+    def __update_rows_view(self, *flags: dict) -> None:
+        '''Display the rows after they were inserted, deleted or moved, only
+        the views which changed are refreshed.
+        '''
         if self.use_pagination:
-            self.paginator.items = self._formatted_table_data
-            self._update_display_table_data(self.paginator, self.paginator.page)
+            # the rows of the page all changed
+            self.__update_display()
+            return
+
+        self._rows_view.set_range(0, len(self._store))
+        for flag in flags:
+            self._data_model.refresh(**flag)
+        # views refreshed in place keep their selection
+        self.ids.glow_table_layout.refresh_selection()
+
+    def __update_visible_columns(self) -> None:
+        if not self.virtual_columns or self._header is None or not self.ids:
+            return
+
+        if self.selectable:
+            columns = self._header.children[::-1][1:]
         else:
-            self._display_table_data = self._formatted_table_data
+            columns = self._header.children[::-1]
+        if not columns:
+            return
 
-    def __update_colors(self, *args) -> None:
-        for row_idx, row_data in enumerate(self._formatted_table_data):
-            if row_idx % 2 == 0:
-                row_data['row_bg_color'] = self._even_row_color
-            else:
-                row_data['row_bg_color'] = self._odd_row_color
+        origin = columns[0].x
+        self._column_rects = [(column.x - origin, column.width) for column in columns]
+
+        # horizontal viewport, relative to the first column
+        view = self.ids.glow_table_view
+        scroll_width = max(self.ids.glow_table_layout.width - view.width, 0)
+        left = view.scroll_x * scroll_width - (origin - self._header.x)
+        right = left + view.width
 
-            row_data['hover_row_bg_color'] = self._hover_row_color
+        first = bisect.bisect_right([x + width for x, width in self._column_rects], left)
+        last = bisect.bisect_left([x for x, _ in self._column_rects], right)
+        overscan = int(self.virtual_columns_overscan)
+        self._visible_columns = range(max(first - overscan, 0), min(last + overscan, len(columns)))
 
+        for row in list(view.view_adapter.views.values()):
+            if isinstance(row, GlowVirtualTableRow):
+                row.update_columns()
+
+    def __update_colors(self, *args) -> None:
+        self._rows_view.invalidate()
         self.ids.glow_table_view.refresh_from_data()
 
     def _update_display_table_data(self, instance: GlowPaginator, page: int) -> None:
-        self._display_table_data = self.paginator.get_page_items()
         item_from, item_to = self.paginator.get_from_to()
+        self._rows_view.set_range(item_from, item_to)
+        self._data_model.refresh()
 
-        for i, idx in enumerate(range(item_from, item_to)):
-            if self._selected_rows[idx]:
-                self.ids.glow_table_layout.select_node(i)
-
-        selected_rows = self._selected_rows.copy()
         if self.selectable:
+            # a new page, the rows keep their selection
+            self._resetting_table_checkbox = True
             self.table_checkbox.active = False
-        self._selected_rows = selected_rows
+            self._resetting_table_checkbox = False
 
     def on_row_press(self, instance: GlowTableRow) -> None:
         '''Called when a table row is clicked.'''
@@ -668,3 +2079,28 @@ class GlowTable(GlowBoxLayout):
     def on_row_selected(self, instance: GlowTableRow) -> None:
         '''Called when the row is checked.'''
         pass
+
+    def on_load_progress(self, loaded_rows: int, progress: float | None) -> None:
+        '''Called when a chunk of :meth:`load_data` is displayed, with the
+        number of loaded rows and the read part of the source, from 0 to 1,
+        None if unknown.
+        '''
+        pass
+
+    def on_load_finished(self, error: Exception | None) -> None:
+        '''Called when :meth:`load_data` read all the rows, or failed with error.'''
+        pass
+
+    def on_export_progress(self, exported_rows: int, progress: float) -> None:
+        '''Called when a chunk of :meth:`export_data` is written, with the
+        number of written rows and the written part of the rows, from 0 to 1.
+        '''
+        pass
+
+    def on_export_finished(self, error: Exception | None) -> None:
+        '''Called when :meth:`export_data` wrote all the rows, or failed with error.'''
+        pass
+
+    def on_export_cancelled(self) -> None:
+        '''Called when :meth:`cancel_export` stops :meth:`export_data`.'''
+        pass
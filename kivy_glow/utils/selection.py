@@ -0,0 +1,252 @@
+__all__ = ('SelectionModel', )
+
+import re
+from typing import (
+    Iterable,
+    Iterator,
+    Self,
+    Sequence,
+)
+
+_NOT_EMPTY_BYTE = re.compile(b'[^\x00]')
+_NOT_FULL_BYTE = re.compile(b'[^\xff]')
+
+
+class SelectionModel:
+    '''Selected indices of `length` items, stored as a bitset.
+
+    Selecting or testing an index is O(1), selecting all the items or
+    inverting the selection only flips a flag, ranges are set by whole bytes
+    and iterating the selected indices skips the empty bytes in C.
+    Items can be inserted, deleted and moved like rows, the selection follows
+    them. Appending items and deleting the first ones, like a bounded stream
+    of rows, cost O(items) instead of O(length).
+    '''
+
+    def __init__(self, length: int = 0) -> None:
+        self.length = length
+        # a bit set means selected, or not selected when inverted
+        self._bits = bytearray()
+        # bits of deleted items at the start of the first byte, always unset
+        self._offset = 0
+        self._inverted = False
+        self._count = 0
+
+    def __len__(self) -> int:
+        '''Number of selected items.'''
+        return self.length - self._count if self._inverted else self._count
+
+    def __contains__(self, index: int) -> bool:
+        return self.is_selected(index)
+
+    def __iter__(self) -> Iterator[int]:
+        '''Selected indices, in ascending order.'''
+        bits = self._bits
+        offset = self._offset
+        stop = self.length + offset
+        pattern = _NOT_FULL_BYTE if self._inverted else _NOT_EMPTY_BYTE
+        mask = 0xff if self._inverted else 0
+
+        for match in pattern.finditer(bits):
+            byte_idx = match.start()
+            byte = bits[byte_idx] ^ mask
+            if not byte_idx:
+                # the bits of the deleted items
+                byte &= 0xff << offset
+            position = byte_idx << 3
+            while byte:
+                low_bit = byte & -byte
+                if position + low_bit.bit_length() - 1 >= stop:
+                    return
+                yield position + low_bit.bit_length() - 1 - offset
+                byte ^= low_bit
+
+        if self._inverted:
+            # the items after the stored bytes are all selected
+            yield from range(max((len(bits) << 3) - offset, 0), self.length)
+
+    def copy(self) -> Self:
+        selection = SelectionModel(self.length)
+        selection._bits = self._bits[:]
+        selection._offset = self._offset
+        selection._inverted = self._inverted
+        selection._count = self._count
+        return selection
+
+    def reset(self, length: int) -> None:
+        '''Unselect all the items and set their number.'''
+        self.length = length
+        self._bits = bytearray()
+        self._offset = 0
+        self._inverted = False
+        self._count = 0
+
+    def resize(self, length: int) -> None:
+        '''Add unselected items or remove items at the end.'''
+        if length > self.length:
+            self.insert(self.length, length - self.length)
+        elif length < self.length:
+            self.length = length
+            self._from_int(self._to_int())
+
+    def is_selected(self, index: int) -> bool:
+        position = index + self._offset
+        byte_idx = position >> 3
+        bit = byte_idx < len(self._bits) and bool(self._bits[byte_idx] >> (position & 7) & 1)
+        return bit != self._inverted
+
+    def select(self, index: int, is_selected: bool = True) -> None:
+        if not 0 <= index < self.length:
+            return
+
+        bit = is_selected != self._inverted
+        position = index + self._offset
+        byte_idx = position >> 3
+        bits = self._bits
+        if byte_idx >= len(bits):
+            if not bit:
+                return
+            bits.extend(bytes(byte_idx + 1 - len(bits)))
+
+        mask = 1 << (position & 7)
+        if bool(bits[byte_idx] & mask) == bit:
+            return
+        bits[byte_idx] ^= mask
+        self._count += 1 if bit else -1
+
+    def toggle(self, index: int) -> None:
+        self.select(index, not self.is_selected(index))
+
+    def select_many(self, indices: Iterable[int], is_selected: bool = True) -> None:
+        for index in indices:
+            self.select(index, is_selected)
+
+    def select_range(self, start: int, stop: int, is_selected: bool = True) -> None:
+        '''Select or unselect the items from `start` to `stop` (excluded).'''
+        start = max(start, 0)
+        stop = min(stop, self.length)
+        if start >= stop:
+            return
+
+        self._fill(start + self._offset, stop + self._offset, is_selected != self._inverted)
+
+    def select_all(self, is_selected: bool = True) -> None:
+        self._bits = bytearray()
+        self._offset = 0
+        self._inverted = is_selected
+        self._count = 0
+
+    def invert(self) -> None:
+        self._inverted = not self._inverted
+
+    def insert(self, index: int, count: int) -> None:
+        '''Insert `count` unselected items before `index`.'''
+        if count <= 0:
+            return
+        if index >= self.length:
+            # appended, only the bits of the new items are set
+            if self._inverted:
+                self._fill(self.length + self._offset, self.length + count + self._offset, True)
+            self.length += count
+            return
+        if not self._bits and not self._inverted:
+            # nothing is selected
+            self.length += count
+            return
+
+        value = self._to_int()
+        low = value & ((1 << index) - 1)
+        inserted = ((1 << count) - 1) << index if self._inverted else 0
+        self.length += count
+        self._from_int(low | inserted | (value >> index) << (index + count))
+
+    def delete(self, indices: Iterable[int]) -> None:
+        '''Delete items by index.'''
+        deleted = sorted(set(indices), reverse=True)
+        if not self._bits:
+            # the items are all selected or all unselected
+            self.length -= len(deleted)
+            return
+        if deleted and deleted[-1] == 0 and deleted[0] == len(deleted) - 1:
+            self._delete_first(len(deleted))
+            return
+
+        value = self._to_int()
+        # contiguous runs are removed with a single shift
+        run_idx = 0
+        while run_idx < len(deleted):
+            stop = deleted[run_idx] + 1
+            while run_idx + 1 < len(deleted) and deleted[run_idx + 1] == deleted[run_idx] - 1:
+                run_idx += 1
+            start = deleted[run_idx]
+            value = (value & ((1 << start) - 1)) | (value >> stop) << start
+            run_idx += 1
+        self.length -= len(deleted)
+        self._from_int(value)
+
+    def move(self, indices: Sequence[int], index: int) -> None:
+        '''Move the items, in their order, so that the first one is at `index`
+        once they are moved.
+        '''
+        moved = sorted(set(indices))
+        selected = [self.is_selected(moved_idx) for moved_idx in moved]
+        self.delete(moved)
+        self.insert(index, len(moved))
+        for offset, is_selected in enumerate(selected):
+            if is_selected:
+                self.select(index + offset)
+
+    def permute(self, order: Sequence[int]) -> None:
+        '''Reorder the items, item `i` becomes the item `order[i]`.'''
+        inverted = self._inverted
+        # only the set bits are moved
+        self._inverted = False
+        set_bits = set(self)
+        self.reset(self.length)
+        self._inverted = inverted
+        for new_idx, old_idx in enumerate(order):
+            if old_idx in set_bits:
+                self.select(new_idx, not inverted)
+
+    def _delete_first(self, count: int) -> None:
+        '''Delete the first items, by unsetting their bits and removing their
+        whole bytes, the other bits are not shifted.
+        '''
+        bits = self._bits
+        position = count + self._offset
+        self._fill(self._offset, min(position, len(bits) << 3), False)
+        del bits[:position >> 3]
+        self._offset = position & 7 if bits else 0
+        self.length -= count
+
+    def _fill(self, start: int, stop: int, bit: bool) -> None:
+        '''Set or unset the bits from `start` to `stop` (excluded), only the
+        bytes of the range are converted.
+        '''
+        if start >= stop:
+            return
+        bits = self._bits
+        first_byte, last_byte = start >> 3, (stop - 1) >> 3
+        if last_byte >= len(bits):
+            if not bit:
+                last_byte = len(bits) - 1
+                stop = len(bits) << 3
+                if first_byte > last_byte:
+                    return
+            else:
+                bits.extend(bytes(last_byte + 1 - len(bits)))
+
+        value = int.from_bytes(bits[first_byte:last_byte + 1], 'little')
+        span = ((1 << (stop - start)) - 1) << (start - (first_byte << 3))
+        new_value = value | span if bit else value & ~span
+        bits[first_byte:last_byte + 1] = new_value.to_bytes(last_byte + 1 - first_byte, 'little')
+        self._count += new_value.bit_count() - value.bit_count()
+
+    def _to_int(self) -> int:
+        return int.from_bytes(self._bits, 'little') >> self._offset
+
+    def _from_int(self, value: int) -> None:
+        value &= (1 << self.length) - 1
+        self._bits = bytearray(value.to_bytes((self.length + 7) >> 3, 'little'))
+        self._offset = 0
+        self._count = value.bit_count()
@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+# kivy parses the command line of pytest otherwise
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+
+@pytest.fixture(scope='session')
+def app():
+    '''A GlowApp set as the running app without a main loop, widgets get
+    their theme from it.
+    '''
+    pytest.importorskip('kivy')
+    from kivy.app import App  # noqa: PLC0415
+
+    from kivy_glow.app import GlowApp  # noqa: PLC0415
+
+    app = GlowApp()
+    App._running_app = app
+    yield app
+    App._running_app = None
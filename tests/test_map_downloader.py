@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('kivy')
+pytest.importorskip('requests')
+
+import kivy_glow.uix.map.mapdownloader as mapdownloader  # noqa: E402
+from kivy_glow.uix.map.mapdownloader import (  # noqa: E402
+    AdaptiveConcurrency,
+    ProviderLimiter,
+    TokenBucket,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    '''Time of the downloader, advanced by the tests.'''
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(mapdownloader, 'time', lambda: clock.now)
+    return clock
+
+
+def test_token_bucket_burst(clock: SimpleNamespace) -> None:
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.consume() for _ in range(4)] == [True, True, True, False]
+
+
+def test_token_bucket_refill(clock: SimpleNamespace) -> None:
+    bucket = TokenBucket(rate=2)
+    assert bucket.consume(2)
+    assert not bucket.consume()
+
+    clock.now += .5
+    assert bucket.consume()
+    assert not bucket.consume()
+
+    # never more tokens than the burst
+    clock.now += 60
+    assert bucket.consume(2)
+    assert not bucket.consume()
+
+
+def test_token_bucket_default_burst() -> None:
+    assert TokenBucket(rate=.5).capacity == 1
+    assert TokenBucket(rate=8).capacity == 8
+
+
+def test_concurrency_acquire() -> None:
+    concurrency = AdaptiveConcurrency(initial=2, minimum=1, maximum=8, target_latency=.5)
+    assert [concurrency.acquire() for _ in range(3)] == [True, True, False]
+    concurrency.release()
+    assert concurrency.acquire()
+
+
+def test_concurrency_additive_increase() -> None:
+    concurrency = AdaptiveConcurrency(initial=2, minimum=1, maximum=3, target_latency=.5)
+    for _ in range(2):
+        concurrency.acquire()
+        concurrency.release(latency=.1)
+    assert concurrency.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+
+    for _ in range(10):
+        concurrency.acquire()
+        concurrency.release(latency=.1)
+    assert concurrency.limit == 3
+
+
+def test_concurrency_decrease() -> None:
+    concurrency = AdaptiveConcurrency(initial=8, minimum=2, maximum=8, target_latency=.5)
+    concurrency.acquire()
+    concurrency.release(latency=1)
+    assert concurrency.limit == pytest.approx(8 * AdaptiveConcurrency.LATENCY_DECREASE)
+
+    concurrency.acquire()
+    concurrency.release(latency=.1, throttled=True)
+    assert concurrency.limit == pytest.approx(8 * AdaptiveConcurrency.LATENCY_DECREASE / 2)
+
+    for _ in range(5):
+        concurrency.release(throttled=True)
+    assert concurrency.limit == 2
+    assert concurrency.in_flight == 0
+
+
+def test_provider_limiter(clock: SimpleNamespace) -> None:
+    map_source = SimpleNamespace(
+        rate_limit=1, rate_burst=1, min_concurrency=2, max_concurrency=2, target_latency=.5,
+        max_retries=3, backoff_base=.5, backoff_max=4,
+    )
+    limiter = ProviderLimiter(map_source)
+    assert limiter.acquire(clock.now)
+    # rate limited, the concurrency slot is given back
+    assert not limiter.acquire(clock.now)
+    assert limiter.concurrency.in_flight == 1
+
+    clock.now += 1
+    limiter.blocked_until = clock.now + 10
+    assert not limiter.acquire(clock.now)
+    assert limiter.acquire(clock.now + 10)
+    assert all(0 <= limiter.backoff(attempt) <= 4 for attempt in range(10))
@@ -0,0 +1,111 @@
+import gzip
+import struct
+
+import pytest
+
+pytest.importorskip('kivy')
+pytest.importorskip('requests')
+
+from kivy_glow.uix.map.vectortile import decode_mvt  # noqa: E402
+
+
+def varint(value: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def field(number: int, value: int | bytes | str, wire_type: int | None = None) -> bytes:
+    '''A protobuf field: varints for ints, length delimited otherwise.'''
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    if isinstance(value, int):
+        return varint(number << 3) + varint(value)
+    if wire_type is not None:
+        return varint(number << 3 | wire_type) + value
+    return varint(number << 3 | 2) + varint(len(value)) + value
+
+
+def zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def packed(values: list[int]) -> bytes:
+    return b''.join(varint(value) for value in values)
+
+
+def command(command_id: int, count: int) -> int:
+    return command_id | count << 3
+
+
+def feature(feature_id: int, geometry_type: int, tags: list[int], geometry: list[int]) -> bytes:
+    return field(1, feature_id) + field(2, packed(tags)) + field(3, geometry_type) + field(4, packed(geometry))
+
+
+def make_tile() -> bytes:
+    # a square polygon, closed
+    square = [
+        command(1, 1), zigzag(10), zigzag(10),
+        command(2, 3), zigzag(20), zigzag(0), zigzag(0), zigzag(20), zigzag(-20), zigzag(0),
+        command(7, 1),
+    ]
+    # a line of two parts, positions relative to the previous point
+    line = [
+        command(1, 1), zigzag(5), zigzag(5),
+        command(2, 1), zigzag(3), zigzag(-2),
+        command(1, 1), zigzag(10), zigzag(0),
+        command(2, 1), zigzag(0), zigzag(4),
+    ]
+    water = (
+        field(15, 2) + field(1, 'water')
+        + field(2, feature(1, 3, [0, 0, 1, 1], square))
+        + field(3, 'class') + field(3, 'depth')
+        + field(4, field(1, 'lake')) + field(4, field(6, zigzag(-3)))
+        + field(5, 4096)
+    )
+    roads = (
+        field(15, 2) + field(1, 'roads')
+        + field(2, feature(7, 2, [0, 0, 1, 1, 2, 2], line))
+        + field(3, 'oneway') + field(3, 'width') + field(3, 'lanes')
+        + field(4, field(7, 1)) + field(4, field(3, struct.pack('<d', 2.5), wire_type=1))
+        + field(4, field(5, 2))
+        + field(5, 512)
+    )
+    return field(3, water) + field(3, roads)
+
+
+def test_decode_layers() -> None:
+    layers = decode_mvt(make_tile())
+    assert sorted(layers) == ['roads', 'water']
+    assert layers['water']['extent'] == 4096
+    assert layers['roads']['extent'] == 512
+
+
+def test_decode_polygon() -> None:
+    water, = decode_mvt(make_tile())['water']['features']
+    assert water['id'] == 1
+    assert water['type'] == 3
+    assert water['properties'] == {'class': 'lake', 'depth': -3}
+    assert water['geometry'] == [[(10, 10), (30, 10), (30, 30), (10, 30), (10, 10)]]
+
+
+def test_decode_line() -> None:
+    road, = decode_mvt(make_tile())['roads']['features']
+    assert road['id'] == 7
+    assert road['type'] == 2
+    assert road['properties'] == {'oneway': True, 'width': 2.5, 'lanes': 2}
+    assert road['geometry'] == [[(5, 5), (8, 3)], [(18, 3), (18, 7)]]
+
+
+def test_decode_gzipped() -> None:
+    assert decode_mvt(gzip.compress(make_tile())) == decode_mvt(make_tile())
+
+
+def test_decode_empty() -> None:
+    assert decode_mvt(b'') == {}
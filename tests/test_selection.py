@@ -0,0 +1,173 @@
+import random
+
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy_glow.utils.selection import SelectionModel  # noqa: E402
+
+
+class ReferenceSelection:
+    '''Selected indices in a set, the expected behaviour of SelectionModel.'''
+
+    def __init__(self, length: int) -> None:
+        self.length = length
+        self.selected = set()
+
+    def select_range(self, start: int, stop: int, is_selected: bool) -> None:
+        indices = range(max(start, 0), min(stop, self.length))
+        if is_selected:
+            self.selected.update(indices)
+        else:
+            self.selected.difference_update(indices)
+
+    def invert(self) -> None:
+        self.selected = set(range(self.length)) - self.selected
+
+    def insert(self, index: int, count: int) -> None:
+        self.selected = {idx + count if idx >= index else idx for idx in self.selected}
+        self.length += count
+
+    def delete(self, indices: list[int]) -> None:
+        deleted = sorted(set(indices))
+        self.selected = {idx - sum(1 for deleted_idx in deleted if deleted_idx < idx) for idx in self.selected - set(deleted)}
+        self.length -= len(deleted)
+
+    def move(self, indices: list[int], index: int) -> None:
+        moved = sorted(set(indices))
+        rest = [idx for idx in range(self.length) if idx not in moved]
+        order = rest[:index] + moved + rest[index:]
+        self.selected = {new_idx for new_idx, old_idx in enumerate(order) if old_idx in self.selected}
+
+
+def assert_same(selection: SelectionModel, reference: ReferenceSelection) -> None:
+    assert selection.length == reference.length
+    assert list(selection) == sorted(reference.selected)
+    assert len(selection) == len(reference.selected)
+    assert all(selection.is_selected(idx) == (idx in reference.selected) for idx in range(reference.length))
+
+
+def test_select() -> None:
+    selection = SelectionModel(20)
+    selection.select(3)
+    selection.select(17)
+    selection.select(25)
+    selection.toggle(3)
+    assert list(selection) == [17]
+    assert 17 in selection
+    assert len(selection) == 1
+
+
+def test_select_all_and_invert() -> None:
+    selection = SelectionModel(10)
+    selection.select_all()
+    selection.select(4, False)
+    assert list(selection) == [0, 1, 2, 3, 5, 6, 7, 8, 9]
+
+    selection.invert()
+    assert list(selection) == [4]
+    assert len(selection) == 1
+
+
+def test_select_range() -> None:
+    selection = SelectionModel(30)
+    selection.select_range(5, 20)
+    selection.select_range(8, 10, False)
+    selection.select_range(25, 40)
+    assert list(selection) == [5, 6, 7, *range(10, 20), *range(25, 30)]
+
+
+def test_insert_delete_move() -> None:
+    selection = SelectionModel(10)
+    selection.select_many([1, 5, 9])
+    selection.insert(5, 2)
+    assert list(selection) == [1, 7, 11]
+
+    selection.delete([0, 7])
+    assert list(selection) == [0, 9]
+    assert selection.length == 10
+
+    selection.move([0], 5)
+    assert list(selection) == [5, 9]
+
+
+def test_insert_while_all_selected() -> None:
+    selection = SelectionModel(4)
+    selection.select_all()
+    selection.insert(2, 2)
+    selection.insert(6, 1)
+    assert list(selection) == [0, 1, 4, 5]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_operations(seed: int) -> None:
+    rng = random.Random(seed)
+    length = rng.randint(0, 40)
+    selection = SelectionModel(length)
+    reference = ReferenceSelection(length)
+
+    for _ in range(200):
+        operation = rng.choice(['select', 'range', 'all', 'invert', 'insert', 'append', 'delete', 'evict', 'move'])
+        if operation in ('delete', 'evict', 'move') and not reference.length:
+            operation = 'append'
+
+        if operation == 'select':
+            index, is_selected = rng.randrange(reference.length + 1), rng.random() < .7
+            selection.select(index, is_selected)
+            reference.select_range(index, index + 1, is_selected)
+        elif operation == 'range':
+            start = rng.randint(-2, reference.length + 2)
+            stop, is_selected = start + rng.randint(0, 20), rng.random() < .7
+            selection.select_range(start, stop, is_selected)
+            reference.select_range(start, stop, is_selected)
+        elif operation == 'all':
+            is_selected = rng.random() < .5
+            selection.select_all(is_selected)
+            reference.select_range(0, reference.length, is_selected)
+        elif operation == 'invert':
+            selection.invert()
+            reference.invert()
+        elif operation in ('insert', 'append'):
+            index = rng.randint(0, reference.length) if operation == 'insert' else reference.length
+            count = rng.randint(1, 20)
+            selection.insert(index, count)
+            reference.insert(index, count)
+        elif operation == 'delete':
+            deleted = rng.sample(range(reference.length), rng.randint(1, min(10, reference.length)))
+            selection.delete(deleted)
+            reference.delete(deleted)
+        elif operation == 'evict':
+            evicted = range(rng.randint(1, reference.length))
+            selection.delete(evicted)
+            reference.delete(list(evicted))
+        else:
+            moved = rng.sample(range(reference.length), rng.randint(1, min(5, reference.length)))
+            index = rng.randint(0, reference.length - len(moved))
+            selection.move(moved, index)
+            reference.move(moved, index)
+
+        assert_same(selection, reference)
+
+
+@pytest.mark.parametrize('inverted', [False, True])
+def test_streaming(inverted: bool) -> None:
+    selection = SelectionModel(100)
+    reference = ReferenceSelection(100)
+    selection.select_range(10, 90)
+    reference.select_range(10, 90, True)
+    if inverted:
+        selection.invert()
+        reference.invert()
+
+    for step in range(200):
+        count = step % 13 + 1
+        selection.insert(selection.length, count)
+        reference.insert(reference.length, count)
+        selection.select(selection.length - 1)
+        reference.select_range(reference.length - 1, reference.length, True)
+        selection.delete(range(count))
+        reference.delete(list(range(count)))
+
+        assert_same(selection, reference)
+        # the bytes of the deleted items are dropped
+        assert len(selection._bits) <= (selection.length >> 3) + 2
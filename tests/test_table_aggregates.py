@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy_glow.uix.table.aggregates import (  # noqa: E402
+    TableAggregate,
+    TableAggregates,
+    compute_aggregate,
+    create_aggregate,
+)
+from kivy_glow.uix.table.storage import TableStore  # noqa: E402
+
+SCHEMA = [('text', ('text', ), ('text', ))] * 2
+
+
+def sorted_text(values: list) -> list[str]:
+    return sorted(map(str, values))
+
+
+AGGREGATES = ['sum', 'count', 'mean', 'min', 'max', sorted_text]
+
+
+def make_aggregates(rows: list, aggregates: list) -> TableAggregates:
+    store = TableStore(SCHEMA)
+    store.load_rows(rows)
+    table_aggregates = TableAggregates(store, {column_idx: create_aggregate(aggregate) for column_idx, aggregate in enumerate(aggregates)})
+    table_aggregates.load()
+    return table_aggregates
+
+
+def loaded_values(table_aggregates: TableAggregates, aggregates: list) -> dict:
+    '''Aggregates loaded from scratch over a copy of the stored rows.'''
+    store = table_aggregates.store
+    return make_aggregates([store.get_row(row_idx) for row_idx in range(len(store))], aggregates).get_values()
+
+
+def test_load() -> None:
+    rows = [[1, 'b'], [None, 2], [2.5, None], [True, 'a']]
+    assert make_aggregates(rows, ['sum', 'count']).get_values() == {0: 3.5, 1: 3}
+    assert make_aggregates(rows, ['mean', 'min']).get_values() == {0: 1.75, 1: 2}
+    assert make_aggregates(rows, ['max', sorted_text]).get_values() == {0: 2.5, 1: ['2', 'a', 'b']}
+    assert make_aggregates([], ['mean', 'min']).get_values() == {0: None, 1: None}
+
+
+def test_min_max_after_removing_the_extreme() -> None:
+    table_aggregates = make_aggregates([[3, 3], [1, 1], [1, 1], [2, 2]], ['min', 'max'])
+    table_aggregates.remove_rows([1, 0])
+    table_aggregates.store.delete_rows([1, 0])
+    assert table_aggregates.get_values() == {0: 1, 1: 2}
+
+
+def test_reducer_with_nan() -> None:
+    nan = float('nan')
+    table_aggregates = make_aggregates([[nan], [1], [2]], [len])
+    table_aggregates.remove_rows([0])
+    table_aggregates.store.delete_rows([0])
+    assert table_aggregates.get_values() == {0: 2}
+
+
+def test_compute_aggregate_keeps_the_column_aggregate() -> None:
+    aggregate = create_aggregate('sum')
+    aggregate.load([1, 2])
+    assert compute_aggregate(aggregate, [5]) == 5
+    assert aggregate.value == 3
+
+    aggregate = create_aggregate('max')
+    aggregate.load([1, 4])
+    assert compute_aggregate(aggregate, [2]) == 2
+    assert aggregate.value == 4
+
+
+class DistinctAggregate(TableAggregate):
+    '''Sorted distinct values, kept in a list changed in place.'''
+
+    def __init__(self) -> None:
+        self.values = []
+
+    @property
+    def value(self) -> list:
+        return self.values
+
+    def load(self, values: list) -> None:
+        self.values.clear()
+        self.values.extend(sorted(set(values)))
+
+
+def test_compute_aggregate_keeps_a_custom_aggregate() -> None:
+    aggregate = DistinctAggregate()
+    aggregate.load([2, 1, 2])
+    assert compute_aggregate(aggregate, [3, 3]) == [3]
+    assert aggregate.value == [1, 2]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_updates_equal_load(seed: int) -> None:
+    rng = random.Random(seed)
+
+    def random_row() -> list:
+        return [rng.choice([None, 1, 2, 3.5, -4]), rng.choice([None, 1, 2, 'a', 'b', 2.5])]
+
+    for aggregates in (AGGREGATES[:2], AGGREGATES[2:4], AGGREGATES[4:]):
+        table_aggregates = make_aggregates([random_row() for _ in range(10)], aggregates)
+        store = table_aggregates.store
+        for _ in range(60):
+            operation = rng.choice(['update', 'insert', 'delete', 'evict'])
+            if operation != 'insert' and not len(store):
+                operation = 'insert'
+
+            # rows are removed before they change, added once they changed
+            if operation == 'update':
+                row_idx = rng.randrange(len(store))
+                table_aggregates.remove_rows([row_idx])
+                store.set_row(row_idx, random_row())
+                table_aggregates.add_rows([row_idx])
+            elif operation == 'insert':
+                row_idx, count = rng.randint(0, len(store)), rng.randint(1, 3)
+                store.insert_rows(row_idx, [random_row() for _ in range(count)])
+                table_aggregates.add_rows(range(row_idx, row_idx + count))
+            elif operation == 'delete':
+                deleted = rng.sample(range(len(store)), rng.randint(1, min(3, len(store))))
+                table_aggregates.remove_rows(deleted)
+                store.delete_rows(deleted)
+            else:
+                evicted = rng.randint(1, len(store))
+                table_aggregates.remove_rows(range(evicted))
+                store.evict_rows(evicted)
+
+            assert table_aggregates.get_values() == loaded_values(table_aggregates, aggregates)
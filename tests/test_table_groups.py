@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy_glow.uix.table.groups import (  # noqa: E402
+    TableGroups,
+    index_groups,
+)
+
+
+def entries(groups: TableGroups) -> list[tuple[int, int | None]]:
+    return [groups.entry_at(entry_idx) for entry_idx in range(len(groups))]
+
+
+def test_index_groups() -> None:
+    assert index_groups(['b', 'a', 'b', None]) == (['b', 'a', None], [0, 1, 0, 2])
+    assert index_groups([1, 12, 3, 14], key=lambda value: value // 10) == ([0, 1], [0, 1, 0, 1])
+
+
+def test_entries() -> None:
+    groups = TableGroups(['a', 'b', 'c'], [2, 1, 3], set())
+    assert len(groups) == 9
+    assert entries(groups) == [(0, None), (0, 0), (0, 1), (1, None), (1, 2), (2, None), (2, 3), (2, 4), (2, 5)]
+    assert [groups.entry_index(row_idx) for row_idx in range(6)] == [1, 2, 4, 6, 7, 8]
+    assert [groups.group_at(row_idx) for row_idx in range(6)] == [0, 0, 1, 2, 2, 2]
+    assert [groups.header_index(group_idx) for group_idx in range(3)] == [0, 3, 5]
+    assert groups.index('b') == 1
+    assert groups.index('d') is None
+
+
+def test_set_collapsed() -> None:
+    groups = TableGroups(['a', 'b', 'c'], [2, 1, 3], set())
+    assert groups.set_collapsed(0, True) == slice(1, 3)
+    assert groups.set_collapsed(0, True) is None
+    assert groups.is_collapsed(0)
+    assert len(groups) == 7
+    assert entries(groups) == [(0, None), (1, None), (1, 2), (2, None), (2, 3), (2, 4), (2, 5)]
+    assert [groups.entry_index(row_idx) for row_idx in range(6)] == [None, None, 2, 4, 5, 6]
+
+    assert groups.set_collapsed(2, True) == slice(4, 7)
+    assert [groups.entry_index(row_idx) for row_idx in range(6)] == [None, None, 2, None, None, None]
+
+    assert groups.set_collapsed(0, False) == slice(1, 3)
+    assert [groups.entry_index(row_idx) for row_idx in range(6)] == [1, 2, 4, None, None, None]
+    assert groups.collapsed == {'c'}
+
+
+def test_collapsed_keys_kept() -> None:
+    collapsed = {'b'}
+    groups = TableGroups(['a', 'b'], [1, 2], collapsed)
+    assert len(groups) == 3
+    assert groups.entry_index(1) is None
+
+    groups.set_all_collapsed(True)
+    assert len(groups) == 2
+    assert collapsed == {'a', 'b'}
+    groups.set_all_collapsed(False)
+    assert len(groups) == 5
+    assert not collapsed
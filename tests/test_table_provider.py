@@ -0,0 +1,144 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy_glow.uix.table.provider import (  # noqa: E402
+    SQLiteDataProvider,
+    TableBlockCache,
+    TableDataProvider,
+)
+
+
+class ListProvider(TableDataProvider):
+    '''Rows of a list, fetched in the calling thread.'''
+
+    thread_safe = False
+
+    def __init__(self, length: int) -> None:
+        self.rows = [[row_idx] for row_idx in range(length)]
+        self.fetched = []
+
+    def count(self) -> int:
+        return len(self.rows)
+
+    def fetch(self, offset: int, limit: int) -> list:
+        self.fetched.append(offset)
+        return self.rows[offset:offset + limit]
+
+
+def make_cache(length: int, **options) -> tuple[ListProvider, TableBlockCache]:
+    provider = ListProvider(length)
+    return provider, TableBlockCache(provider, lambda start, stop: None, **options)
+
+
+def test_get_row_loads_the_block() -> None:
+    provider, cache = make_cache(10, block_size=4, prefetch=0)
+    assert cache.get_row(5) == [5]
+    assert cache.get_row(6) == [6]
+    assert provider.fetched == [4]
+
+
+def test_blocks_evicted_least_recently_used_first() -> None:
+    provider, cache = make_cache(100, block_size=4, max_blocks=3, prefetch=0)
+    for row_idx in (0, 4, 8):
+        cache.get_row(row_idx)
+    # block 0 used again, block 1 is the least recently used
+    cache.get_row(1)
+    cache.get_row(12)
+    assert list(cache._blocks) == [2, 0, 3]
+
+    provider.fetched.clear()
+    cache.get_row(5)
+    assert provider.fetched == [4]
+    assert len(cache._blocks) == 3
+
+
+def test_prefetch_clamped_to_the_rows() -> None:
+    provider, cache = make_cache(10, block_size=4, prefetch=1)
+    cache.reset(10)
+    cache.get_row(0)
+    assert sorted(provider.fetched) == [0, 4]
+
+    provider.fetched.clear()
+    cache.get_row(9)
+    # no block after the last row
+    assert provider.fetched == [8]
+
+
+def test_prefetch_without_count() -> None:
+    provider, cache = make_cache(10, block_size=4, prefetch=1)
+    cache.get_row(9)
+    assert sorted(provider.fetched) == [4, 8, 12]
+
+
+def test_max_blocks_keeps_the_prefetched_blocks() -> None:
+    _, cache = make_cache(100, block_size=4, max_blocks=1, prefetch=2)
+    assert cache.max_blocks == 6
+
+
+def test_get_rows_fetches_each_block_once() -> None:
+    provider, cache = make_cache(20, block_size=4, prefetch=0)
+    cache.get_row(0)
+    provider.fetched.clear()
+
+    assert cache.get_rows([1, 9, 10, 17, 8]) == [[1], [9], [10], [17], [8]]
+    assert provider.fetched == [8, 16]
+    # the fetched blocks are not cached
+    assert list(cache._blocks) == [0]
+
+
+def test_reset_drops_the_blocks() -> None:
+    provider, cache = make_cache(10, block_size=4, prefetch=0)
+    cache.get_row(0)
+    cache.reset(10)
+    provider.fetched.clear()
+    cache.get_row(0)
+    assert provider.fetched == [0]
+
+
+@pytest.fixture
+def database(tmp_path) -> str:
+    path = str(tmp_path / 'rows.db')
+    connection = sqlite3.connect(path)
+    rows = [(row_idx, f'name {row_idx}', row_idx % 3) for row_idx in range(20)]
+    connection.execute('CREATE TABLE rows (id INTEGER PRIMARY KEY, name TEXT, grade INTEGER)')
+    connection.execute('CREATE TABLE keyed (name TEXT, id INTEGER, grade INTEGER, PRIMARY KEY (id, name)) WITHOUT ROWID')
+    connection.execute('CREATE VIEW graded AS SELECT name, grade FROM rows WHERE grade > 0')
+    connection.executemany('INSERT INTO rows VALUES (?, ?, ?)', rows)
+    connection.executemany('INSERT INTO keyed VALUES (?, ?, ?)', [(name, row_idx, grade) for row_idx, name, grade in rows])
+    connection.commit()
+    connection.close()
+    return path
+
+
+@pytest.mark.parametrize('table, columns', [
+    ('rows', ['name', 'grade']),
+    ('keyed', ['name', 'grade']),
+    ('graded', ['name', 'grade']),
+])
+def test_sqlite_sort_stable_between_blocks(database: str, table: str, columns: list[str]) -> None:
+    provider = SQLiteDataProvider(database, table, columns)
+    try:
+        for order in ('ASC', 'DSC'):
+            provider.sort(1, order)
+            count = provider.count()
+            rows = [row for offset in range(0, count, 4) for row in provider.fetch(offset, 4)]
+            assert rows == provider.fetch(0, count)
+            assert len(set(rows)) == count
+            grades = [grade for _, grade in rows]
+            assert grades == sorted(grades, reverse=order == 'DSC')
+    finally:
+        provider.close()
+
+
+def test_sqlite_filter(database: str) -> None:
+    provider = SQLiteDataProvider(database, 'rows', ['id', 'grade'], where='id < ?', parameters=(10, ))
+    try:
+        provider.filter({1: 0})
+        assert provider.count() == 4
+        provider.filter({0: ('in', [1, 2, 3]), 1: ('!=', 0)})
+        assert provider.fetch(0, 10) == [(1, 1), (2, 2)]
+    finally:
+        provider.close()
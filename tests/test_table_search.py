@@ -0,0 +1,138 @@
+import random
+
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy_glow.uix.table.search import TableSearchIndex  # noqa: E402
+from kivy_glow.uix.table.storage import TableStore  # noqa: E402
+
+SCHEMA = [('text', ('text', ), ('text', ))] * 2
+WORDS = ['alpha', 'beta', 'bet', 'gamma', 'delta', None]
+
+
+def make_index(rows: list, columns: tuple = (0, 1)) -> TableSearchIndex:
+    store = TableStore(SCHEMA)
+    store.load_rows(rows)
+    index = TableSearchIndex(store, columns)
+    # built on the first search
+    index.search('')
+    return index
+
+
+def full_search(index: TableSearchIndex, query: str) -> set[int]:
+    '''Search over a new index of a copy of the stored rows.'''
+    store = index.store
+    return make_index([store.get_row(row_idx) for row_idx in range(len(store))], index.columns).search(query)
+
+
+def test_search_words_as_prefixes() -> None:
+    index = make_index([['Alpha beta', 'one'], ['beta-two', None], ['gamma', 'Betamax']])
+    assert index.search('be') == {0, 1, 2}
+    assert index.search('beta t') == {1}
+    assert index.search('BETA one') == {0}
+    assert index.search('zeta') == set()
+    assert index.search('') == {0, 1, 2}
+
+
+def test_search_searchable_columns_only() -> None:
+    index = make_index([['alpha', 'beta'], ['beta', 'alpha']], columns=(0, ))
+    assert index.search('beta') == {1}
+
+
+def test_search_after_updates() -> None:
+    index = make_index([['alpha'], ['beta'], ['gamma']])
+    index.store.set_cell(1, 0, 'delta')
+    index.update_rows([1])
+    assert index.search('beta') == set()
+    assert index.search('delta') == {1}
+
+    index.store.set_row(0, ['beta', 'gamma'])
+    index.update_rows([0])
+    assert index.search('gamma') == {0, 2}
+
+
+def test_search_after_inserts_and_deletes() -> None:
+    index = make_index([['alpha'], ['beta'], ['gamma']])
+    index.store.insert_rows(1, [['beta two'], ['delta']])
+    index.insert_rows(1, 2)
+    assert index.search('beta') == {1, 3}
+    assert index.search('gamma') == {4}
+
+    index.store.delete_rows([0, 3])
+    index.delete_rows([0, 3])
+    assert index.search('beta') == {0}
+    assert index.search('gamma') == {2}
+
+
+def test_search_after_moves() -> None:
+    index = make_index([['alpha'], ['beta'], ['gamma'], ['delta']])
+    index.store.move_rows([0, 2], 2)
+    index.move_rows([0, 2], 2)
+    assert [index.store.get_value(row_idx, 0) for row_idx in range(4)] == ['beta', 'delta', 'alpha', 'gamma']
+    assert index.search('alpha') == {2}
+    assert index.search('delta') == {1}
+
+
+def test_search_after_evictions() -> None:
+    index = make_index([['alpha'], ['beta'], ['gamma']])
+    for rows, evicted in (([['beta two']], 2), ([['alpha'], ['beta']], 1)):
+        index.store.append_rows(rows)
+        index.append_rows(len(rows))
+        index.evict_rows(evicted)
+        index.store.evict_rows(evicted)
+    assert [index.store.get_value(row_idx, 0) for row_idx in range(3)] == ['beta two', 'alpha', 'beta']
+    assert index.search('beta') == {0, 2}
+    assert index.search('alpha') == {1}
+    assert index.search('gamma') == set()
+
+
+def test_invalidate() -> None:
+    index = make_index([['alpha'], ['beta']])
+    index.store.load_rows([['beta'], ['gamma'], ['beta']])
+    index.invalidate()
+    assert index.search('beta') == {0, 2}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_search_after_changes(seed: int) -> None:
+    rng = random.Random(seed)
+
+    def random_row() -> list:
+        return [rng.choice(WORDS), rng.choice(WORDS)]
+
+    index = make_index([random_row() for _ in range(10)])
+    store = index.store
+    for _ in range(100):
+        operation = rng.choice(['update', 'insert', 'append', 'delete', 'move', 'evict'])
+        if operation not in ('insert', 'append') and not len(store):
+            operation = 'append'
+
+        if operation == 'update':
+            row_idx = rng.randrange(len(store))
+            store.set_row(row_idx, random_row())
+            index.update_rows([row_idx])
+        elif operation == 'insert':
+            row_idx, rows = rng.randint(0, len(store)), [random_row() for _ in range(rng.randint(1, 3))]
+            store.insert_rows(row_idx, rows)
+            index.insert_rows(row_idx, len(rows))
+        elif operation == 'append':
+            rows = [random_row() for _ in range(rng.randint(1, 3))]
+            store.append_rows(rows)
+            index.append_rows(len(rows))
+        elif operation == 'delete':
+            deleted = rng.sample(range(len(store)), rng.randint(1, min(3, len(store))))
+            store.delete_rows(deleted)
+            index.delete_rows(deleted)
+        elif operation == 'move':
+            moved = rng.sample(range(len(store)), rng.randint(1, min(3, len(store))))
+            row_idx = rng.randint(0, len(store) - len(moved))
+            store.move_rows(moved, row_idx)
+            index.move_rows(moved, row_idx)
+        else:
+            evicted = rng.randint(1, len(store))
+            index.evict_rows(evicted)
+            store.evict_rows(evicted)
+
+        for query in ('be', 'beta', 'alpha gamma', 'delta'):
+            assert index.search(query) == full_search(index, query)
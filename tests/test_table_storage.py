@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy_glow.uix.table.storage import TableStore  # noqa: E402
+
+SCHEMA = [('text', ('text', ), ('text', ))] * 2
+SORTS = [
+    [(0, 'ASC')],
+    [(0, 'DSC')],
+    [(0, 'DSC'), (1, 'ASC')],
+    [(1, 'ASC'), (0, 'DSC')],
+]
+
+
+def make_store(rows: list) -> TableStore:
+    store = TableStore(SCHEMA)
+    store.load_rows(rows)
+    return store
+
+
+def full_order(store: TableStore, sort_by: list, sort_keys: dict | None = None) -> list[int]:
+    '''Order computed from scratch over a copy of the stored rows.'''
+    return list(make_store([store.get_row(row_idx) for row_idx in range(len(store))]).get_order(sort_by, sort_keys))
+
+
+def test_empty_cells_last() -> None:
+    store = make_store([[2], [None], [1], [3], [None]])
+    assert list(store.get_order([(0, 'ASC')])) == [2, 0, 3, 1, 4]
+    assert list(store.get_order([(0, 'DSC')])) == [3, 0, 2, 1, 4]
+
+
+def test_stable_in_both_orders() -> None:
+    store = make_store([[1, 'a'], [2, 'b'], [1, 'c'], [2, 'd']])
+    assert list(store.get_order([(0, 'ASC')])) == [0, 2, 1, 3]
+    assert list(store.get_order([(0, 'DSC')])) == [1, 3, 0, 2]
+
+
+def test_mixed_types() -> None:
+    store = make_store([['b'], [2], [None], ['a'], [1.5]])
+    assert list(store.get_order([(0, 'ASC')])) == [4, 1, 3, 0, 2]
+    assert list(store.get_order([(0, 'DSC')])) == [0, 3, 1, 4, 2]
+
+
+def test_sort_keys() -> None:
+    store = make_store([['bb'], ['a'], ['ccc'], [None]])
+    assert list(store.get_order([(0, 'DSC')], {0: len})) == [2, 0, 1, 3]
+
+
+def test_cached_order_until_changed() -> None:
+    store = make_store([[2], [1]])
+    order = store.get_order([(0, 'ASC')])
+    assert store.get_order([(0, 'ASC')]) is order
+
+    store.set_cell(0, 0, 0)
+    assert not store.has_order([(0, 'ASC')])
+    assert list(store.get_order([(0, 'ASC')])) == [0, 1]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_order_after_changes(seed: int) -> None:
+    rng = random.Random(seed)
+
+    def random_value() -> object:
+        return rng.choice([None, 1, 2, 3, 2.5, 'a', 'b'])
+
+    for _ in range(40):
+        store = make_store([[random_value(), random_value()] for _ in range(rng.randint(0, 15))])
+        sort_by = rng.choice(SORTS)
+        sort_keys = {0: str} if rng.random() < .3 else None
+        store.get_order(sort_by, sort_keys)
+
+        for _ in range(4):
+            operation = rng.choice(['insert', 'append', 'delete', 'move', 'evict'])
+            if operation in ('delete', 'move', 'evict') and not len(store):
+                operation = 'append'
+
+            if operation == 'insert':
+                store.insert_rows(rng.randint(0, len(store)), [[random_value(), random_value()] for _ in range(rng.randint(1, 3))])
+            elif operation == 'append':
+                store.append_rows([[random_value(), random_value()] for _ in range(rng.randint(1, 3))])
+            elif operation == 'delete':
+                store.delete_rows(rng.sample(range(len(store)), rng.randint(1, min(3, len(store)))))
+            elif operation == 'move':
+                moved = rng.sample(range(len(store)), rng.randint(1, min(3, len(store))))
+                store.move_rows(moved, rng.randint(0, len(store) - len(moved)))
+            else:
+                store.evict_rows(rng.randint(1, len(store)))
+
+            assert list(store.get_order(sort_by, sort_keys)) == full_order(store, sort_by, sort_keys)
+
+
+def test_evict_and_append_rows() -> None:
+    store = make_store([[value] for value in range(4)])
+    store.evict_rows(3)
+    store.append_rows([[4], [5]])
+    store.evict_rows(1)
+    assert [store.get_value(row_idx, 0) for row_idx in range(len(store))] == [4, 5]
+    assert list(store.get_column(0)) == [4, 5]
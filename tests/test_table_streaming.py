@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip('kivy')
+
+from kivy.clock import Clock  # noqa: E402
+
+from kivy_glow.uix.table import GlowTable  # noqa: E402
+
+
+@pytest.fixture
+def table(app) -> GlowTable:
+    table = GlowTable(filter_delay=0, selectable=True)
+    table.columns_info = [{'name': 'text', 'searchable': True}]
+    table.table_data = [['alpha one'], ['beta two'], ['gamma three']]
+    Clock.tick()
+    return table
+
+
+def displayed_rows(table: GlowTable) -> list[int]:
+    return list(range(len(table._store))) if table._order is None else list(table._order)
+
+
+def search(table: GlowTable, text: str) -> list[int]:
+    table.search_text = text
+    Clock.tick()
+    return displayed_rows(table)
+
+
+def stored_values(table: GlowTable) -> list:
+    return [table._store.get_value(row_idx, 0) for row_idx in range(len(table._store))]
+
+
+def test_flush_rows_evicts_first_rows(table: GlowTable) -> None:
+    table.max_rows = 4
+    table.select_one(0, True)
+    table.select_one(1, True)
+
+    table.append_rows([['delta four'], ['beta five']])
+    table.flush_rows()
+    assert stored_values(table) == ['beta two', 'gamma three', 'delta four', 'beta five']
+    # the selection of the evicted row is dropped, the others shift
+    assert table.selected_original_rows == [0]
+    assert search(table, 'beta') == [0, 3]
+    assert search(table, 'alpha') == []
+
+
+def test_flush_rows_while_searching(table: GlowTable) -> None:
+    table.max_rows = 4
+    assert search(table, 'be') == [1]
+
+    table.append_rows([['delta four'], ['beta five']])
+    table.flush_rows()
+    assert displayed_rows(table) == [0, 3]
+
+    # more rows appended than stored
+    table.append_rows([['epsilon'], ['beta six'], ['zeta'], ['eta'], ['beta seven']])
+    table.flush_rows()
+    assert stored_values(table) == ['beta six', 'zeta', 'eta', 'beta seven']
+    assert displayed_rows(table) == [0, 3]
+    assert search(table, 'se') == [3]
+    assert search(table, '') == [0, 1, 2, 3]
+
+
+def test_flush_rows_without_max_rows(table: GlowTable) -> None:
+    table.select_one(2, True)
+    table.append_rows([['delta four']])
+    table.append_rows([['beta five']])
+    table.flush_rows()
+    assert stored_values(table) == ['alpha one', 'beta two', 'gamma three', 'delta four', 'beta five']
+    assert table.selected_original_rows == [2]
+    assert search(table, 'beta') == [1, 4]